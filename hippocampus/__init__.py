@@ -16,8 +16,16 @@ License: MIT License
 """
 
 from .place_cells import PlaceMemory, PlaceCellManager
-from .context_binder import ContextMemory, ContextBinder
-from .learning_gate import LearningGateConfig, LearningGate
+from .context_binder import ContextMemory, ContextHandle, ContextBinder
+from .context_schema import ContextSchema
+from .eviction import (
+    EvictionPolicy,
+    LRUEvictionPolicy,
+    LFUEvictionPolicy,
+    ConsolidationAwareEvictionPolicy,
+    create_eviction_policy
+)
+from .learning_gate import LearningGateConfig, LearningGate, MultiStreamLearningGate
 from .replay_consolidation import (
     PlaceMemoryWithHistory,
     ReplayConsolidation,
@@ -32,10 +40,19 @@ __all__ = [
     'PlaceCellManager',
     # Context Binder
     'ContextMemory',
+    'ContextHandle',
     'ContextBinder',
+    'ContextSchema',
+    # Eviction
+    'EvictionPolicy',
+    'LRUEvictionPolicy',
+    'LFUEvictionPolicy',
+    'ConsolidationAwareEvictionPolicy',
+    'create_eviction_policy',
     # Learning Gate
     'LearningGateConfig',
     'LearningGate',
+    'MultiStreamLearningGate',
     # Replay/Consolidation
     'PlaceMemoryWithHistory',
     'ReplayConsolidation',
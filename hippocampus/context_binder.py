@@ -14,24 +14,122 @@ Version: v0.4.0-alpha (Context Binder extension)
 License: MIT License
 """
 
-from typing import Dict, Tuple, Optional, Any
-from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Tuple, Optional, Any, Mapping, MutableMapping, Union
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
 import numpy as np
 import hashlib
+import heapq
+import math
+
+from .eviction import EvictionPolicy, create_eviction_policy
+from .context_schema import ContextSchema
+from .context_table import ContextTable
+
+
+# 얕은 스냅샷으로는 내부 변경을 감지할 수 없는 값 타입
+_NESTED_TYPES = (dict, list, set, bytearray)
+
+
+def _state_string(external_state: Mapping[str, Any]) -> str:
+    """외부 상태의 정렬된 문자열 표현 (Context ID 해시 입력)"""
+    return str(sorted(external_state.items()))
 
 
-@dataclass
 class ContextMemory:
     """
     Place + Context 조합의 기억 데이터 구조
     
     각 (place_id, context_id) 조합마다 독립적인 bias 추정값을 저장합니다.
+    
+    실제 데이터는 ContextTable의 열 배열 한 행에 있으며, ContextMemory는 그 행을
+    가리키는 가벼운 뷰입니다 ✨ NEW. bias_estimate는 테이블 행의 읽기 전용 복사본을
+    반환하므로 값을 바꾸려면 속성에 대입합니다. 단독으로 생성하면 1행짜리 전용 테이블을 사용합니다.
     """
-    place_id: int
-    context_id: int
-    bias_estimate: np.ndarray = field(default_factory=lambda: np.zeros(5))  # 5D bias [x, y, z, theta_a, theta_b]
-    visit_count: int = 0
-    last_visit_time: float = 0.0
+    
+    __slots__ = ('_table', '_place_id', '_context_id')
+    
+    def __init__(
+        self,
+        place_id: int,
+        context_id: int,
+        bias_estimate: Optional[np.ndarray] = None,  # 5D bias [x, y, z, theta_a, theta_b]
+        visit_count: int = 0,
+        last_visit_time: float = 0.0
+    ):
+        bias_dim = 5 if bias_estimate is None else int(np.shape(bias_estimate)[0])
+        table = ContextTable(bias_dim=bias_dim, initial_capacity=1)
+        table.add(place_id, context_id)
+        self._table = table
+        self._place_id = place_id
+        self._context_id = context_id
+        
+        if bias_estimate is not None:
+            self.bias_estimate = bias_estimate
+        self.visit_count = visit_count
+        self.last_visit_time = last_visit_time
+    
+    @classmethod
+    def _view(cls, table: ContextTable, place_id: int, context_id: int) -> 'ContextMemory':
+        """테이블 행에 대한 뷰 생성 (복사 없음)"""
+        view = cls.__new__(cls)
+        view._table = table
+        view._place_id = place_id
+        view._context_id = context_id
+        return view
+    
+    @property
+    def _row(self) -> int:
+        return self._table.row_of(self._place_id, self._context_id)
+    
+    @property
+    def place_id(self) -> int:
+        return self._place_id
+    
+    @property
+    def context_id(self) -> int:
+        return self._context_id
+    
+    @property
+    def bias_estimate(self) -> np.ndarray:
+        bias = self._table.bias[self._row].copy()
+        bias.flags.writeable = False  # 제자리 수정은 테이블에 반영되지 않으므로 막음
+        return bias
+    
+    @bias_estimate.setter
+    def bias_estimate(self, value: np.ndarray) -> None:
+        value = np.asarray(value)
+        if value.shape != (self._table.bias_dim,):
+            raise ValueError(
+                f"bias_estimate 차원 불일치: {value.shape} != ({self._table.bias_dim},)"
+            )
+        self._table.bias[self._row] = value
+    
+    @property
+    def visit_count(self) -> int:
+        return int(self._table.visit_count[self._row])
+    
+    @visit_count.setter
+    def visit_count(self, value: int) -> None:
+        self._table.visit_count[self._row] = value
+    
+    @property
+    def last_visit_time(self) -> float:
+        return float(self._table.last_visit_time[self._row])
+    
+    @last_visit_time.setter
+    def last_visit_time(self, value: float) -> None:
+        self._table.last_visit_time[self._row] = value
+    
+    def __repr__(self) -> str:
+        return (
+            f"ContextMemory(place_id={self.place_id!r}, "
+            f"context_id={self.context_id!r}, "
+            f"bias_estimate={self.bias_estimate!r}, "
+            f"visit_count={self.visit_count!r}, "
+            f"last_visit_time={self.last_visit_time!r})"
+        )
     
     def update_bias(
         self,
@@ -47,16 +145,29 @@ class ContextMemory:
             new_bias: 새로운 bias 추정값
             learning_rate: 학습률 α (기본값: 0.1)
         """
-        if self.visit_count == 0:
+        table = self._table
+        row = self._row
+        if table.visit_count[row] == 0:
             # 첫 방문: 새로운 bias 그대로 저장
-            self.bias_estimate = new_bias.copy()
+            table.bias[row] = new_bias
         else:
             # 이후 방문: 지수 이동 평균으로 업데이트
-            self.bias_estimate = (
+            table.bias[row] = (
                 learning_rate * new_bias +
-                (1 - learning_rate) * self.bias_estimate
+                (1 - learning_rate) * table.bias[row]
             )
-        self.visit_count += 1
+        table.visit_count[row] += 1
+
+
+@dataclass(frozen=True)
+class ContextHandle:
+    """
+    미리 계산된 Context ID 핸들 (ContextBinder.set_context 반환값) ✨ NEW
+    
+    핫 패스에서 외부 상태 대신 전달하면 해시/비교 없이 Context ID를 바로 사용합니다.
+    """
+    context_id: int
+    state: Mapping[str, Any]  # 읽기 전용 외부 상태 스냅샷
 
 
 class ContextBinder:
@@ -67,21 +178,152 @@ class ContextBinder:
     Place + Context 조합으로 기억을 분리합니다.
     """
     
-    def __init__(self, num_contexts: int = 10000):
+    def __init__(
+        self,
+        num_contexts: int = 10000,
+        capacity: Optional[int] = None,
+        eviction_policy: Any = "lru",
+        bias_dim: int = 5,
+        schema: Optional[ContextSchema] = None
+    ):
         """
         Context Binder 초기화
         
         Args:
-            num_contexts: 최대 Context 수 (기본값: 10000)
+            num_contexts: 최대 Context 수 (기본값: 10000, schema가 없을 때 해시 모듈러스)
+            capacity: 저장할 최대 (place_id, context_id) 조합 수 (None이면 무제한)
+            eviction_policy: 용량 초과 시 교체 정책
+                ("lru", "lfu", "consolidation" 또는 EvictionPolicy 인스턴스)
+            bias_dim: bias 차원 (기본값: 5)
+            schema: 외부 상태 구간화 규칙 (있으면 구간화 튜플 → 밀집 Context ID)
         """
+        if capacity is not None and capacity <= 0:
+            raise ValueError(f"capacity는 양수여야 합니다: {capacity}")
         self.num_contexts = num_contexts
+        self.bias_dim = bias_dim
+        
+        # 열 단위 (Place, Context) 조합 테이블 + Place → Context 인접 인덱스 ✨ NEW
+        self.table = ContextTable(bias_dim=bias_dim)
+        
+        # Context Memory 저장소: (place_id, context_id) → ContextMemory (테이블 행에 대한 뷰)
+        self.context_memory: Dict[Tuple[int, int], ContextMemory] = ContextMemoryMapping(
+            self.table,
+            add_pair=self._ensure_context,
+            remove_pair=self.remove_context_memory
+        )
+        
+        # Place별 Context 변경 버전 (생성/업데이트/삭제 시 증가, 결과 캐시 검증용) ✨ NEW
+        # 읽기는 .get(place_id, 0), Place 삭제 시 항목 제거
+        # (값은 단조 증가하는 version_clock으로 찍어 삭제 후 다시 생겨도 이전 값과 겹치지 않음)
+        self.place_versions: Dict[int, int] = {}
+        self.version_clock = 0
+        
+        # 용량 제한 + 교체 정책 ✨ NEW
+        # (capacity가 None이면 교체할 일이 없으므로 정책에 방문을 기록하지 않음)
+        self.capacity = capacity
+        self.eviction_policy: EvictionPolicy = create_eviction_policy(eviction_policy)
+        self.num_evictions = 0
+        
+        # TTL 만료: (last_visit_time, place_id, context_id) 최소 힙 (조합 추가 시 등록, 지연 삭제)
+        self._expiry_heap: List[Tuple[float, int, int]] = []
+        # 지연 항목이 쌓여 떼어 낸 이전 힙 (정리 호출마다 조금씩 살아 있는 항목만 새 힙으로 옮김)
+        self._expiry_backlog: List[Tuple[float, int, int]] = []
+        # 방문 횟수 기준 미확인 조합 (추가 순서, 삭제 시 함께 제거)
+        self._unchecked: "OrderedDict[Tuple[int, int], None]" = OrderedDict()
+        self.latest_visit_time = 0.0  # 지금까지 기록된 가장 최근 방문 시간
+        
+        # Context ID 인터닝: 마지막 외부 상태 스냅샷 (값 + 값 타입) → Context ID ✨ NEW
+        # 상태가 바뀌지 않는 동안에는 문자열화/해시 없이 같은 ID 재사용
+        # (중첩 값이 있으면 얕은 스냅샷으로는 내부 변경을 놓치므로 상태 문자열로 비교)
+        self._last_state: Optional[Dict[str, Any]] = None
+        self._last_types: Optional[list] = None
+        self._last_state_str: Optional[str] = None
+        self._last_context_id: int = 0
+        self.num_context_hashes = 0  # 상태 변경으로 해시를 새로 계산한 횟수
         
-        # Context Memory 저장소: (place_id, context_id) → ContextMemory
-        self.context_memory: Dict[Tuple[int, int], ContextMemory] = {}
+        # Context Schema: 구간화 튜플 → 밀집 Context ID (처음 등장 순서) ✨ NEW
+        self.schema = schema
+        self.context_ids: Dict[Tuple, int] = {}
+        self.context_keys: List[Tuple] = []  # Context ID → 구간화 튜플
+    
+    def _hash_context(self, external_state: Mapping[str, Any]) -> int:
+        """외부 상태 → Context ID (안정적 64-bit 해시, 상태가 바뀌었을 때만 호출)"""
+        if self.schema is not None:
+            return self._dense_context_id(self.schema.bin_state(external_state))
+        
+        # 외부 상태를 문자열로 변환하여 해시
+        # 정렬하여 순서에 무관하게 동일한 상태는 동일한 Context ID 생성
+        state_str = _state_string(external_state)
+        
+        # 해시 함수 적용 (BLAKE2b 8-byte digest: 프로세스/실행 간 안정적) ✨ FIXED
+        # MD5를 쓰던 이전 버전과는 같은 상태라도 Context ID가 다름
+        # (이전 버전에서 저장한 ID는 legacy_context_id로 찾아 옮김)
+        digest = hashlib.blake2b(state_str.encode('utf-8'), digest_size=8).digest()
+        self.num_context_hashes += 1
+        
+        # 모듈로 연산으로 Context ID 생성
+        return int.from_bytes(digest, 'little') % self.num_contexts
+    
+    def legacy_context_id(self, external_state: Mapping[str, Any]) -> int:
+        """
+        이전 버전 (MD5 해시)의 Context ID
+        
+        MD5 Context ID로 저장한 (Place, Context) 기억을 새 Context ID로 옮길 때
+        같은 외부 상태의 이전 ID를 찾는 용도입니다.
+        
+        Args:
+            external_state: 외부 상태 딕셔너리
+        
+        Returns:
+            MD5 기반 Context ID (0 ~ num_contexts-1)
+        """
+        state_str = _state_string(external_state)
+        return int(hashlib.md5(state_str.encode('utf-8')).hexdigest(), 16) % self.num_contexts
+    
+    def _dense_context_id(self, binned: Tuple) -> int:
+        """구간화 튜플 → 밀집 Context ID (없으면 새로 할당)"""
+        self.num_context_hashes += 1
+        context_id = self.context_ids.get(binned)
+        if context_id is None:
+            context_id = len(self.context_keys)
+            self.context_ids[binned] = context_id
+            self.context_keys.append(binned)
+        return context_id
+    
+    def context_key(self, context_id: int) -> Tuple:
+        """
+        밀집 Context ID의 구간화 튜플 (schema 사용 시) ✨ NEW
+        
+        Args:
+            context_id: Context ID
+        
+        Returns:
+            ((키, 구간), ...) 튜플
+        """
+        if self.schema is None:
+            raise ValueError("schema 없이 해시로 만든 Context ID는 역변환할 수 없습니다")
+        return self.context_keys[context_id]
+    
+    def _is_last_state(self, external_state: Mapping[str, Any]) -> bool:
+        """마지막으로 해시한 상태와 같은지 (값과 값 타입이 모두 같아야 함)"""
+        last_state = self._last_state
+        if last_state is None:
+            return False
+        if self._last_state_str is not None:
+            # 중첩 값: 같은 객체 안의 값이 바뀌었을 수 있으므로 상태 문자열로 비교
+            return _state_string(external_state) == self._last_state_str
+        try:
+            if external_state != last_state:
+                return False
+        except (TypeError, ValueError):
+            # 배열처럼 ==가 bool이 아닌 값 → 변경된 것으로 취급
+            return False
+        # 25 == 25.0 이지만 문자열 표현이 달라 Context ID가 다르므로 타입도 비교
+        return list(map(type, external_state.values())) == self._last_types
     
     def get_context_id(
         self,
-        external_state: Dict[str, Any]
+        external_state: Union[Mapping[str, Any], ContextHandle]
     ) -> int:
         """
         외부 상태를 Context ID로 변환
@@ -92,25 +334,92 @@ class ContextBinder:
         - step_number: 작업 단계 (예: 0, 1, 2)
         - material: 재료 타입 (예: "aluminum", "steel")
         
+        인터닝 ✨ NEW:
+        - ContextHandle: 저장된 ID 그대로 반환 (해시/비교 없음)
+        - 마지막 상태와 같은 상태 (같은 객체 또는 같은 내용의 다른 객체): 이전 ID 재사용
+        - 상태가 바뀐 경우에만 64-bit 해시 계산
+          (schema가 있으면 구간화 튜플의 밀집 ID: 같은 구간의 상태는 같은 Context)
+        
         Args:
-            external_state: 외부 상태 딕셔너리
+            external_state: 외부 상태 딕셔너리 (또는 set_context가 반환한 핸들)
         
         Returns:
-            Context ID (0 ~ num_contexts-1)
+            Context ID (0 ~ num_contexts-1, schema 사용 시 0부터 처음 등장 순서)
         """
-        # 외부 상태를 문자열로 변환하여 해시
-        # 정렬하여 순서에 무관하게 동일한 상태는 동일한 Context ID 생성
-        state_str = str(sorted(external_state.items()))
+        if isinstance(external_state, ContextHandle):
+            return external_state.context_id
         
-        # 해시 함수 적용 (MD5 사용)
-        hash_obj = hashlib.md5(state_str.encode('utf-8'))
-        context_hash = int(hash_obj.hexdigest(), 16)
+        if self._is_last_state(external_state):
+            return self._last_context_id
         
-        # 모듈로 연산으로 Context ID 생성
-        context_id = context_hash % self.num_contexts
+        context_id = self._hash_context(external_state)
+        
+        # 얕은 복사 스냅샷 저장 (호출자가 딕셔너리를 수정해도 다음 호출에서 감지)
+        self._last_state = dict(external_state)
+        self._last_types = list(map(type, external_state.values()))
+        nested = any(isinstance(value, _NESTED_TYPES) for value in external_state.values())
+        self._last_state_str = _state_string(external_state) if nested else None
+        self._last_context_id = context_id
         
         return context_id
     
+    def set_context(self, external_state: Mapping[str, Any]) -> ContextHandle:
+        """
+        외부 상태를 한 번만 Context ID로 변환하여 핸들로 반환 ✨ NEW
+        
+        상태가 바뀔 때 한 번 호출하고, 이후 get_context_id/store/retrieve에
+        핸들을 전달하면 핫 패스에서 해시를 전혀 계산하지 않습니다.
+        
+        Args:
+            external_state: 외부 상태 딕셔너리
+        
+        Returns:
+            ContextHandle (context_id + 읽기 전용 상태 스냅샷)
+        """
+        if isinstance(external_state, ContextHandle):
+            return external_state
+        state = dict(external_state)
+        return ContextHandle(
+            context_id=self.get_context_id(state),
+            state=MappingProxyType(state)
+        )
+    
+    def contexts_of(self, place_id: int) -> List[int]:
+        """
+        Place의 Context ID 목록 (테이블 인접 인덱스, O(차수)) ✨ NEW
+        
+        Args:
+            place_id: Place ID
+        
+        Returns:
+            Context ID 목록
+        """
+        return self.table.contexts_of(place_id)
+    
+    def _ensure_context(self, place_id: int, context_id: int) -> int:
+        """조합 행 확보 (없으면 용량 확인 후 추가), 행 번호 반환"""
+        table = self.table
+        row = table.find(place_id, context_id)
+        if row is not None:
+            return row
+        
+        if self.capacity is not None:
+            # 용량 초과 시 교체 정책이 고른 조합부터 삭제
+            while len(table) >= self.capacity:
+                victim = self.eviction_policy.victim()
+                if victim is None:
+                    break
+                self.remove_context_memory(*victim)
+                self.num_evictions += 1
+            self.eviction_policy.insert((place_id, context_id))
+        
+        row = table.add(place_id, context_id)
+        self._bump_place_version(place_id)
+        # 방문 시간은 아직 미정: 다음 정리 때 꺼내 실제 방문 시간으로 다시 예약됨
+        heapq.heappush(self._expiry_heap, (-math.inf, place_id, context_id))
+        self._unchecked[(place_id, context_id)] = None
+        return row
+    
     def get_context_memory(
         self,
         place_id: int,
@@ -124,18 +433,78 @@ class ContextBinder:
             context_id: Context ID
         
         Returns:
-            ContextMemory 객체
+            ContextMemory 객체 (테이블 행에 대한 뷰)
+        """
+        self._ensure_context(place_id, context_id)
+        return ContextMemory._view(self.table, place_id, context_id)
+    
+    def peek_context_memory(
+        self,
+        place_id: int,
+        context_id: int
+    ) -> Optional[ContextMemory]:
         """
-        key = (place_id, context_id)
+        Context Memory 조회 (없으면 None, 생성/수정 없음) ✨ NEW
         
-        if key not in self.context_memory:
-            # 새로운 Context Memory 생성
-            self.context_memory[key] = ContextMemory(
-                place_id=place_id,
-                context_id=context_id
-            )
+        Args:
+            place_id: Place ID
+            context_id: Context ID
         
-        return self.context_memory[key]
+        Returns:
+            ContextMemory 객체 또는 None
+        """
+        if self.table.find(place_id, context_id) is None:
+            return None
+        return ContextMemory._view(self.table, place_id, context_id)
+    
+    def remove_context_memory(
+        self,
+        place_id: int,
+        context_id: int
+    ) -> bool:
+        """
+        Context Memory 삭제
+        
+        Args:
+            place_id: Place ID
+            context_id: Context ID
+        
+        Returns:
+            삭제 여부 (없으면 False)
+        """
+        self.eviction_policy.discard((place_id, context_id))
+        if not self.table.remove(place_id, context_id):
+            return False
+        self._unchecked.pop((place_id, context_id), None)
+        
+        self._bump_place_version(place_id)
+        return True
+    
+    def _bump_place_version(self, place_id: int) -> None:
+        """Place의 Context 변경 버전 갱신"""
+        self.version_clock += 1
+        self.place_versions[place_id] = self.version_clock
+    
+    def remove_place(self, place_id: int) -> int:
+        """
+        Place의 모든 Context Memory 삭제 (Place 교체 시 연쇄 삭제)
+        
+        Args:
+            place_id: Place ID
+        
+        Returns:
+            삭제된 Context 수
+        """
+        context_ids = self.table.remove_place(place_id)
+        if not context_ids:
+            return 0
+        
+        # 남은 Context가 없으므로 버전 항목 제거 (읽기는 0 = Context 없음)
+        self.place_versions.pop(place_id, None)
+        for context_id in context_ids:
+            self.eviction_policy.discard((place_id, context_id))
+            self._unchecked.pop((place_id, context_id), None)
+        return len(context_ids)
     
     def update_context_memory(
         self,
@@ -155,13 +524,25 @@ class ContextBinder:
             current_time: 현재 시간
             learning_rate: 학습률
         """
-        context_memory = self.get_context_memory(place_id, context_id)
+        table = self.table
+        row = self._ensure_context(place_id, context_id)
         
-        # Bias 업데이트
-        context_memory.update_bias(bias, learning_rate)
+        # Bias 업데이트 (지수 이동 평균, 테이블 행 제자리 갱신)
+        row_bias = table.bias[row]
+        if table.visit_count[row] == 0:
+            row_bias[:] = bias
+        else:
+            row_bias *= 1 - learning_rate
+            row_bias += learning_rate * bias
+        table.visit_count[row] += 1
+        if self.capacity is not None:
+            self.eviction_policy.touch((place_id, context_id))
+        self._bump_place_version(place_id)
         
         # 방문 시간 업데이트
-        context_memory.last_visit_time = current_time
+        table.last_visit_time[row] = current_time
+        if current_time > self.latest_visit_time:
+            self.latest_visit_time = current_time
     
     def get_bias_estimate(
         self,
@@ -176,14 +557,14 @@ class ContextBinder:
             context_id: Context ID
         
         Returns:
-            Bias 추정값 (없으면 0 벡터)
+            Bias 추정값 (없으면 0 벡터, 조합은 생성하지 않음)
         """
-        key = (place_id, context_id)
+        row = self.table.find(place_id, context_id)
         
-        if key not in self.context_memory:
-            return np.zeros(5)  # 초기값
+        if row is None:
+            return np.zeros(self.bias_dim)  # 초기값 (생성하지 않음)
         
-        return self.context_memory[key].bias_estimate.copy()
+        return self.table.bias[row].copy()
     
     def get_statistics(self) -> Dict[str, any]:
         """
@@ -192,56 +573,184 @@ class ContextBinder:
         Returns:
             통계 정보 딕셔너리
         """
-        if not self.context_memory:
+        table = self.table
+        if len(table) == 0:
             return {
                 'num_contexts': 0,
                 'total_visits': 0,
                 'avg_visits_per_context': 0.0,
-                'memory_size_bytes': 0
+                'memory_size_bytes': 0,
+                'num_evictions': self.num_evictions,
+                'num_context_keys': len(self.context_keys)
             }
         
-        total_visits = sum(c.visit_count for c in self.context_memory.values())
-        num_contexts = len(self.context_memory)
+        num_contexts = len(table)
+        total_visits = int(table.visit_count[:num_contexts].sum())
         
-        # 메모리 사용량 추정 (대략적)
-        # ContextMemory: 약 200 bytes per context
-        memory_size_bytes = num_contexts * 200
+        # 메모리 사용량: 테이블 열 배열 + 인덱스 실제 크기 ✨ NEW
+        memory_size_bytes = table.nbytes
         
         return {
             'num_contexts': num_contexts,
             'total_visits': total_visits,
             'avg_visits_per_context': total_visits / num_contexts if num_contexts > 0 else 0.0,
             'memory_size_bytes': memory_size_bytes,
-            'memory_size_kb': memory_size_bytes / 1024.0
+            'memory_size_kb': memory_size_bytes / 1024.0,
+            'num_evictions': self.num_evictions,
+            'num_context_keys': len(self.context_keys)  # schema 사용 시 구간화 Context 수
         }
     
     def clear_unused_contexts(
         self,
         min_visits: int = 2,
-        max_age: float = 3600.0  # 1시간
+        max_age: float = 3600.0,  # 1시간
+        current_time: Optional[float] = None,
+        max_checks: Optional[int] = None
     ) -> int:
         """
-        사용되지 않는 Context Memory 정리
+        사용되지 않는 Context Memory 정리 (증분 TTL 만료)
+        
+        - 나이 기준: last_visit_time 최소 힙에서 만료 시각이 지난 항목만 꺼내 확인
+          (힙 항목은 지연 삭제: 이미 삭제된 조합은 버리고, 그 사이 방문된 조합은
+          현재 last_visit_time으로 다시 넣음)
+        - 힙은 조합 추가 시 바로 등록되고, 삭제된 조합의 항목이 살아 있는 조합 수의 두 배를
+          넘으면 이전 힙을 떼어 내 호출마다 일부씩 새 힙으로 옮김 (한 번에 재구성하지 않음)
+        - 방문 횟수 기준: 아직 확인하지 않은 조합만 추가 순서대로 확인
+          (방문 횟수는 update로만 늘어나므로 min_visits 이상으로 확인된 조합은 다시 보지 않음,
+          호출마다 다른 min_visits를 쓰면 더 큰 값은 그 뒤 추가된 조합에만 적용)
+        - max_checks를 주면 호출당 이전 힙 이동 수, 힙 확인 수, 방문 횟수 확인 수가 각각
+          그 이하로 제한되어 정리 비용이 여러 호출에 분산됨 (제어 루프 지연 방지)
         
         Args:
-            min_visits: 최소 방문 횟수 (이하이면 삭제)
+            min_visits: 최소 방문 횟수 (미만이면 삭제)
             max_age: 최대 나이 (초, 초과이면 삭제)
+            current_time: 호출자 시계의 현재 시간 (None이면 지금까지 기록된 가장 최근 방문 시간)
+            max_checks: 호출당 최대 확인 수 (None이면 제한 없음 = 한 번에 전체 정리)
         
         Returns:
             삭제된 Context 수
         """
-        current_time = 0.0  # 실제로는 외부에서 전달받아야 함
-        keys_to_delete = []
+        if current_time is None:
+            current_time = self.latest_visit_time
+        table = self.table
+        budget = math.inf if max_checks is None else max_checks
+        removed = 0
         
-        for key, context_memory in self.context_memory.items():
-            age = current_time - context_memory.last_visit_time
-            
-            if (context_memory.visit_count < min_visits or
-                age > max_age):
-                keys_to_delete.append(key)
+        # 1. 나이 기준: 만료 시각(last_visit_time + max_age)이 지난 항목만 힙에서 꺼냄
+        heap = self._compact_expiry_heap(budget)
+        deadline = current_time - max_age
+        checks = 0
+        while heap and heap[0][0] < deadline and checks < budget:
+            visit_time, place_id, context_id = heapq.heappop(heap)
+            checks += 1
+            row = table.find(place_id, context_id)
+            if row is None:
+                continue  # 이미 삭제된 조합
+            last_visit_time = float(table.last_visit_time[row])
+            if last_visit_time > visit_time:
+                # 그 사이 방문됨: 현재 방문 시간으로 다시 예약
+                heapq.heappush(heap, (last_visit_time, place_id, context_id))
+                continue
+            self.remove_context_memory(place_id, context_id)
+            removed += 1
         
-        for key in keys_to_delete:
-            del self.context_memory[key]
+        # 2. 방문 횟수 기준: 미확인 조합을 추가 순서대로 최대 budget개 확인
+        unchecked = self._unchecked
+        if min_visits > 0:
+            checks = 0
+            while unchecked and checks < budget:
+                place_id, context_id = unchecked.popitem(last=False)[0]
+                checks += 1
+                row = table.find(place_id, context_id)
+                if table.visit_count[row] < min_visits:
+                    self.remove_context_memory(place_id, context_id)
+                    removed += 1
         
-        return len(keys_to_delete)
+        return removed
+    
+    def _compact_expiry_heap(self, budget: float) -> List[Tuple[float, int, int]]:
+        """
+        만료 힙의 지연 항목 정리 (호출당 최대 budget개 이동)
+        
+        삭제된 조합의 항목이 살아 있는 조합 수의 두 배를 넘으면 현재 힙을 이전 힙으로 떼어 내고,
+        호출마다 이전 힙 끝에서 budget개를 꺼내 살아 있는 조합만 현재 방문 시간으로 새 힙에 넣습니다.
+        이동 중인 항목은 늦게 만료될 수 있지만 빠지지는 않습니다.
+        
+        Args:
+            budget: 이번 호출에서 옮길 최대 항목 수
+        
+        Returns:
+            현재 만료 힙
+        """
+        table = self.table
+        backlog = self._expiry_backlog
+        if not backlog and len(self._expiry_heap) > 2 * len(table) + 64:
+            backlog = self._expiry_backlog = self._expiry_heap
+            self._expiry_heap = []
+        heap = self._expiry_heap
+        moved = 0
+        while backlog and moved < budget:
+            _, place_id, context_id = backlog.pop()
+            moved += 1
+            row = table.find(place_id, context_id)
+            if row is not None:
+                heapq.heappush(heap, (float(table.last_visit_time[row]), place_id, context_id))
+        return heap
+
+
+class ContextMemoryMapping(MutableMapping):
+    """
+    (place_id, context_id) → ContextMemory 매핑 (ContextTable 뷰)
+    
+    기존 Dict[(place_id, context_id), ContextMemory] 사용처(len, in, 반복, items, del, 대입)를
+    지원합니다. 조회 시 테이블 행을 가리키는 ContextMemory 뷰를 반환하며, 대입하면 값을
+    테이블에 복사합니다. 행 추가/삭제는 add_pair/remove_pair를 거칩니다 (용량 관리).
+    """
+    
+    def __init__(
+        self,
+        table: ContextTable,
+        add_pair: Optional[Callable[[int, int], int]] = None,
+        remove_pair: Optional[Callable[[int, int], bool]] = None
+    ):
+        self._table = table
+        self._add_pair = add_pair or table.add
+        self._remove_pair = remove_pair or table.remove
+    
+    def __getitem__(self, key: Tuple[int, int]) -> ContextMemory:
+        place_id, context_id = key
+        if self._table.find(place_id, context_id) is None:
+            raise KeyError(key)
+        return ContextMemory._view(self._table, place_id, context_id)
+    
+    def __setitem__(self, key: Tuple[int, int], context_memory: ContextMemory) -> None:
+        place_id, context_id = key
+        if (context_memory._table is self._table and
+                (context_memory.place_id, context_memory.context_id) == key):
+            return
+        # 추가 시 교체로 원본 뷰가 무효화될 수 있으므로 값을 먼저 복사
+        bias = context_memory.bias_estimate.copy()
+        visit_count = context_memory.visit_count
+        last_visit_time = context_memory.last_visit_time
+        
+        row = self._add_pair(place_id, context_id)
+        self._table.bias[row] = bias
+        self._table.visit_count[row] = visit_count
+        self._table.last_visit_time[row] = last_visit_time
+    
+    def __delitem__(self, key: Tuple[int, int]) -> None:
+        if not self._remove_pair(*key):
+            raise KeyError(key)
+    
+    def __contains__(self, key) -> bool:
+        return key in self._table
+    
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self._table)
+    
+    def __len__(self) -> int:
+        return len(self._table)
+    
+    def __repr__(self) -> str:
+        return f"ContextMemoryMapping({len(self)} contexts)"
 
@@ -0,0 +1,136 @@
+"""
+Context Schema Module
+외부 상태 → 구간화(binned) 튜플 → 밀집 Context ID
+
+핵심 개념:
+- 원시 값 문자열을 해시하면 25.01, 25.02, ... 처럼 미세하게 다른 온도마다
+  새 ContextMemory가 생겨 Context 수가 끝없이 늘고 방문이 누적되지 않음
+- 키별 구간화 규칙을 선언:
+  - numeric: 구간 폭(float) 또는 구간 경계 배열 → 정수 구간 번호
+  - categorical: 어휘(vocabulary) → 정수 인덱스 (어휘 밖의 값은 공통 "기타" 구간)
+  - ignore: Context 구분에 사용하지 않는 키 (타임스탬프, 로그 메시지 등)
+- 선언하지 않은 키는 값 그대로 사용 (해시 가능해야 함)
+- 구간화 튜플은 ContextBinder가 처음 등장 순서대로 0, 1, 2, ... 밀집 ID로 변환
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+Version: v0.4.2-alpha (Context Schema)
+License: MIT License
+"""
+
+from typing import Any, Dict, Hashable, Iterable, Mapping, Optional, Sequence, Tuple, Union
+import math
+import numpy as np
+
+
+class ContextSchema:
+    """
+    외부 상태 구간화 규칙
+
+    예:
+        ContextSchema(
+            numeric={"temperature": 1.0, "load": [0.2, 0.5, 0.8]},
+            categorical={"tool": ["tool_A", "tool_B"]},
+            ignore=["timestamp"]
+        )
+    """
+
+    def __init__(
+        self,
+        numeric: Optional[Mapping[str, Union[float, Sequence[float]]]] = None,
+        categorical: Optional[Mapping[str, Sequence[Hashable]]] = None,
+        ignore: Iterable[str] = ()
+    ):
+        """
+        Args:
+            numeric: 키 → 구간 폭 (bin = ⌊v / 폭⌋) 또는 오름차순 구간 경계 배열
+                (bin = 경계 배열에서 v 이하인 경계 수)
+            categorical: 키 → 어휘 (값 → 어휘 인덱스, 어휘 밖이면 len(어휘))
+            ignore: 무시할 키
+        """
+        self.bin_widths: Dict[str, float] = {}
+        self.bin_edges: Dict[str, np.ndarray] = {}
+        for key, spec in (numeric or {}).items():
+            if np.ndim(spec) == 0:
+                width = float(spec)
+                if not width > 0.0:
+                    raise ValueError(f"구간 폭은 양수여야 합니다: {key}={spec}")
+                self.bin_widths[key] = width
+            else:
+                edges = np.asarray(spec, dtype=float)
+                if edges.ndim != 1 or np.any(np.diff(edges) <= 0):
+                    raise ValueError(f"구간 경계는 오름차순 1차원 배열이어야 합니다: {key}")
+                self.bin_edges[key] = edges
+
+        self.vocabularies: Dict[str, Dict[Hashable, int]] = {
+            key: {value: index for index, value in enumerate(vocabulary)}
+            for key, vocabulary in (categorical or {}).items()
+        }
+        self.ignored = frozenset(ignore)
+
+        declared = [set(self.bin_widths), set(self.bin_edges), set(self.vocabularies), set(self.ignored)]
+        for i, first in enumerate(declared):
+            for second in declared[i + 1:]:
+                overlap = first & second
+                if overlap:
+                    raise ValueError(f"키가 여러 규칙에 선언되었습니다: {sorted(overlap)}")
+
+    def num_bins(self, key: str) -> Optional[int]:
+        """
+        키의 구간 수 (구간 폭 규칙이나 선언하지 않은 키는 None = 값 범위에 따라 다름)
+
+        Args:
+            key: 외부 상태 키
+
+        Returns:
+            구간 수 또는 None
+        """
+        if key in self.bin_edges:
+            return self.bin_edges[key].shape[0] + 1
+        if key in self.vocabularies:
+            return len(self.vocabularies[key]) + 1
+        if key in self.ignored:
+            return 1
+        return None
+
+    def bin_value(self, key: str, value: Any) -> Hashable:
+        """
+        단일 값 구간화
+
+        Args:
+            key: 외부 상태 키
+            value: 값
+
+        Returns:
+            구간 번호 (선언하지 않은 키는 값 그대로)
+        """
+        width = self.bin_widths.get(key)
+        if width is not None:
+            return math.floor(float(value) / width)
+        edges = self.bin_edges.get(key)
+        if edges is not None:
+            return int(np.searchsorted(edges, float(value), side='right'))
+        vocabulary = self.vocabularies.get(key)
+        if vocabulary is not None:
+            return vocabulary.get(value, len(vocabulary))
+        return value
+
+    def bin_state(self, external_state: Mapping[str, Any]) -> Tuple[Tuple[str, Hashable], ...]:
+        """
+        외부 상태 구간화
+
+        수식: key(s) = sorted((k, bin_k(s_k)) for k ∉ ignore)
+
+        Args:
+            external_state: 외부 상태 딕셔너리
+
+        Returns:
+            키 순서로 정렬한 (키, 구간) 튜플
+        """
+        ignored = self.ignored
+        return tuple(sorted(
+            (key, self.bin_value(key, value))
+            for key, value in external_state.items()
+            if key not in ignored
+        ))
@@ -0,0 +1,258 @@
+"""
+Context Table Module
+(place_id, context_id) 조합별 기억을 열 단위(struct-of-arrays)로 저장하는 Context Table
+
+핵심 개념:
+- 조합마다 dataclass + ndarray를 두는 대신 bias/방문 횟수/마지막 방문 시간을
+  미리 할당된 열 배열에 보관 (조합당 수십 bytes)
+- 조합 → 행(row) 밀집 인덱스, 삭제는 swap-remove로 밀집 유지
+- 조합 키는 (place_id, context_id)를 하나의 정수로 압축 (둘 다 0 ≤ id < 2^32일 때)
+- Place → Context 인접 인덱스(행 배열 이중 연결 리스트)로 Place별 조합 열거/삭제가 O(차수)
+- ContextMemory는 테이블 행을 가리키는 가벼운 뷰
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+Version: v0.4.2-alpha (Columnar Context Table)
+License: MIT License
+"""
+
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+import sys
+import numpy as np
+
+
+_PAIR_SHIFT = 32
+_PAIR_LIMIT = 1 << _PAIR_SHIFT
+
+
+def pair_key(place_id: int, context_id: int) -> Hashable:
+    """
+    (place_id, context_id) 조합 키
+
+    둘 다 [0, 2^32) 범위이면 하나의 정수 (place_id << 32 | context_id),
+    아니면 튜플 (정수 키와는 절대 같지 않음)
+    """
+    if 0 <= place_id < _PAIR_LIMIT and 0 <= context_id < _PAIR_LIMIT:
+        return (place_id << _PAIR_SHIFT) | context_id
+    return (place_id, context_id)
+
+
+class ContextTable:
+    """
+    열 단위 (Place, Context) 조합 저장소
+
+    열 배열은 용량이 부족하면 2배로 확장됩니다.
+    """
+
+    def __init__(self, bias_dim: int = 5, initial_capacity: int = 64):
+        """
+        Context Table 초기화
+
+        Args:
+            bias_dim: bias 차원 (기본값: 5)
+            initial_capacity: 초기 행 용량
+        """
+        self.bias_dim = bias_dim
+        self.capacity = max(1, initial_capacity)
+        self.size = 0
+
+        cap = self.capacity
+        self.place_ids = np.zeros(cap, dtype=np.int64)
+        self.context_ids = np.zeros(cap, dtype=np.int64)
+        self.bias = np.zeros((cap, bias_dim))
+        self.visit_count = np.zeros(cap, dtype=np.int64)
+        self.last_visit_time = np.zeros(cap)
+        # 같은 Place의 조합 행끼리 잇는 이중 연결 리스트 (-1 = 없음)
+        self.next_row = np.full(cap, -1, dtype=np.int64)
+        self.prev_row = np.full(cap, -1, dtype=np.int64)
+
+        # 조합 키 → 행 (밀집 인덱스)
+        self.rows: Dict[Hashable, int] = {}
+        # Place → 연결 리스트 첫 행 (Place 인접 인덱스)
+        self.place_head: Dict[int, int] = {}
+
+    # 행 단위 열 (swap-remove/확장 시 함께 이동)
+    _ROW_COLUMNS = (
+        'place_ids', 'context_ids', 'bias', 'visit_count', 'last_visit_time',
+        'next_row', 'prev_row'
+    )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, pair) -> bool:
+        place_id, context_id = pair
+        return pair_key(place_id, context_id) in self.rows
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        # 반복 중 삭제에 안전하도록 스냅샷 사용
+        size = self.size
+        return iter(list(zip(
+            self.place_ids[:size].tolist(), self.context_ids[:size].tolist()
+        )))
+
+    def _grow(self) -> None:
+        """열 용량 2배 확장"""
+        new_capacity = self.capacity * 2
+        for name in self._ROW_COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def row_of(self, place_id: int, context_id: int) -> int:
+        """
+        조합의 행 번호
+
+        Raises:
+            KeyError: 없는 조합
+        """
+        return self.rows[pair_key(place_id, context_id)]
+
+    def find(self, place_id: int, context_id: int) -> Optional[int]:
+        """조합의 행 번호 (없으면 None)"""
+        return self.rows.get(pair_key(place_id, context_id))
+
+    def add(self, place_id: int, context_id: int) -> int:
+        """
+        새 조합 행 추가 (모든 열 0으로 초기화)
+
+        Args:
+            place_id: Place ID
+            context_id: Context ID
+
+        Returns:
+            행 번호
+        """
+        key = pair_key(place_id, context_id)
+        row = self.rows.get(key)
+        if row is not None:
+            return row
+
+        if self.size == self.capacity:
+            self._grow()
+        row = self.size
+        self.size += 1
+        self.rows[key] = row
+
+        self.place_ids[row] = place_id
+        self.context_ids[row] = context_id
+        self.bias[row] = 0.0
+        self.visit_count[row] = 0
+        self.last_visit_time[row] = 0.0
+
+        # Place 연결 리스트 맨 앞에 연결
+        head = self.place_head.get(place_id, -1)
+        self.next_row[row] = head
+        self.prev_row[row] = -1
+        if head >= 0:
+            self.prev_row[head] = row
+        self.place_head[place_id] = row
+        return row
+
+    def _unlink(self, row: int) -> None:
+        """행을 Place 연결 리스트에서 분리"""
+        prev, next_ = int(self.prev_row[row]), int(self.next_row[row])
+        if prev >= 0:
+            self.next_row[prev] = next_
+        elif next_ >= 0:
+            self.place_head[int(self.place_ids[row])] = next_
+        else:
+            del self.place_head[int(self.place_ids[row])]
+        if next_ >= 0:
+            self.prev_row[next_] = prev
+
+    def _remove_row(self, key: Hashable, row: int) -> None:
+        """행 삭제 (마지막 행과 교환하여 밀집 유지)"""
+        del self.rows[key]
+        self._unlink(row)
+        last = self.size - 1
+        if row != last:
+            for name in self._ROW_COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+            place_id = int(self.place_ids[row])
+            self.rows[pair_key(place_id, int(self.context_ids[row]))] = row
+            # 옮겨진 행을 가리키던 연결 갱신
+            prev, next_ = int(self.prev_row[row]), int(self.next_row[row])
+            if prev >= 0:
+                self.next_row[prev] = row
+            else:
+                self.place_head[place_id] = row
+            if next_ >= 0:
+                self.prev_row[next_] = row
+        self.size = last
+
+    def remove(self, place_id: int, context_id: int) -> bool:
+        """
+        조합 삭제
+
+        Args:
+            place_id: Place ID
+            context_id: Context ID
+
+        Returns:
+            삭제 여부 (없으면 False)
+        """
+        key = pair_key(place_id, context_id)
+        row = self.rows.get(key)
+        if row is None:
+            return False
+        self._remove_row(key, row)
+        return True
+
+    def remove_place(self, place_id: int) -> List[int]:
+        """
+        Place의 모든 조합 삭제 (O(차수))
+
+        Args:
+            place_id: Place ID
+
+        Returns:
+            삭제된 Context ID 목록
+        """
+        context_ids = self.contexts_of(place_id)
+        for context_id in context_ids:
+            key = pair_key(place_id, context_id)
+            self._remove_row(key, self.rows[key])
+        return context_ids
+
+    def rows_of_place(self, place_id: int) -> List[int]:
+        """
+        Place의 조합 행 번호 목록 (연결 리스트 순회, O(차수))
+
+        Args:
+            place_id: Place ID
+
+        Returns:
+            행 번호 목록 (최근 추가된 조합부터)
+        """
+        rows = []
+        row = self.place_head.get(place_id, -1)
+        next_row = self.next_row
+        while row >= 0:
+            rows.append(row)
+            row = int(next_row[row])
+        return rows
+
+    def contexts_of(self, place_id: int) -> List[int]:
+        """Place의 Context ID 목록 (O(차수), 최근 추가된 조합부터)"""
+        return self.context_ids[self.rows_of_place(place_id)].tolist()
+
+    def places(self) -> List[int]:
+        """조합이 하나 이상 있는 Place ID 목록"""
+        return list(self.place_head)
+
+    def clear(self) -> None:
+        """모든 조합 삭제"""
+        self.rows.clear()
+        self.place_head.clear()
+        self.size = 0
+
+    @property
+    def nbytes(self) -> int:
+        """열 배열 + 인덱스 딕셔너리 메모리 (bytes)"""
+        total = sum(getattr(self, name).nbytes for name in self._ROW_COLUMNS)
+        return total + sys.getsizeof(self.rows) + sys.getsizeof(self.place_head)
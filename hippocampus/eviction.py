@@ -0,0 +1,260 @@
+"""
+Eviction Module
+용량 제한 기억 저장소를 위한 교체(eviction) 정책
+
+핵심 개념:
+- LRU: 가장 오래전에 방문한 항목부터 제거 (last_visit_time 순서)
+- LFU: 가장 적게 방문한 항목부터 제거 (visit_count 순서, 동률이면 LRU)
+- Consolidation-aware: Consolidation된(장기 기억) 항목은 보호, 나머지를 LRU로 제거
+- 모든 정책은 접근당 O(1) (상각) bookkeeping
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+Version: v0.4.2-alpha (Bounded-capacity memory)
+License: MIT License
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional
+from collections import OrderedDict
+import heapq
+
+
+class EvictionPolicy:
+    """
+    교체 정책 기본 클래스
+
+    저장소는 항목 추가/방문/삭제 시 정책에 알리고,
+    용량 초과 시 victim()이 고른 항목을 제거합니다.
+    """
+
+    name: str = "base"
+
+    def insert(self, key: Hashable, frequency: int = 0) -> None:
+        """새 항목 등록"""
+        raise NotImplementedError
+
+    def touch(self, key: Hashable, count: int = 1) -> None:
+        """항목 방문 기록 (count회 방문)"""
+        raise NotImplementedError
+
+    def discard(self, key: Hashable) -> None:
+        """항목 삭제 (없으면 무시)"""
+        raise NotImplementedError
+
+    def victim(self) -> Optional[Hashable]:
+        """다음 제거 대상 (비어 있으면 None)"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """모든 항목 삭제"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, key: Hashable) -> bool:
+        raise NotImplementedError
+
+
+class LRUEvictionPolicy(EvictionPolicy):
+    """
+    LRU 교체 정책
+
+    방문 순서를 OrderedDict로 유지합니다 (방문 시 끝으로 이동).
+    """
+
+    name = "lru"
+
+    def __init__(self):
+        self._order: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def insert(self, key: Hashable, frequency: int = 0) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def touch(self, key: Hashable, count: int = 1) -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def discard(self, key: Hashable) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> Optional[Hashable]:
+        return next(iter(self._order), None)
+
+    def clear(self) -> None:
+        self._order.clear()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._order
+
+
+class LFUEvictionPolicy(EvictionPolicy):
+    """
+    LFU 교체 정책
+
+    방문 횟수별 버킷(OrderedDict)을 두고, 최소 방문 횟수는 힙으로 추적합니다.
+    같은 방문 횟수 안에서는 가장 오래전에 방문한 항목이 먼저 제거됩니다.
+    
+    방문 횟수가 count만큼 건너뛸 수 있어 최소값을 O(1)로 따라갈 수 없으므로
+    힙을 지연 삭제로 두고, 빈 버킷 항목이 살아 있는 버킷 수의 두 배를 넘으면
+    살아 있는 버킷으로 다시 만듭니다 (힙 크기 = O(버킷 수), 상각 O(log B)).
+    """
+
+    name = "lfu"
+
+    def __init__(self):
+        self._frequency: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._bucket_heap: list = []  # 버킷 방문 횟수 (지연 삭제)
+
+    def _add_to_bucket(self, key: Hashable, frequency: int) -> None:
+        bucket = self._buckets.get(frequency)
+        if bucket is None:
+            bucket = self._buckets[frequency] = OrderedDict()
+            if len(self._bucket_heap) > 2 * len(self._buckets) + 16:
+                # 지연 삭제된 항목 정리 (새 버킷 포함)
+                self._bucket_heap = list(self._buckets)
+                heapq.heapify(self._bucket_heap)
+            else:
+                heapq.heappush(self._bucket_heap, frequency)
+        bucket[key] = None
+
+    def _remove_from_bucket(self, key: Hashable, frequency: int) -> None:
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+
+    def insert(self, key: Hashable, frequency: int = 0) -> None:
+        self.discard(key)
+        self._frequency[key] = frequency
+        self._add_to_bucket(key, frequency)
+
+    def touch(self, key: Hashable, count: int = 1) -> None:
+        frequency = self._frequency.get(key)
+        if frequency is None:
+            return
+        self._remove_from_bucket(key, frequency)
+        self._frequency[key] = frequency + count
+        self._add_to_bucket(key, frequency + count)
+
+    def discard(self, key: Hashable) -> None:
+        frequency = self._frequency.pop(key, None)
+        if frequency is not None:
+            self._remove_from_bucket(key, frequency)
+
+    def victim(self) -> Optional[Hashable]:
+        while self._bucket_heap:
+            frequency = self._bucket_heap[0]
+            bucket = self._buckets.get(frequency)
+            if bucket:
+                return next(iter(bucket))
+            heapq.heappop(self._bucket_heap)
+        return None
+
+    def clear(self) -> None:
+        self._frequency.clear()
+        self._buckets.clear()
+        self._bucket_heap.clear()
+
+    def __len__(self) -> int:
+        return len(self._frequency)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._frequency
+
+
+class ConsolidationAwareEvictionPolicy(EvictionPolicy):
+    """
+    Consolidation 보호 교체 정책 (비용 인식)
+
+    Consolidation된 항목은 다시 학습하는 비용이 크므로 보호합니다.
+    보호되지 않은 항목을 LRU로 먼저 제거하고, 모두 보호된 경우에만
+    보호 항목 중 가장 오래된 것을 제거합니다.
+
+    보호 여부는 victim 선택 시 is_protected로 확인하며, 보호된 항목은
+    별도 LRU 목록으로 옮겨 다시 검사하지 않습니다 (상각 O(1)).
+    """
+
+    name = "consolidation"
+
+    def __init__(self, is_protected: Optional[Callable[[Any], bool]] = None):
+        """
+        Args:
+            is_protected: 항목 보호 여부 판단 함수 (None이면 보호 없음 = LRU)
+        """
+        self.is_protected = is_protected
+        self._unprotected: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._protected: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def insert(self, key: Hashable, frequency: int = 0) -> None:
+        self._protected.pop(key, None)
+        self._unprotected[key] = None
+        self._unprotected.move_to_end(key)
+
+    def touch(self, key: Hashable, count: int = 1) -> None:
+        if key in self._unprotected:
+            self._unprotected.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+
+    def discard(self, key: Hashable) -> None:
+        self._unprotected.pop(key, None)
+        self._protected.pop(key, None)
+
+    def victim(self) -> Optional[Hashable]:
+        while self._unprotected:
+            key = next(iter(self._unprotected))
+            if self.is_protected is None or not self.is_protected(key):
+                return key
+            # 보호 항목은 보호 목록으로 이동 (방문 순서 유지)
+            del self._unprotected[key]
+            self._protected[key] = None
+        return next(iter(self._protected), None)
+
+    def clear(self) -> None:
+        self._unprotected.clear()
+        self._protected.clear()
+
+    def __len__(self) -> int:
+        return len(self._unprotected) + len(self._protected)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._unprotected or key in self._protected
+
+
+_POLICIES = {
+    LRUEvictionPolicy.name: LRUEvictionPolicy,
+    LFUEvictionPolicy.name: LFUEvictionPolicy,
+    ConsolidationAwareEvictionPolicy.name: ConsolidationAwareEvictionPolicy,
+}
+
+
+def create_eviction_policy(
+    policy: Any = "lru",
+    is_protected: Optional[Callable[[Any], bool]] = None
+) -> EvictionPolicy:
+    """
+    교체 정책 생성
+
+    Args:
+        policy: 정책 이름 ("lru", "lfu", "consolidation") 또는 EvictionPolicy 인스턴스
+        is_protected: 보호 여부 판단 함수 ("consolidation" 정책에서 사용)
+
+    Returns:
+        EvictionPolicy 인스턴스
+    """
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    if policy not in _POLICIES:
+        raise ValueError(
+            f"알 수 없는 교체 정책: {policy!r} (가능: {sorted(_POLICIES)})"
+        )
+    if policy == ConsolidationAwareEvictionPolicy.name:
+        return ConsolidationAwareEvictionPolicy(is_protected=is_protected)
+    return _POLICIES[policy]()
@@ -0,0 +1,290 @@
+"""
+Place Blending Module
+Place Field 블렌딩을 위한 벡터화 엔진
+
+핵심 개념:
+- Place 중심/편향은 PlaceStore의 연속된 (N, D) 열 배열을 그대로 사용
+- 토러스 거리와 가우시안 활성화를 NumPy 한 번의 연산으로 계산
+- 상위 K개 선택은 전체 정렬 대신 부분 선택(argpartition) 사용
+- 배치 질의는 cos/sin 임베딩 행렬곱(BLAS)으로 후보 쌍을 먼저 거름
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+Version: v0.4.2-alpha (Vectorized Place Blending)
+License: MIT License
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+
+# 활성화 하한 (이보다 낮은 Place는 블렌딩에서 제외)
+MIN_ACTIVATION: float = 1e-5
+
+
+def wrap_phase_difference(diff: np.ndarray, phase_wrap: float) -> np.ndarray:
+    """
+    위상 차이를 [-wrap/2, wrap/2] 범위로 정규화
+
+    PlaceCellManager.torus_distance와 동일한 wrapping 규칙을 사용합니다.
+
+    Args:
+        diff: 위상 차이 (임의 shape)
+        phase_wrap: 위상 wrapping 값
+
+    Returns:
+        정규화된 위상 차이
+    """
+    return diff - phase_wrap * np.round(diff / phase_wrap)
+
+
+def torus_sq_distances(
+    centers: np.ndarray,
+    phase_vector: np.ndarray,
+    phase_wrap: float
+) -> np.ndarray:
+    """
+    모든 Place 중심까지의 토러스 거리 제곱 (벡터화)
+
+    수식: d²(Φ, Φ_i) = Σ wrap(φ_j - φ_ij)²
+
+    Args:
+        centers: Place 중심 배열 (N, D)
+        phase_vector: 현재 위상 벡터 (D,)
+        phase_wrap: 위상 wrapping 값
+
+    Returns:
+        거리 제곱 배열 (N,)
+    """
+    diff = wrap_phase_difference(centers - phase_vector, phase_wrap)
+    return np.einsum('ij,ij->i', diff, diff)
+
+
+def gaussian_activations(
+    sq_distances: np.ndarray,
+    sigma: float
+) -> np.ndarray:
+    """
+    가우시안 활성화 (벡터화)
+
+    수식: a_i = exp(-d_i² / 2σ²)
+
+    Args:
+        sq_distances: 거리 제곱 배열
+        sigma: Place Field 폭
+
+    Returns:
+        활성화 배열 [0, 1]
+    """
+    return np.exp(-sq_distances / (2.0 * sigma ** 2))
+
+
+def activation_radius(sigma: float, min_activation: float = MIN_ACTIVATION) -> float:
+    """
+    활성화가 min_activation을 넘을 수 있는 최대 토러스 거리
+
+    수식: r = σ·√(2·ln(1/a_min))
+
+    Args:
+        sigma: Place Field 폭
+        min_activation: 활성화 하한
+
+    Returns:
+        반경 (rad)
+    """
+    return sigma * float(np.sqrt(2.0 * np.log(1.0 / min_activation)))
+
+
+def blend_top_k(
+    activations: np.ndarray,
+    biases: np.ndarray,
+    top_k: int,
+    min_activation: float = MIN_ACTIVATION
+) -> Optional[np.ndarray]:
+    """
+    활성화 상위 K개 Place의 bias 가중 평균
+
+    수식: B_final = Σ(a_i · Bias_i) / Σ(a_i)
+
+    Args:
+        activations: 후보 Place 활성화 (N,)
+        biases: 후보 Place bias (N, D)
+        top_k: 블렌딩에 사용할 상위 K개
+        min_activation: 활성화 하한
+
+    Returns:
+        블렌딩된 bias (활성화된 Place가 없으면 None)
+    """
+    candidates = np.flatnonzero(activations > min_activation)
+    if candidates.size == 0:
+        return None
+
+    if top_k <= 0:
+        return np.zeros(biases.shape[1])
+
+    # 부분 선택: 전체 정렬 없이 상위 K개만 추출
+    if candidates.size > top_k:
+        selected = np.argpartition(activations[candidates], -top_k)[-top_k:]
+        candidates = candidates[selected]
+
+    weights = activations[candidates]
+    total_activation = weights.sum()
+    if total_activation < 1e-10:  # 활성화가 거의 없으면 기본값 반환
+        return np.zeros(biases.shape[1])
+
+    return (weights / total_activation) @ biases[candidates]
+
+
+def torus_embedding(points: np.ndarray, phase_wrap: float) -> np.ndarray:
+    """
+    위상 벡터의 cos/sin 임베딩
+
+    수식: e(Φ) = [cos(2π·φ_j / wrap), sin(2π·φ_j / wrap)]_j
+    현(chord) 거리: ||e(Φ₁) - e(Φ₂)||² = 2D - 2·e(Φ₁)·e(Φ₂) = Σ 4·sin²(θ_j / 2)
+    (θ_j = 2π·wrap(φ₁ⱼ - φ₂ⱼ) / wrap)
+
+    |θ| ≤ π에서 4·sin²(θ/2) ≤ θ² 이므로 현 거리는 토러스 거리(각도 단위)의 하한입니다.
+
+    Args:
+        points: 위상 벡터 배열 (N, D)
+        phase_wrap: 위상 wrapping 값
+
+    Returns:
+        임베딩 배열 (N, 2D)
+    """
+    angles = points * (2.0 * np.pi / phase_wrap)
+    return np.concatenate([np.cos(angles), np.sin(angles)], axis=1)
+
+
+def batch_blend_top_k(
+    queries: np.ndarray,
+    centers: np.ndarray,
+    biases: np.ndarray,
+    top_k: int,
+    sigma: float,
+    phase_wrap: float,
+    min_activation: float = MIN_ACTIVATION,
+    chunk_size: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    여러 질의에 대한 상위 K개 블렌딩 (GEMM 현 거리 사전 필터 + 정확한 거리 재계산)
+
+    1. 질의 묶음마다 임베딩 행렬곱(BLAS) 한 번으로 모든 (질의, 중심) 현 거리 계산
+    2. 현 거리 ≤ 활성화 반경인 쌍만 남김 (현 거리는 토러스 거리의 하한 → 누락 없음)
+    3. 남은 쌍은 torus_sq_distances와 같은 wrapping 차이로 정확한 활성화 계산
+    4. 행별 상위 K개 가중 평균 (blend_top_k와 같은 규칙)
+
+    Args:
+        queries: 질의 위상 벡터 (M, D)
+        centers: Place 중심 (N, D)
+        biases: Place bias (N, B)
+        top_k: 블렌딩에 사용할 상위 K개
+        sigma: 가우시안 표준 편차
+        phase_wrap: 위상 wrapping 값
+        min_activation: 활성화 하한
+        chunk_size: 한 번에 처리할 질의 수 (None이면 약 4M 쌍 단위로 자동)
+
+    Returns:
+        (블렌딩된 bias (M, B), 활성화된 Place가 있었는지 여부 (M,))
+        활성화된 Place가 없는 행의 bias는 0입니다.
+    """
+    num_queries = queries.shape[0]
+    num_centers = centers.shape[0]
+    blended = np.zeros((num_queries, biases.shape[1]))
+    found = np.zeros(num_queries, dtype=bool)
+    if num_queries == 0 or num_centers == 0:
+        return blended, found
+
+    if chunk_size is None:
+        chunk_size = max(1, (1 << 22) // num_centers)
+
+    # 현 거리 임계값 (각도 단위). 사전 필터는 float32 행렬곱이므로
+    # 반올림 오차(~D·1e-7)보다 충분히 큰 여유를 둠 (여유는 후보만 늘림)
+    scale = 2.0 * np.pi / phase_wrap
+    radius = activation_radius(sigma, min_activation)
+    chord_cutoff = (scale * radius) ** 2 + 1e-3
+    center_embedding_t = np.ascontiguousarray(
+        torus_embedding(centers, phase_wrap).astype(np.float32).T
+    )
+    gram_threshold = np.float32(centers.shape[1] - 0.5 * chord_cutoff)
+    dense_fraction = 0.25  # 후보 쌍 비율이 이보다 크면 조밀 경로
+
+    for start in range(0, num_queries, chunk_size):
+        chunk = queries[start:start + chunk_size]
+        gram = torus_embedding(chunk, phase_wrap).astype(np.float32) @ center_embedding_t
+        # chord² = 2D - 2·G ≤ cutoff  ⇔  G ≥ D - cutoff/2
+        candidates = gram >= gram_threshold
+        del gram
+        num_candidates = int(np.count_nonzero(candidates))
+        if num_candidates == 0:
+            continue
+
+        if num_candidates > dense_fraction * candidates.size:
+            # 후보가 많으면 모든 쌍의 정확한 거리를 축별로 누적 (쌍 gather 없이)
+            sq_distances = np.zeros(candidates.shape)
+            for axis in range(centers.shape[1]):
+                diff = wrap_phase_difference(
+                    centers[:, axis] - chunk[:, axis, None], phase_wrap
+                )
+                sq_distances += diff * diff
+            activation_matrix = gaussian_activations(sq_distances, sigma)
+            activation_matrix[activation_matrix <= min_activation] = 0.0
+            del sq_distances
+            chunk_found = activation_matrix.any(axis=1)
+            found[start:start + chunk.shape[0]] = chunk_found
+            if top_k <= 0 or not chunk_found.any():
+                continue
+
+            # 행별 상위 K개 부분 선택
+            k = min(top_k, num_centers)
+            selected = np.argpartition(activation_matrix, num_centers - k, axis=1)[:, -k:]
+            weights = np.take_along_axis(activation_matrix, selected, axis=1)
+            del activation_matrix
+            totals = weights.sum(axis=1)
+            weighted = np.einsum('ik,ikb->ib', weights, biases[selected])
+            valid = totals >= 1e-10  # 활성화가 거의 없으면 0 (blend_top_k와 동일)
+            weighted[valid] /= totals[valid, None]
+            weighted[~valid] = 0.0
+            blended[start:start + chunk.shape[0]] = weighted
+            continue
+
+        # 후보가 적으면 후보 쌍만 정확한 wrapping 거리로 재계산
+        query_rows, center_rows = np.divmod(np.flatnonzero(candidates), num_centers)
+        diff = wrap_phase_difference(centers[center_rows] - chunk[query_rows], phase_wrap)
+        activations = gaussian_activations(np.einsum('ij,ij->i', diff, diff), sigma)
+        active = activations > min_activation
+        query_rows = query_rows[active]
+        center_rows = center_rows[active]
+        activations = activations[active]
+        if query_rows.size == 0:
+            continue
+
+        found[start + np.unique(query_rows)] = True
+        if top_k <= 0:
+            continue
+
+        # 행별 활성화 내림차순 정렬 후 상위 K개 선택
+        order = np.lexsort((-activations, query_rows))
+        query_rows = query_rows[order]
+        center_rows = center_rows[order]
+        activations = activations[order]
+        group_starts = np.flatnonzero(np.r_[True, query_rows[1:] != query_rows[:-1]])
+        rank = np.arange(query_rows.size) - np.repeat(
+            group_starts, np.diff(np.r_[group_starts, query_rows.size])
+        )
+        keep = rank < top_k
+        query_rows = query_rows[keep]
+        center_rows = center_rows[keep]
+        activations = activations[keep]
+
+        # 행별 가중 합 (행은 정렬되어 있으므로 연속 구간 합)
+        group_starts = np.flatnonzero(np.r_[True, query_rows[1:] != query_rows[:-1]])
+        totals = np.add.reduceat(activations, group_starts)
+        weighted = np.add.reduceat(activations[:, None] * biases[center_rows], group_starts)
+        valid = totals >= 1e-10  # 활성화가 거의 없으면 0 (blend_top_k와 동일)
+        weighted[valid] /= totals[valid, None]
+        weighted[~valid] = 0.0
+        blended[start + query_rows[group_starts]] = weighted
+
+    return blended, found
@@ -14,54 +14,269 @@ Version: v0.4.0-alpha (Place Cells extension)
 License: MIT License
 """
 
-from typing import Dict, Optional, Tuple, List
-from dataclasses import dataclass, field
-from collections import deque
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, List, MutableMapping
+from collections import OrderedDict, deque
 import numpy as np
 import math
 
+from .place_blending import (
+    MIN_ACTIVATION,
+    activation_radius,
+    batch_blend_top_k,
+    wrap_phase_difference
+)
+from .place_store import PlaceStore, PlaceHistoryView
+from .spatial_index import PeriodicGridIndex, periodic_close_pairs
+from .place_table import PlaceTable
+from .eviction import EvictionPolicy, create_eviction_policy
+from .result_cache import Dependency, PlaceVersionTracker, ResultCache
+
+
+def _union_find_labels(num_items: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Union-Find로 연결 요소 라벨 계산
+
+    각 요소의 라벨은 그 연결 요소에서 가장 작은 인덱스입니다 (결정적).
+
+    Args:
+        num_items: 요소 수
+        pairs: 연결 쌍 배열 (M, 2)
+
+    Returns:
+        라벨 배열 (num_items,)
+    """
+    parent = list(range(num_items))
+
+    def find(item: int) -> int:
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        # 경로 압축
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    for left, right in pairs.tolist():
+        root_left, root_right = find(left), find(right)
+        if root_left != root_right:
+            # 작은 인덱스를 루트로 유지
+            if root_left < root_right:
+                parent[root_right] = root_left
+            else:
+                parent[root_left] = root_right
+
+    return np.array([find(item) for item in range(num_items)], dtype=np.int64)
+
+
+def _frozen_copy(values: np.ndarray) -> np.ndarray:
+    """
+    저장소 행의 읽기 전용 복사본
+
+    제자리 수정(`pm.bias_estimate[:] = ...`, `pm.place_center += ...`)이 저장소에
+    반영되지 않고 조용히 사라지는 대신 ValueError로 드러나도록 쓰기를 막습니다.
+
+    Args:
+        values: 저장소 행
+
+    Returns:
+        쓰기 불가 복사본
+    """
+    frozen = values.copy()
+    frozen.flags.writeable = False
+    return frozen
+
 
-@dataclass
 class PlaceMemory:
     """
     Place별 기억 데이터 구조
     
     각 Place ID마다 독립적인 bias 추정값과 방문 정보를 저장합니다.
+    
+    실제 데이터는 PlaceStore의 열 배열 한 행에 있으며, PlaceMemory는 그 행을
+    가리키는 가벼운 뷰입니다 ✨ NEW. 배열 속성(bias_estimate, place_center,
+    consolidated_bias)은 저장소 행의 읽기 전용 복사본을 반환하므로, 삭제로 행이 이동해도
+    받아 둔 배열이 다른 Place의 값을 보여주지 않고 제자리 수정은 ValueError를 냅니다.
+    값을 바꾸려면 속성에 대입합니다.
+    단독으로 생성하면 1행짜리 전용 저장소를 사용합니다.
     """
-    place_id: int
-    bias_estimate: np.ndarray = field(default_factory=lambda: np.zeros(5))  # 5D bias [x, y, z, theta_a, theta_b]
-    visit_count: int = 0
-    last_visit_time: float = 0.0
-    last_update_time: float = 0.0  # 마지막 업데이트 시간 (Replay용) ✨ NEW
-    place_center: Optional[np.ndarray] = None  # Place Field 중심 위상 벡터 [phi_x, phi_y, phi_z, phi_a, phi_b]
-    bias_history: deque = field(default_factory=lambda: deque(maxlen=10))  # 최근 10회차 bias 이력 (Replay용) ✨ NEW
-    consolidated_bias: Optional[np.ndarray] = None  # Consolidated bias (통계적 유의성 검증 통과) ✨ NEW
-    consolidation_time: float = 0.0  # Consolidation 수행 시간 ✨ NEW
+    
+    __slots__ = ('_store', '_place_id')
+    
+    def __init__(
+        self,
+        place_id: int,
+        bias_estimate: Optional[np.ndarray] = None,  # 5D bias [x, y, z, theta_a, theta_b]
+        visit_count: int = 0,
+        last_visit_time: float = 0.0,
+        last_update_time: float = 0.0,  # 마지막 업데이트 시간 (Replay용)
+        place_center: Optional[np.ndarray] = None,  # Place Field 중심 위상 벡터
+        bias_history: Optional[deque] = None,  # 최근 10회차 bias 이력 (Replay용)
+        consolidated_bias: Optional[np.ndarray] = None,  # Consolidated bias
+        consolidation_time: float = 0.0  # Consolidation 수행 시간
+    ):
+        bias_dim = 5 if bias_estimate is None else int(np.shape(bias_estimate)[0])
+        history_len = 10
+        if bias_history is not None and getattr(bias_history, 'maxlen', None):
+            history_len = bias_history.maxlen
+        
+        store = PlaceStore(bias_dim=bias_dim, history_len=history_len, initial_capacity=1)
+        store.add(place_id)
+        self._store = store
+        self._place_id = place_id
+        
+        if bias_estimate is not None:
+            self.bias_estimate = bias_estimate
+        self.visit_count = visit_count
+        self.last_visit_time = last_visit_time
+        self.last_update_time = last_update_time
+        self.place_center = place_center
+        if bias_history is not None:
+            self.bias_history = bias_history
+        self.consolidated_bias = consolidated_bias
+        self.consolidation_time = consolidation_time
+    
+    @classmethod
+    def _view(cls, store: PlaceStore, place_id: int) -> 'PlaceMemory':
+        """저장소 행에 대한 뷰 생성 (복사 없음)"""
+        view = cls.__new__(cls)
+        view._store = store
+        view._place_id = place_id
+        return view
+    
+    @property
+    def _row(self) -> int:
+        return self._store.row_of(self._place_id)
+    
+    @property
+    def place_id(self) -> int:
+        return self._place_id
+    
+    @property
+    def bias_estimate(self) -> np.ndarray:
+        return _frozen_copy(self._store.bias[self._row])
+    
+    @bias_estimate.setter
+    def bias_estimate(self, value: np.ndarray) -> None:
+        value = np.asarray(value)
+        if value.shape != (self._store.bias_dim,):
+            raise ValueError(
+                f"bias_estimate 차원 불일치: {value.shape} != ({self._store.bias_dim},)"
+            )
+        row = self._row
+        self._store.bias[row] = value
+        self._store.mark_changed(row)
+    
+    @property
+    def visit_count(self) -> int:
+        return int(self._store.visit_count[self._row])
+    
+    @visit_count.setter
+    def visit_count(self, value: int) -> None:
+        row = self._row
+        self._store.visit_count[row] = value
+        self._store.mark_changed(row)
+    
+    @property
+    def last_visit_time(self) -> float:
+        return float(self._store.last_visit_time[self._row])
+    
+    @last_visit_time.setter
+    def last_visit_time(self, value: float) -> None:
+        self._store.last_visit_time[self._row] = value
+    
+    @property
+    def last_update_time(self) -> float:
+        return float(self._store.last_update_time[self._row])
+    
+    @last_update_time.setter
+    def last_update_time(self, value: float) -> None:
+        self._store.last_update_time[self._row] = value
+    
+    @property
+    def place_center(self) -> Optional[np.ndarray]:
+        row = self._row
+        if not self._store.has_center[row]:
+            return None
+        return _frozen_copy(self._store.center[row])
+    
+    @place_center.setter
+    def place_center(self, value: Optional[np.ndarray]) -> None:
+        self._store.set_center(self._row, value)
+    
+    @property
+    def bias_history(self) -> PlaceHistoryView:
+        return PlaceHistoryView(self._store, self._place_id)
+    
+    @bias_history.setter
+    def bias_history(self, value) -> None:
+        row = self._row
+        self._store.history_clear(row)
+        biases = [np.asarray(bias) for bias in value]
+        if biases:
+            self._store.history_extend(row, np.array(biases))
+    
+    @property
+    def consolidated_bias(self) -> Optional[np.ndarray]:
+        row = self._row
+        if not self._store.has_consolidated[row]:
+            return None
+        return _frozen_copy(self._store.consolidated_bias[row])
+    
+    @consolidated_bias.setter
+    def consolidated_bias(self, value: Optional[np.ndarray]) -> None:
+        row = self._row
+        if value is None:
+            self._store.has_consolidated[row] = False
+        else:
+            self._store.consolidated_bias[row] = value
+            self._store.has_consolidated[row] = True
+    
+    @property
+    def consolidation_time(self) -> float:
+        return float(self._store.consolidation_time[self._row])
+    
+    @consolidation_time.setter
+    def consolidation_time(self, value: float) -> None:
+        self._store.consolidation_time[self._row] = value
+    
+    def __repr__(self) -> str:
+        return (
+            f"PlaceMemory(place_id={self.place_id!r}, "
+            f"bias_estimate={self.bias_estimate!r}, "
+            f"visit_count={self.visit_count!r}, "
+            f"last_visit_time={self.last_visit_time!r}, "
+            f"place_center={self.place_center!r})"
+        )
     
     def update_bias(
         self,
         new_bias: np.ndarray,
-        learning_rate: float = 0.1
+        learning_rate: float = 0.1,
+        count: int = 1
     ) -> None:
         """
         Place별 bias 업데이트 (지수 이동 평균)
         
         수식: b_place = α·b_new + (1-α)·b_old
+        count번 반복 (같은 b_new): b_place = (1-(1-α)^n)·b_new + (1-α)^n·b_old ✨ NEW
         
         Args:
             new_bias: 새로운 bias 추정값
             learning_rate: 학습률 α (기본값: 0.1)
+            count: 같은 bias로 반복할 방문 수 n (머무름 요약 Replay용, 기본값: 1)
         """
         if self.visit_count == 0:
-            # 첫 방문: 새로운 bias 그대로 저장
+            # 첫 방문: 새로운 bias 그대로 저장 (이후 같은 값의 이동 평균은 그대로)
             self.bias_estimate = new_bias.copy()
         else:
             # 이후 방문: 지수 이동 평균으로 업데이트
+            if count != 1:
+                learning_rate = 1.0 - (1.0 - learning_rate) ** count
             self.bias_estimate = (
                 learning_rate * new_bias +
                 (1 - learning_rate) * self.bias_estimate
             )
-        self.visit_count += 1
+        self.visit_count += count
     
     def add_bias_to_history(self, bias: np.ndarray) -> None:
         """
@@ -70,7 +285,7 @@ class PlaceMemory:
         Args:
             bias: 새로운 bias 추정값
         """
-        self.bias_history.append(bias.copy())
+        self._store.history_append(self._row, bias)
     
     def get_recent_biases(self, n: int) -> List[np.ndarray]:
         """
@@ -82,11 +297,12 @@ class PlaceMemory:
         Returns:
             최근 N회차의 bias 리스트
         """
-        if len(self.bias_history) == 0:
+        history = self._store.history_array(self._row)
+        if len(history) == 0:
             return []
         
         # 최근 N개 반환 (이력이 N개보다 적으면 모두 반환)
-        recent = list(self.bias_history)[-n:]
+        recent = list(history)[-n:]
         return recent
     
     def update_place_center(
@@ -114,6 +330,48 @@ class PlaceMemory:
             )
 
 
+def _grouped_ema(
+    values: np.ndarray,
+    starts: np.ndarray,
+    sizes: np.ndarray,
+    alpha: float,
+    initial: np.ndarray,
+    restart: np.ndarray
+) -> np.ndarray:
+    """
+    그룹별 순차 지수 이동 평균의 닫힌 형태
+
+    수식: x_n = (1-α)^n·x_0 + Σ_j α·(1-α)^(n-j)·v_j
+    restart 그룹은 x_0 대신 첫 값에서 시작합니다 (첫 방문: x_1 = v_1).
+
+    Args:
+        values: 그룹 순서로 정렬된 값 (M, D)
+        starts: 그룹 시작 인덱스 (G,)
+        sizes: 그룹 크기 (G,)
+        alpha: 학습률 α
+        initial: 그룹별 초기값 x_0 (G, D)
+        restart: 첫 값에서 시작하는 그룹 여부 (G,)
+
+    Returns:
+        그룹별 최종값 (G, D)
+    """
+    decay = 1.0 - alpha
+    group = np.repeat(np.arange(starts.shape[0]), sizes)
+    rank = np.arange(values.shape[0]) - starts[group]
+    remaining = sizes[group] - 1 - rank  # 이후 샘플 수
+
+    weights = alpha * decay ** remaining
+    # 첫 방문 그룹: 첫 샘플이 초기값 역할 (가중치 (1-α)^(n-1))
+    first_of_restart = (rank == 0) & restart[group]
+    weights[first_of_restart] = decay ** remaining[first_of_restart]
+
+    initial_weights = np.where(restart, 0.0, decay ** sizes)
+    return (
+        initial_weights[:, None] * initial +
+        np.add.reduceat(weights[:, None] * values, starts, axis=0)
+    )
+
+
 class PlaceCellManager:
     """
     Place Cells 관리자
@@ -125,55 +383,242 @@ class PlaceCellManager:
         self,
         num_places: int = 1000,
         phase_wrap: float = 2.0 * math.pi,
-        quantization_level: int = 100
+        quantization_level: int = 100,
+        bias_dim: int = 5,
+        use_spatial_index: bool = True,
+        capacity: Optional[int] = None,
+        eviction_policy: Any = "lru",
+        result_cache_size: int = 0,
+        result_cache_resolution: float = 1e-6
     ):
         """
         Place Cell Manager 초기화
         
         Args:
-            num_places: 최대 Place 수 (기본값: 1000)
+            num_places: 예상 Place 수 (셀 테이블 초기 크기 힌트, 기본값: 1000)
             phase_wrap: 위상 wrapping 값 (기본값: 2π)
             quantization_level: 위상 공간 양자화 레벨 (기본값: 100)
+            bias_dim: bias 차원 (기본값: 5)
+            use_spatial_index: Place 중심 공간 인덱스 사용 여부 (기본값: True)
+            capacity: 저장할 최대 Place 수 (None이면 무제한)
+            eviction_policy: 용량 초과 시 교체 정책
+                ("lru", "lfu", "consolidation" 또는 EvictionPolicy 인스턴스)
+            result_cache_size: get_bias_estimate 결과 캐시 크기 (0이면 사용 안 함)
+            result_cache_resolution: 결과 캐시 위상 키 양자화 간격 (rad)
         """
+        if capacity is not None and capacity <= 0:
+            raise ValueError(f"capacity는 양수여야 합니다: {capacity}")
+        
         self.num_places = num_places
         self.phase_wrap = phase_wrap
         self.quantization_level = quantization_level
+        self.bias_dim = bias_dim
         
-        # Place Memory 저장소: place_id → PlaceMemory
-        self.place_memory: Dict[int, PlaceMemory] = {}
+        # 양자화 셀 → 밀집 Place ID 테이블 (충돌 없음, 방문한 셀 수에 따라 확장) ✨ NEW
+        # (num_places는 초기 크기 힌트일 뿐이므로 과도한 선할당은 하지 않음)
+        self.place_table = PlaceTable(initial_capacity=min(num_places, 1 << 16))
         
         # Place Field 파라미터
         self.place_field_sigma: float = 0.1  # Place Field 폭 (rad)
         self.merge_threshold: float = 0.1  # Place Field 병합 임계 거리 (rad)
+        
+        # Place 중심 공간 인덱스 (토러스 wrapping 고려 균일 셀 격자) ✨ NEW
+        # 셀 크기 = place_field_sigma의 활성화 반경 → 질의 시 주변 셀만 확인
+        spatial_index = None
+        if use_spatial_index:
+            spatial_index = PeriodicGridIndex(
+                phase_wrap=phase_wrap,
+                cell_size=activation_radius(self.place_field_sigma)
+            )
+        
+        # 열 단위 Place 저장소 (bias/중심/방문 정보/이력 링 버퍼) ✨ NEW
+        self.store = PlaceStore(bias_dim=bias_dim, index=spatial_index)
+        
+        # 용량 제한 + 교체 정책 (consolidation 정책은 Consolidation된 Place 보호) ✨ NEW
+        self.capacity = capacity
+        self.eviction_policy: EvictionPolicy = create_eviction_policy(
+            eviction_policy, is_protected=self.is_place_consolidated
+        )
+        self.num_evictions = 0
+        self._eviction_listeners: List[Callable[[int], None]] = []
+        
+        # Place Memory 저장소: place_id → PlaceMemory (저장소 행에 대한 뷰)
+        self.place_memory: Dict[int, PlaceMemory] = PlaceMemoryMapping(
+            self.store,
+            add_place=self._ensure_place,
+            remove_place=self._remove_place
+        )
+        
+        # 읽기 경로 miss 표식: 공유 읽기 전용 0 벡터 (캐시 내부용, 반환 시 새 배열) ✨ NEW
+        self._zero_bias = np.zeros(bias_dim)
+        self._zero_bias.flags.writeable = False
+        
+        # Negative cache: 최근 miss 질의 (위상 bytes, 옵션) → 저장소 generation
+        # generation이 바뀌면(Place 추가/삭제, 중심 이동) 자동 무효화
+        self.negative_cache_size: int = 256
+        self._negative_cache: OrderedDict = OrderedDict()
+        
+        # 버전 검증 결과 캐시 (선택): Place 변경 시 그 주변 셀을 포함하는 항목만 무효화 ✨ NEW
+        self.result_cache: Optional[ResultCache] = None
+        self.version_tracker: Optional[PlaceVersionTracker] = None
+        if result_cache_size > 0:
+            self.result_cache = ResultCache(
+                max_entries=result_cache_size,
+                resolution=result_cache_resolution
+            )
+            self.version_tracker = PlaceVersionTracker(self.store)
+    
+    def add_eviction_listener(self, listener: Callable[[int], None]) -> None:
+        """
+        Place 교체 리스너 등록
+        
+        용량 초과로 Place가 교체될 때마다 listener(place_id)가 호출됩니다
+        (예: 해당 Place의 Context Memory 연쇄 삭제).
+        
+        Args:
+            listener: 교체된 place_id를 받는 함수
+        """
+        self._eviction_listeners.append(listener)
+    
+    def is_place_consolidated(self, place_id: int) -> bool:
+        """Place가 Consolidation되었는지 여부 (없는 Place는 False)"""
+        row = self.store.rows.get(place_id)
+        return row is not None and bool(self.store.has_consolidated[row])
+    
+    def mark_place_visited(self, place_id: int, count: int = 1) -> None:
+        """
+        교체 정책에 Place 방문 기록
+        
+        update_place_memory/update_place_memories는 자동으로 기록합니다.
+        PlaceMemory 뷰로 직접 bias를 갱신한 경우 호출합니다.
+        
+        Args:
+            place_id: Place ID
+            count: 방문 횟수
+        """
+        if self.capacity is not None:
+            self.eviction_policy.touch(place_id, count)
+    
+    def _ensure_place(self, place_id: int, frequency: int = 0) -> int:
+        """
+        Place 행 확보 (없으면 필요 시 교체 후 추가)
+        
+        Args:
+            place_id: Place ID
+            frequency: 교체 정책에 등록할 초기 방문 횟수
+        
+        Returns:
+            행 번호
+        """
+        row = self.store.rows.get(place_id)
+        if row is not None:
+            return row
+        if self.capacity is not None:
+            self._evict(len(self.store) + 1 - self.capacity)
+        row = self.store.add(place_id)
+        self.eviction_policy.insert(place_id, frequency)
+        return row
+    
+    def _remove_place(self, place_id: int) -> None:
+        """Place 삭제 (교체 정책에서도 제거, 리스너 호출 없음)"""
+        self.eviction_policy.discard(place_id)
+        self.store.remove(place_id)
+    
+    def _evict(self, count: int) -> int:
+        """
+        교체 정책이 고른 Place를 count개 삭제하고 리스너에 알림
+        
+        Args:
+            count: 삭제할 Place 수 (0 이하이면 아무것도 하지 않음)
+        
+        Returns:
+            삭제된 Place 수
+        """
+        evicted = 0
+        while evicted < count:
+            victim = self.eviction_policy.victim()
+            if victim is None:
+                break
+            self._remove_place(victim)
+            for listener in self._eviction_listeners:
+                listener(victim)
+            evicted += 1
+        self.num_evictions += evicted
+        return evicted
+    
+    def _quantize(self, phase_vectors: np.ndarray) -> np.ndarray:
+        """위상 벡터(배열)를 양자화 셀 키(정수)로 변환"""
+        return (phase_vectors * self.quantization_level / self.phase_wrap).astype(np.int64)
     
     def get_place_id(self, phase_vector: np.ndarray) -> int:
         """
-        위상 벡터를 Place ID로 변환
+        위상 벡터를 Place ID로 변환 (처음 방문한 셀이면 새 ID 할당)
         
-        수식: place_id = hash(Φ) mod N
+        수식: place_id = table[⌊Φ · Q / wrap⌋]
+        
+        양자화 셀 키 전체를 개방 주소법 테이블에 저장하므로 서로 다른 셀은
+        항상 서로 다른 Place ID를 갖습니다 (기존 hash(Φ) mod N의 충돌 제거). ✨ FIXED
         
         Args:
             phase_vector: 위상 벡터 [phi_x, phi_y, phi_z, phi_a, phi_b] (rad)
         
         Returns:
-            Place ID (0 ~ num_places-1)
+            Place ID (0부터 처음 방문한 순서대로)
+        """
+        phase_int = self._quantize(np.asarray(phase_vector, dtype=float))
+        return self.place_table.get_or_add(phase_int)
+    
+    def lookup_place_id(self, phase_vector: np.ndarray) -> Optional[int]:
         """
-        # 위상 공간 양자화
-        # 위상 벡터를 정수 배열로 변환 (소수점 이하 자릿수 처리)
-        phase_int = (phase_vector * self.quantization_level / self.phase_wrap).astype(int)
+        위상 벡터의 Place ID 조회 (방문하지 않은 셀이면 None, 할당 없음) ✨ NEW
         
-        # 해시 함수 적용
-        # tuple로 변환하여 해시 가능하게 만듦
-        place_hash = hash(tuple(phase_int))
+        Args:
+            phase_vector: 위상 벡터 (rad)
+        
+        Returns:
+            Place ID 또는 None
+        """
+        phase_int = self._quantize(np.asarray(phase_vector, dtype=float))
+        place_id = self.place_table.lookup(phase_int)
+        return place_id if place_id >= 0 else None
+    
+    def get_place_ids(self, phase_vectors: np.ndarray) -> np.ndarray:
+        """
+        위상 벡터 배열을 Place ID 배열로 변환 (배치) ✨ NEW
+        
+        양자화와 테이블 탐사를 모두 벡터화하며, 새 셀은 처음 등장 순서대로 ID를 할당하므로
+        get_place_id를 행마다 호출한 것과 항상 동일한 ID를 생성합니다.
         
-        # 모듈로 연산으로 Place ID 생성
-        place_id = place_hash % self.num_places
+        Args:
+            phase_vectors: 위상 벡터 배열 (M, D) (rad)
         
-        # 음수 처리 (Python hash는 음수 가능)
-        if place_id < 0:
-            place_id = -place_id
+        Returns:
+            Place ID 배열 (M,) int64
+        """
+        phase_vectors = self._check_batch(phase_vectors)
+        return self.place_table.get_or_add_many(self._quantize(phase_vectors))
+    
+    def lookup_place_ids(self, phase_vectors: np.ndarray) -> np.ndarray:
+        """
+        위상 벡터 배열의 Place ID 조회 (배치, 방문하지 않은 셀은 -1, 할당 없음) ✨ NEW
+        
+        Args:
+            phase_vectors: 위상 벡터 배열 (M, D) (rad)
         
-        return place_id
+        Returns:
+            Place ID 배열 (M,) int64
+        """
+        phase_vectors = self._check_batch(phase_vectors)
+        return self.place_table.lookup_many(self._quantize(phase_vectors))
+    
+    @staticmethod
+    def _check_batch(phase_vectors: np.ndarray) -> np.ndarray:
+        phase_vectors = np.asarray(phase_vectors, dtype=float)
+        if phase_vectors.ndim != 2:
+            raise ValueError(
+                f"phase_vectors는 (M, D) 배열이어야 합니다: {phase_vectors.shape}"
+            )
+        return phase_vectors
     
     def torus_distance(
         self,
@@ -244,18 +689,32 @@ class PlaceCellManager:
         Returns:
             PlaceMemory 객체
         """
-        if place_id not in self.place_memory:
-            # 새로운 Place Memory 생성
-            self.place_memory[place_id] = PlaceMemory(place_id=place_id)
+        if place_id not in self.store:
+            # 새로운 Place Memory 생성 (저장소에 0으로 초기화된 행 추가, 용량 초과 시 교체)
+            self._ensure_place(place_id)
         
-        return self.place_memory[place_id]
+        return PlaceMemory._view(self.store, place_id)
+    
+    def peek_place_memory(self, place_id: int) -> Optional[PlaceMemory]:
+        """
+        Place Memory 조회 (없으면 None, 생성/수정 없음) ✨ NEW
+        
+        Args:
+            place_id: Place ID
+        
+        Returns:
+            PlaceMemory 뷰 또는 None
+        """
+        if place_id not in self.store:
+            return None
+        return PlaceMemory._view(self.store, place_id)
     
     def update_place_memory(
         self,
         place_id: int,
         phase_vector: np.ndarray,
         bias: np.ndarray,
-        current_time: float = 0.0,
+        current_time: Optional[float] = 0.0,
         learning_rate: float = 0.1
     ) -> None:
         """
@@ -265,23 +724,136 @@ class PlaceCellManager:
             place_id: Place ID
             phase_vector: 현재 위상 벡터
             bias: 새로운 bias 추정값
-            current_time: 현재 시간
+            current_time: 현재 시간 (None이면 방문/업데이트 시간을 바꾸지 않음)
             learning_rate: 학습률
         """
-        place_memory = self.get_place_memory(place_id)
+        # 저장소 행을 직접 갱신 (PlaceMemory.update_bias/update_place_center와 동일한 수식)
+        store = self.store
+        row = self._ensure_place(place_id)
+        if self.capacity is not None:
+            self.eviction_policy.touch(place_id)
         
         # Bias 업데이트
-        place_memory.update_bias(bias, learning_rate)
+        if store.visit_count[row] == 0:
+            store.bias[row] = bias
+        else:
+            store.bias[row] = learning_rate * bias + (1 - learning_rate) * store.bias[row]
+        store.visit_count[row] += 1
         
         # Bias 이력에 추가 (Replay/Consolidation용) ✨ NEW
-        place_memory.add_bias_to_history(bias)
+        store.history_append(row, bias)
         
         # Place Field 중심 업데이트
-        place_memory.update_place_center(phase_vector, learning_rate=0.05)
+        center_rate = 0.05
+        if store.has_center[row]:
+            store.set_center(
+                row, center_rate * phase_vector + (1 - center_rate) * store.center[row]
+            )
+        else:
+            store.set_center(row, phase_vector)
         
         # 방문 시간 업데이트
-        place_memory.last_visit_time = current_time
-        place_memory.last_update_time = current_time  # Replay용 ✨ NEW
+        if current_time is not None:
+            store.last_visit_time[row] = current_time
+            store.last_update_time[row] = current_time  # Replay용 ✨ NEW
+    
+    def update_place_memories(
+        self,
+        place_ids: np.ndarray,
+        phase_vectors: np.ndarray,
+        biases: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+        learning_rate: float = 0.1
+    ) -> int:
+        """
+        Place Memory 배치 업데이트 (scatter 방식) ✨ NEW
+        
+        샘플을 Place별로 묶고, 순차 지수 이동 평균을 닫힌 형태로 한 번에 적용합니다.
+        결과는 update_place_memory를 샘플 순서대로 호출한 것과 같습니다.
+        
+        수식 (그룹 내 n개 샘플 b_1..b_n):
+        b_n = (1-α)^n·b_0 + Σ α·(1-α)^(n-j)·b_j
+        (첫 방문이면 b_0 대신 b_1에서 시작: b_1의 가중치 = (1-α)^(n-1))
+        
+        Args:
+            place_ids: Place ID 배열 (M,)
+            phase_vectors: 위상 벡터 배열 (M, D)
+            biases: bias 배열 (M, D_bias)
+            timestamps: 시간 배열 (M,) (None이면 0.0)
+            learning_rate: bias 학습률
+        
+        Returns:
+            업데이트된 Place 수
+        """
+        place_ids = np.asarray(place_ids, dtype=np.int64)
+        phase_vectors = np.asarray(phase_vectors, dtype=float)
+        biases = np.asarray(biases, dtype=float)
+        if timestamps is None:
+            timestamps = np.zeros(place_ids.shape[0])
+        timestamps = np.asarray(timestamps, dtype=float)
+        if place_ids.shape[0] == 0:
+            return 0
+        
+        # Place별 그룹화 (stable 정렬로 그룹 내 샘플 순서 유지)
+        order = np.argsort(place_ids, kind='stable')
+        sorted_ids = place_ids[order]
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        sizes = np.diff(np.r_[starts, sorted_ids.shape[0]])
+        group_ids = sorted_ids[starts].tolist()
+        store = self.store
+        
+        if self.capacity is not None and len(group_ids) > self.capacity:
+            # 배치 안에서 교체가 일어나야 하므로 순차 처리
+            for index in range(place_ids.shape[0]):
+                self.update_place_memory(
+                    int(place_ids[index]), phase_vectors[index], biases[index],
+                    float(timestamps[index]), learning_rate
+                )
+            return len(group_ids)
+        
+        # 배치 Place는 교체 대상에서 잠시 제외하고, 필요한 만큼 미리 교체
+        for place_id in group_ids:
+            self.eviction_policy.discard(place_id)
+        if self.capacity is not None:
+            num_new = sum(1 for place_id in group_ids if place_id not in store)
+            self._evict(len(store) + num_new - self.capacity)
+        
+        # 그룹별 현재 상태 수집 (저장소 열에서 직접)
+        rows = store.add_many(group_ids)
+        is_first_visit = store.visit_count[rows] == 0
+        has_no_center = ~store.has_center[rows]
+        bias_init = store.bias[rows]
+        if store.center is None:
+            center_init = np.zeros((rows.shape[0], phase_vectors.shape[1]))
+        else:
+            center_init = store.center[rows]
+        
+        new_biases = _grouped_ema(
+            biases[order], starts, sizes, learning_rate, bias_init, is_first_visit
+        )
+        new_centers = _grouped_ema(
+            phase_vectors[order], starts, sizes, 0.05, center_init, has_no_center
+        )
+        last_times = timestamps[order[starts + sizes - 1]]
+        
+        store.bias[rows] = new_biases
+        store.set_centers(rows, new_centers)
+        store.visit_count[rows] += sizes
+        store.last_visit_time[rows] = last_times
+        store.last_update_time[rows] = last_times
+        
+        # Bias 이력: 그룹의 마지막 history_len개만 의미 있음
+        ordered_biases = biases[order]
+        for row, start, size in zip(rows.tolist(), starts.tolist(), sizes.tolist()):
+            store.history_extend(row, ordered_biases[start:start + size])
+        
+        # 교체 정책에 마지막 방문 순서대로 다시 등록 (방문 횟수 = visit_count)
+        last_visit_order = np.argsort(order[starts + sizes - 1], kind='stable')
+        visit_counts = store.visit_count[rows].tolist()
+        for group in last_visit_order.tolist():
+            self.eviction_policy.insert(group_ids[group], visit_counts[group])
+        
+        return int(rows.shape[0])
     
     def get_bias_estimate(
         self,
@@ -312,62 +884,174 @@ class PlaceCellManager:
         
         Returns:
             bias_estimate: Place별 bias 추정값 [x, y, z, theta_a, theta_b]
+            (해당 Place가 없으면 0 벡터, 항상 호출자 소유의 새 배열)
         """
-        if not use_blending or len(self.place_memory) == 0:
-            # Hard-switching: 단일 Place의 bias만 반환
-            place_id = self.get_place_id(phase_vector)
-            place_memory = self.get_place_memory(place_id)
-            return place_memory.bias_estimate.copy()
+        cache = self.result_cache
+        if cache is not None:
+            # 버전 검증 결과 캐시 ✨ NEW
+            cache_key = cache.make_key(phase_vector, None, use_blending, top_k, sigma)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached.copy()
+            place_id = self.lookup_place_id(phase_vector)
+            dependencies = self.bias_dependencies(
+                phase_vector, place_id, use_blending, sigma, top_k
+            )
+            bias = self._compute_bias_estimate(
+                phase_vector, use_blending, top_k, sigma, place_id, place_id_known=True
+            )
+            if bias is self._zero_bias:
+                cache.put(cache_key, bias, dependencies)
+                return bias.copy()
+            cache.put(cache_key, bias.copy(), dependencies)
+            return bias
         
-        # Soft-switching: 주변 Place Cell들의 가중 평균
-        # 1. 모든 Place Cell의 활성화 강도 계산
-        activations = []
-        for place_id, place_memory in self.place_memory.items():
-            if place_memory.place_center is None:
-                # ✅ place_center가 None이면 현재 phase_vector로 설정 ✨ FIXED
-                place_memory.place_center = phase_vector.copy()
-            
-            # 가우시안 활성화 강도 계산
-            activation = self.place_cell_activation(
-                phase_vector=phase_vector,
-                place_center=place_memory.place_center,
-                sigma=sigma
+        bias = self._compute_bias_estimate(phase_vector, use_blending, top_k, sigma)
+        return bias.copy() if bias is self._zero_bias else bias
+    
+    def get_bias_estimates(
+        self,
+        phase_vectors: np.ndarray,
+        use_blending: bool = True,
+        top_k: int = 5,
+        sigma: float = 0.5,
+        chunk_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        위상 벡터 배열의 bias 추정값 (배치, 오프라인 보정표 생성용) ✨ NEW
+        
+        get_bias_estimate를 행마다 호출한 것과 (허용 오차 내에서) 같은 결과를 반환합니다.
+        - 블렌딩: cos/sin 임베딩 행렬곱으로 활성화 반경 후보를 고른 뒤
+          torus_distance와 같은 wrapping 거리로 정확한 활성화 계산
+        - 활성화된 Place가 없는 행: get_place_ids로 Hard-switching (없으면 0)
+        
+        Args:
+            phase_vectors: 위상 벡터 배열 (M, D) (rad)
+            use_blending: Place Blending 사용 여부 (기본값: True)
+            top_k: 블렌딩에 사용할 상위 K개 Place Cell (기본값: 5)
+            sigma: 가우시안 활성화 함수의 표준 편차 (기본값: 0.5)
+            chunk_size: 한 번에 처리할 질의 수 (None이면 자동)
+        
+        Returns:
+            bias 추정값 배열 (M, bias_dim)
+        """
+        phase_vectors = self._check_batch(phase_vectors)
+        
+        store = self.store
+        estimates = np.zeros((phase_vectors.shape[0], self.bias_dim))
+        found = np.zeros(phase_vectors.shape[0], dtype=bool)
+        if use_blending and store.center is not None:
+            rows = store.centered_rows()
+            estimates, found = batch_blend_top_k(
+                phase_vectors,
+                store.center[rows],
+                store.bias[rows],
+                top_k=top_k,
+                sigma=sigma,
+                phase_wrap=self.phase_wrap,
+                min_activation=MIN_ACTIVATION,
+                chunk_size=chunk_size
             )
-            
-            # ✅ 활성화가 너무 낮으면 스킵 (1e-5 이상만 고려) ✨ FIXED
-            if activation > 1e-5:
-                activations.append((activation, place_id, place_memory))
-        
-        if len(activations) == 0:
-            # 활성화된 Place가 없으면 place_id 기반으로 fallback ✨ FIXED
-            place_id = self.get_place_id(phase_vector)
-            place_memory = self.get_place_memory(place_id)
-            # place_center가 None이면 지금 설정
-            if place_memory.place_center is None:
-                place_memory.place_center = phase_vector.copy()
-            return place_memory.bias_estimate.copy()
         
-        # 2. 활성화 강도 순으로 정렬하여 상위 K개 선택
-        activations.sort(key=lambda x: x[0], reverse=True)
-        top_activations = activations[:top_k]
+        # Hard-switching (또는 활성화된 Place가 없을 때 fallback, 셀 ID 할당 없음)
+        missing = np.flatnonzero(~found)
+        if missing.size > 0:
+            place_ids = self.lookup_place_ids(phase_vectors[missing]).tolist()
+            for query_row, place_id in zip(missing.tolist(), place_ids):
+                row = store.rows.get(place_id)
+                if row is not None:
+                    estimates[query_row] = store.bias[row]
         
-        # 3. 가중 평균 계산
-        total_activation = sum(a[0] for a in top_activations)
+        return estimates
+    
+    def bias_dependencies(
+        self,
+        phase_vector: np.ndarray,
+        place_id: Optional[int],
+        use_blending: bool = True,
+        sigma: float = 0.5,
+        top_k: Optional[int] = None
+    ) -> Tuple[Dependency, ...]:
+        """
+        get_bias_estimate 결과가 의존하는 버전 카운터 스냅샷 (결과 캐시용) ✨ NEW
         
-        if total_activation < 1e-10:  # 활성화가 거의 없으면 기본값 반환
-            if len(top_activations) > 0:
-                _, _, first_memory = top_activations[0]
-                return np.zeros_like(first_memory.bias_estimate)
-            return np.zeros(5)  # 기본값: 5D
+        - 블렌딩: 활성화 반경 (top_k가 있으면 k번째 최근접 거리) 내 격자 셀 버전
+          (전체 스캔이면 전체 버전)
+        - Hard-switching / fallback: 해당 Place 버전
+          (방문하지 않은 셀이면 셀 테이블 크기: 셀이 등록되면 무효화)
         
-        # 가중 평균: B_final = Σ(a_i · Bias_i) / Σ(a_i)
-        # 첫 번째 Place Memory의 bias 크기로 초기화
-        _, _, first_memory = top_activations[0]
-        weighted_bias = np.zeros_like(first_memory.bias_estimate)
+        Args:
+            phase_vector: 질의 위상 벡터
+            place_id: 질의 위상의 Place ID (lookup_place_id 결과, None 가능)
+            use_blending: Place Blending 사용 여부
+            sigma: 가우시안 표준 편차
+            top_k: 블렌딩 상위 K개 (None이면 활성화 반경 전체)
         
-        for activation, place_id, place_memory in top_activations:
-            weight = activation / total_activation
-            weighted_bias += weight * place_memory.bias_estimate
+        Returns:
+            의존성 튜플 (결과 캐시가 꺼져 있으면 빈 튜플)
+        """
+        tracker = self.version_tracker
+        if tracker is None:
+            return ()
+        if place_id is None:
+            dependencies = ((self.place_table.__len__, len(self.place_table)),)
+        else:
+            dependencies = (tracker.place_dependency(place_id),)
+        if use_blending:
+            dependencies += (tracker.neighborhood_dependency(
+                phase_vector, activation_radius(sigma, MIN_ACTIVATION), top_k
+            ),)
+        return dependencies
+    
+    def _compute_bias_estimate(
+        self,
+        phase_vector: np.ndarray,
+        use_blending: bool,
+        top_k: int,
+        sigma: float,
+        place_id: Optional[int] = None,
+        place_id_known: bool = False
+    ) -> np.ndarray:
+        """
+        get_bias_estimate 계산 본체 (캐시 없이, place_id_known이면 place_id는 lookup_place_id 결과)
+        
+        miss이면 공유 읽기 전용 _zero_bias를 그대로 반환합니다 (호출자가 복사).
+        """
+        # 최근 miss 질의는 저장소 구조가 그대로면 즉시 공유 0 벡터 반환 ✨ NEW
+        miss_key = (
+            np.ascontiguousarray(phase_vector, dtype=float).tobytes(),
+            use_blending, top_k, sigma
+        )
+        if self._negative_cache.get(miss_key) == self.store.generation:
+            self._negative_cache.move_to_end(miss_key)
+            return self._zero_bias
+        
+        weighted_bias = None
+        if use_blending and len(self.store) > 0:
+            # Soft-switching: 주변 Place Cell들의 가중 평균 (중심이 없는 Place는 제외)
+            # 1. 공간 인덱스로 활성화 반경 내 후보만 골라 활성화 강도를 한 번에 계산 ✨ NEW
+            # 2. 활성화 1e-5 이하 제외 후 상위 K개 부분 선택
+            # 3. 가중 평균: B_final = Σ(a_i · Bias_i) / Σ(a_i)
+            weighted_bias = self.store.blend(
+                phase_vector,
+                top_k=top_k,
+                sigma=sigma,
+                phase_wrap=self.phase_wrap,
+                min_activation=MIN_ACTIVATION
+            )
+        
+        if weighted_bias is None:
+            # Hard-switching (또는 활성화된 Place가 없을 때 fallback): 단일 Place의 bias
+            # 읽기 경로이므로 Place를 생성하거나 수정하지 않음 ✨ FIXED
+            if not place_id_known:
+                place_id = self.lookup_place_id(phase_vector)
+            place_memory = None if place_id is None else self.peek_place_memory(place_id)
+            if place_memory is None:
+                self._negative_cache[miss_key] = self.store.generation
+                if len(self._negative_cache) > self.negative_cache_size:
+                    self._negative_cache.popitem(last=False)
+                return self._zero_bias
+            return place_memory.bias_estimate.copy()
         
         return weighted_bias
     
@@ -378,6 +1062,12 @@ class PlaceCellManager:
         """
         가까운 Place Field들을 병합
         
+        1. 공간 격자로 임계 거리 내 후보 쌍만 찾음 (O(N log N))
+        2. Union-Find로 전이적 클러스터 구성 (A~B, B~C → {A, B, C})
+        3. 클러스터마다 방문 횟수 가중 평균으로 한 번에 병합
+        
+        대표 Place는 클러스터에서 place_memory 순서상 가장 앞선 Place입니다 (결정적).
+        
         Args:
             distance_threshold: 병합 임계 거리 (None이면 기본값 사용)
         
@@ -387,60 +1077,82 @@ class PlaceCellManager:
         if distance_threshold is None:
             distance_threshold = self.merge_threshold
         
+        # place_center가 있는 Place만 병합 대상 (place_memory 순서 유지)
+        candidates = [
+            place_memory for place_memory in self.place_memory.values()
+            if place_memory.place_center is not None
+        ]
+        if len(candidates) < 2:
+            return 0
+        
+        centers = np.array([place_memory.place_center for place_memory in candidates])
+        pairs = periodic_close_pairs(centers, distance_threshold, self.phase_wrap)
+        if pairs.shape[0] == 0:
+            return 0
+        
+        labels = _union_find_labels(len(candidates), pairs)
+        
+        # 클러스터별 멤버 (대표 = 가장 작은 인덱스 = labels 값)
+        merged_rows = np.flatnonzero(labels != np.arange(len(candidates)))
+        clusters: Dict[int, List[int]] = {}
+        for row in merged_rows.tolist():
+            clusters.setdefault(int(labels[row]), [int(labels[row])]).append(row)
+        
         merged_count = 0
-        place_ids = list(self.place_memory.keys())
-        
-        # 모든 Place 쌍에 대해 거리 계산
-        for i, place_id1 in enumerate(place_ids):
-            if place_id1 not in self.place_memory:
-                continue
-            
-            place1 = self.place_memory[place_id1]
-            if place1.place_center is None:
-                continue
-            
-            for place_id2 in place_ids[i+1:]:
-                if place_id2 not in self.place_memory:
-                    continue
-                
-                place2 = self.place_memory[place_id2]
-                if place2.place_center is None:
-                    continue
-                
-                # 토러스 거리 계산
-                distance = self.torus_distance(
-                    place1.place_center,
-                    place2.place_center
-                )
-                
-                # 임계 거리 이하이면 병합
-                if distance < distance_threshold:
-                    # place_id1에 place_id2의 정보 병합
-                    # Bias는 가중 평균 (방문 횟수 기준)
-                    total_visits = place1.visit_count + place2.visit_count
-                    if total_visits > 0:
-                        weight1 = place1.visit_count / total_visits
-                        weight2 = place2.visit_count / total_visits
-                        place1.bias_estimate = (
-                            weight1 * place1.bias_estimate +
-                            weight2 * place2.bias_estimate
-                        )
-                    
-                    # Place Field 중심도 가중 평균
-                    place1.place_center = (
-                        weight1 * place1.place_center +
-                        weight2 * place2.place_center
-                    )
-                    
-                    # 방문 횟수 합산
-                    place1.visit_count += place2.visit_count
-                    
-                    # place_id2 삭제
-                    del self.place_memory[place_id2]
-                    merged_count += 1
+        for members in clusters.values():
+            self._merge_cluster([candidates[row] for row in members])
+            merged_count += len(members) - 1
         
         return merged_count
     
+    def _merge_cluster(self, members: List[PlaceMemory]) -> None:
+        """
+        클러스터를 첫 번째 멤버(대표)에 병합
+        
+        - Bias/중심: 방문 횟수 가중 평균 (방문 기록이 없으면 균등 가중)
+        - 중심은 대표 중심 기준 wrapping 차이를 평균하여 토러스 경계를 넘어도 정확
+        - 방문 횟수 합산, 시간은 최신값, bias 이력은 업데이트 시간 순으로 이어 붙임
+        
+        Args:
+            members: 클러스터 멤버 (첫 번째가 대표)
+        """
+        representative = members[0]
+        visits = np.array([m.visit_count for m in members], dtype=float)
+        total_visits = visits.sum()
+        if total_visits > 0:
+            weights = visits / total_visits
+        else:
+            weights = np.full(len(members), 1.0 / len(members))
+        
+        biases = np.array([m.bias_estimate for m in members])
+        centers = np.array([m.place_center for m in members])
+        offsets = wrap_phase_difference(
+            centers - representative.place_center, self.phase_wrap
+        )
+        
+        by_update_time = sorted(members, key=lambda m: m.last_update_time)
+        merged_history = deque(
+            (bias for m in by_update_time for bias in m.bias_history),
+            maxlen=representative.bias_history.maxlen
+        )
+        consolidated_bias = representative.consolidated_bias
+        if consolidated_bias is None:
+            consolidated_bias = next(
+                (m.consolidated_bias for m in members if m.consolidated_bias is not None),
+                None
+            )
+        
+        representative.bias_estimate = weights @ biases
+        representative.place_center = representative.place_center + weights @ offsets
+        representative.visit_count = int(total_visits)
+        representative.last_visit_time = max(m.last_visit_time for m in members)
+        representative.last_update_time = max(m.last_update_time for m in members)
+        representative.bias_history = merged_history
+        representative.consolidated_bias = consolidated_bias
+        
+        for member in members[1:]:
+            del self.place_memory[member.place_id]
+    
     def get_statistics(self) -> Dict[str, any]:
         """
         Place Cells 통계 정보 반환
@@ -453,21 +1165,92 @@ class PlaceCellManager:
                 'num_places': 0,
                 'total_visits': 0,
                 'avg_visits_per_place': 0.0,
-                'memory_size_bytes': 0
+                'memory_size_bytes': 0,
+                'num_evictions': self.num_evictions,
+                'place_table': self.place_table.get_statistics()
             }
         
-        total_visits = sum(p.visit_count for p in self.place_memory.values())
-        num_places = len(self.place_memory)
+        num_places = len(self.store)
+        total_visits = int(self.store.visit_count[:num_places].sum())
         
-        # 메모리 사용량 추정 (대략적)
-        # PlaceMemory: 약 240 bytes per place
-        memory_size_bytes = num_places * 240
+        # 메모리 사용량: 저장소 열 배열 실제 크기 (용량 여유분 포함) ✨ NEW
+        memory_size_bytes = self.store.nbytes
         
         return {
             'num_places': num_places,
             'total_visits': total_visits,
             'avg_visits_per_place': total_visits / num_places if num_places > 0 else 0.0,
             'memory_size_bytes': memory_size_bytes,
-            'memory_size_kb': memory_size_bytes / 1024.0
+            'memory_size_kb': memory_size_bytes / 1024.0,
+            'num_evictions': self.num_evictions,
+            'place_table': self.place_table.get_statistics(),
+            'result_cache': (
+                self.result_cache.get_statistics() if self.result_cache is not None else None
+            )
         }
 
+
+class PlaceMemoryMapping(MutableMapping):
+    """
+    place_id → PlaceMemory 매핑 (PlaceStore 뷰)
+
+    기존 Dict[int, PlaceMemory] 사용처(len, in, 반복, items, del, 대입)를 지원합니다.
+    조회 시 저장소 행을 가리키는 PlaceMemory 뷰를 반환하며, 대입하면 값을 저장소에 복사합니다.
+    행 추가/삭제는 add_place/remove_place를 거칩니다 (PlaceCellManager의 용량 관리).
+    """
+
+    def __init__(
+        self,
+        store: PlaceStore,
+        add_place: Optional[Callable[[int, int], int]] = None,
+        remove_place: Optional[Callable[[int], None]] = None
+    ):
+        self._store = store
+        self._add_place = add_place or (lambda place_id, frequency=0: store.add(place_id))
+        self._remove_place = remove_place or store.remove
+
+    def __getitem__(self, place_id: int) -> PlaceMemory:
+        if place_id not in self._store:
+            raise KeyError(place_id)
+        return PlaceMemory._view(self._store, place_id)
+
+    def __setitem__(self, place_id: int, place_memory: PlaceMemory) -> None:
+        if place_memory._store is self._store and place_memory.place_id == place_id:
+            return
+        # 추가 시 교체로 원본 뷰가 무효화될 수 있으므로 값을 먼저 복사
+        fields = {
+            name: getattr(place_memory, name)
+            for name in (
+                'bias_estimate', 'visit_count', 'last_visit_time', 'last_update_time',
+                'place_center', 'consolidated_bias', 'consolidation_time'
+            )
+        }
+        fields = {
+            name: value.copy() if isinstance(value, np.ndarray) else value
+            for name, value in fields.items()
+        }
+        bias_history = list(place_memory.bias_history)
+
+        self._add_place(place_id, fields['visit_count'])
+        view = PlaceMemory._view(self._store, place_id)
+        for name, value in fields.items():
+            setattr(view, name, value)
+        view.bias_history = bias_history
+
+    def __delitem__(self, place_id: int) -> None:
+        if place_id not in self._store:
+            raise KeyError(place_id)
+        self._remove_place(place_id)
+
+    def __contains__(self, place_id) -> bool:
+        return place_id in self._store
+
+    def __iter__(self) -> Iterator[int]:
+        # 반복 중 삭제에 안전하도록 스냅샷 사용
+        return iter(self._store.place_ids[:self._store.size].tolist())
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __repr__(self) -> str:
+        return f"PlaceMemoryMapping({len(self)} places)"
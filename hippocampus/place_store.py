@@ -0,0 +1,486 @@
+"""
+Place Store Module
+Place별 기억을 열 단위(struct-of-arrays)로 저장하는 Place Store
+
+핵심 개념:
+- Place마다 dataclass + ndarray 여러 개 + deque를 두는 대신
+  모든 Place의 bias/중심/방문 정보를 미리 할당된 열 배열에 보관
+- place_id → 행(row) 밀집 인덱스, 삭제는 swap-remove로 밀집 유지
+- bias 이력은 (N, W, D) 링 버퍼
+- PlaceMemory는 저장소 행을 가리키는 가벼운 뷰
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+Version: v0.4.2-alpha (Columnar Place Store)
+License: MIT License
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import math
+import sys
+import numpy as np
+
+from .place_blending import (
+    MIN_ACTIVATION,
+    activation_radius,
+    blend_top_k,
+    gaussian_activations,
+    torus_sq_distances
+)
+from .spatial_index import PeriodicGridIndex
+
+
+class PlaceStore:
+    """
+    열 단위 Place 저장소
+
+    열 배열은 용량이 부족하면 2배로 확장됩니다.
+    공간 인덱스가 주어지면 중심이 설정/이동/삭제될 때 증분 갱신합니다.
+    """
+
+    def __init__(
+        self,
+        bias_dim: int = 5,
+        history_len: int = 10,
+        initial_capacity: int = 64,
+        index: Optional[PeriodicGridIndex] = None,
+        history_dtype=np.float64
+    ):
+        """
+        Place Store 초기화
+
+        Args:
+            bias_dim: bias 차원 (기본값: 5)
+            history_len: bias 이력 링 버퍼 길이 (기본값: 10)
+            initial_capacity: 초기 행 용량
+            index: 중심 공간 인덱스 (None이면 블렌딩 시 전체 스캔)
+            history_dtype: bias 이력 dtype (float32로 두면 이력 메모리 절반)
+        """
+        self.bias_dim = bias_dim
+        self.history_len = history_len
+        self.history_dtype = history_dtype
+        self.index = index
+        self.phase_dim: Optional[int] = None  # 첫 중심 설정 시 결정
+        self.capacity = max(1, initial_capacity)
+        self.size = 0
+
+        cap = self.capacity
+        self.place_ids = np.zeros(cap, dtype=np.int64)
+        self.bias = np.zeros((cap, bias_dim))
+        self.consolidated_bias = np.zeros((cap, bias_dim))
+        self.has_consolidated = np.zeros(cap, dtype=bool)
+        self.center: Optional[np.ndarray] = None
+        self.has_center = np.zeros(cap, dtype=bool)
+        self.visit_count = np.zeros(cap, dtype=np.int64)
+        self.last_visit_time = np.zeros(cap)
+        self.last_update_time = np.zeros(cap)
+        self.consolidation_time = np.zeros(cap)
+        self.history = np.zeros((cap, history_len, bias_dim), dtype=history_dtype)
+        self.history_head = np.zeros(cap, dtype=np.int16)  # 가장 오래된 항목 위치
+        self.history_count = np.zeros(cap, dtype=np.int16)
+
+        # place_id → 행 (밀집 인덱스)
+        self.rows: Dict[int, int] = {}
+        # place_center가 없는 행 수 (블렌딩 시 빠른 판단용)
+        self.num_centerless = 0
+        # 구조 변경 카운터: Place 추가/삭제, 중심 변경 시 증가 (읽기 캐시 무효화용)
+        self.generation = 0
+        # 행 변경 리스너: listener(row) (None이면 전체 변경)
+        # 중심 이동은 이동 전/후 두 번 알림 (결과 캐시의 주변 셀 무효화용)
+        self.change_listeners: List[Callable[[Optional[int]], None]] = []
+        # 마지막 k-최근접 탐색 (질의 키, 결과) - 블렌딩과 캐시 의존성 계산이 공유
+        self._nearest_memo: Optional[tuple] = None
+
+    # 행 단위 열 (swap-remove/확장 시 함께 이동)
+    _ROW_COLUMNS = (
+        'place_ids', 'bias', 'consolidated_bias', 'has_consolidated',
+        'has_center', 'visit_count', 'last_visit_time', 'last_update_time',
+        'consolidation_time', 'history', 'history_head', 'history_count'
+    )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, place_id: int) -> bool:
+        return place_id in self.rows
+
+    def _columns(self) -> List[str]:
+        if self.center is None:
+            return list(self._ROW_COLUMNS)
+        return list(self._ROW_COLUMNS) + ['center']
+
+    def _grow(self) -> None:
+        """열 용량 2배 확장"""
+        new_capacity = self.capacity * 2
+        for name in self._columns():
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def mark_changed(self, row: Optional[int]) -> None:
+        """
+        행 내용 변경 알림 (bias/방문 횟수 등 직접 열을 수정한 경우 호출)
+
+        Args:
+            row: 행 번호 (None이면 전체)
+        """
+        for listener in self.change_listeners:
+            listener(row)
+
+    def row_of(self, place_id: int) -> int:
+        """
+        place_id의 행 번호
+
+        Raises:
+            KeyError: 없는 place_id
+        """
+        return self.rows[place_id]
+
+    def add(self, place_id: int) -> int:
+        """
+        새 Place 행 추가 (모든 열 0으로 초기화, 중심 없음)
+
+        Args:
+            place_id: Place ID
+
+        Returns:
+            행 번호
+        """
+        row = self.rows.get(place_id)
+        if row is not None:
+            return row
+
+        if self.size == self.capacity:
+            self._grow()
+        row = self.size
+        self.size += 1
+        self.rows[place_id] = row
+
+        for name in self._columns():
+            getattr(self, name)[row] = 0
+        self.place_ids[row] = place_id
+        self.num_centerless += 1
+        self.generation += 1
+        self.mark_changed(row)
+        return row
+
+    def add_many(self, place_ids: Iterable[int]) -> np.ndarray:
+        """
+        여러 Place 행 확보 (없는 Place만 추가)
+
+        Args:
+            place_ids: Place ID 목록
+
+        Returns:
+            행 번호 배열 (입력 순서)
+        """
+        return np.array([self.add(place_id) for place_id in place_ids], dtype=np.int64)
+
+    def remove(self, place_id: int) -> None:
+        """
+        Place 삭제 (마지막 행과 교환하여 밀집 유지)
+
+        Args:
+            place_id: Place ID
+        """
+        row = self.rows.pop(place_id, None)
+        if row is None:
+            return
+        self.generation += 1
+        self.mark_changed(row)
+
+        if not self.has_center[row]:
+            self.num_centerless -= 1
+        if self.index is not None:
+            self.index.remove(row)
+
+        last = self.size - 1
+        if row != last:
+            for name in self._columns():
+                column = getattr(self, name)
+                column[row] = column[last]
+            self.rows[int(self.place_ids[row])] = row
+            if self.index is not None:
+                self.index.move(last, row)
+        self.size = last
+
+    def clear(self) -> None:
+        """모든 Place 삭제"""
+        self.rows.clear()
+        self.size = 0
+        self.num_centerless = 0
+        self.generation += 1
+        if self.index is not None:
+            self.index.clear()
+        self.mark_changed(None)
+
+    def set_center(self, row: int, center: Optional[np.ndarray]) -> None:
+        """
+        Place Field 중심 설정 (None이면 중심 제거)
+
+        Args:
+            row: 행 번호
+            center: 중심 위상 벡터
+        """
+        self.generation += 1
+        if self.change_listeners and self.has_center[row]:
+            self.mark_changed(row)  # 이동 전 위치
+        if center is None:
+            if self.has_center[row]:
+                self.has_center[row] = False
+                self.num_centerless += 1
+                if self.index is not None:
+                    self.index.remove(row)
+            return
+
+        center = np.asarray(center, dtype=float)
+        if self.center is None:
+            self.phase_dim = int(center.shape[0])
+            self.center = np.zeros((self.capacity, self.phase_dim))
+        if center.shape != (self.phase_dim,):
+            raise ValueError(
+                f"place_center 차원 불일치: {center.shape} != ({self.phase_dim},)"
+            )
+
+        self.center[row] = center
+        if not self.has_center[row]:
+            self.has_center[row] = True
+            self.num_centerless -= 1
+        if self.index is not None:
+            self.index.update(row, self.center[row])
+        self.mark_changed(row)  # 이동 후 위치
+
+    def set_centers(self, rows: np.ndarray, centers: np.ndarray) -> None:
+        """
+        여러 행의 중심 설정 (행은 중복 없어야 함)
+
+        Args:
+            rows: 행 번호 배열 (G,)
+            centers: 중심 배열 (G, D)
+        """
+        if rows.size == 0:
+            return
+        self.generation += 1
+        if self.change_listeners:
+            for row in rows[self.has_center[rows]].tolist():
+                self.mark_changed(row)  # 이동 전 위치
+        if self.center is None:
+            self.phase_dim = int(centers.shape[1])
+            self.center = np.zeros((self.capacity, self.phase_dim))
+        if centers.shape[1] != self.phase_dim:
+            raise ValueError(
+                f"place_center 차원 불일치: {centers.shape[1]} != {self.phase_dim}"
+            )
+
+        self.center[rows] = centers
+        self.num_centerless -= int(np.count_nonzero(~self.has_center[rows]))
+        self.has_center[rows] = True
+        if self.index is not None:
+            for row in rows.tolist():
+                self.index.update(row, self.center[row])
+        if self.change_listeners:
+            for row in rows.tolist():
+                self.mark_changed(row)  # 이동 후 위치
+
+    def centered_rows(self) -> np.ndarray:
+        """중심이 설정된 행 배열"""
+        if self.num_centerless == 0:
+            return np.arange(self.size)
+        return np.flatnonzero(self.has_center[:self.size])
+
+    def history_append(self, row: int, bias: np.ndarray) -> None:
+        """bias 이력 링 버퍼에 추가 (가득 차면 가장 오래된 항목 덮어쓰기)"""
+        count = int(self.history_count[row])
+        head = int(self.history_head[row])
+        if count < self.history_len:
+            self.history[row, (head + count) % self.history_len] = bias
+            self.history_count[row] = count + 1
+        else:
+            self.history[row, head] = bias
+            self.history_head[row] = (head + 1) % self.history_len
+
+    def history_extend(self, row: int, biases: np.ndarray) -> None:
+        """bias 이력에 여러 항목 추가 (마지막 history_len개만 의미 있음)"""
+        for bias in biases[-self.history_len:]:
+            self.history_append(row, bias)
+
+    def history_clear(self, row: int) -> None:
+        """bias 이력 초기화"""
+        self.history_head[row] = 0
+        self.history_count[row] = 0
+
+    def history_array(self, row: int) -> np.ndarray:
+        """
+        bias 이력 (오래된 순)
+
+        Args:
+            row: 행 번호
+
+        Returns:
+            이력 배열 (n, bias_dim) (복사본)
+        """
+        count = int(self.history_count[row])
+        positions = (int(self.history_head[row]) + np.arange(count)) % self.history_len
+        return self.history[row, positions].astype(float)
+
+    def candidate_rows(
+        self,
+        phase_vector: np.ndarray,
+        radius: float
+    ) -> np.ndarray:
+        """
+        반경 내 후보 행 (공간 인덱스가 없거나 비효율적이면 중심이 있는 전체 행)
+
+        Args:
+            phase_vector: 질의 위상 벡터
+            radius: 질의 반경 (rad)
+
+        Returns:
+            후보 행 배열
+        """
+        rows = None
+        if self.index is not None:
+            rows = self.index.query(phase_vector, radius)
+        if rows is None:
+            rows = self.centered_rows()
+        return rows
+
+    def nearest(
+        self,
+        phase_vector: np.ndarray,
+        top_k: int,
+        radius: float,
+        phase_wrap: float
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, float]]:
+        """
+        반경 내 k-최근접 후보 (공간 인덱스 링 탐색) ✨ NEW
+
+        같은 질의는 구조(generation)가 바뀌기 전까지 마지막 결과를 재사용합니다
+        (결과 캐시 의존성 계산 직후 블렌딩이 같은 탐색을 반복하지 않도록).
+
+        Args:
+            phase_vector: 질의 위상 벡터
+            top_k: 최근접 개수
+            radius: 활성화 반경 (rad)
+            phase_wrap: 위상 wrapping 값
+
+        Returns:
+            (후보 행, 거리 제곱, 의존 반경) - 의존 반경은 상위 K개에 들 수 있는 Place가
+            모두 들어 있는 반경 (k번째 거리, K개 미만이면 radius)
+            (인덱스가 없거나 전체 스캔이 더 저렴하면 None)
+        """
+        if self.index is None or self.center is None or top_k <= 0:
+            return None
+        phase_vector = np.ascontiguousarray(phase_vector, dtype=float)
+        key = (phase_vector.tobytes(), top_k, radius, phase_wrap, self.generation)
+        memo = self._nearest_memo
+        if memo is not None and memo[0] == key:
+            return memo[1]
+
+        center = self.center
+        result = self.index.nearest(
+            phase_vector, top_k, radius,
+            lambda rows: torus_sq_distances(center[rows], phase_vector, phase_wrap)
+        )
+        if result is not None:
+            rows, sq_distances = result
+            bound = radius
+            if rows.size >= top_k:
+                kth = float(np.partition(sq_distances, top_k - 1)[top_k - 1])
+                bound = min(radius, math.sqrt(kth))
+            result = (rows, sq_distances, bound)
+        self._nearest_memo = (key, result)
+        return result
+
+    def blend(
+        self,
+        phase_vector: np.ndarray,
+        top_k: int,
+        sigma: float,
+        phase_wrap: float,
+        min_activation: float = MIN_ACTIVATION
+    ) -> Optional[np.ndarray]:
+        """
+        Soft-switching 블렌딩 (후보 행에 대해 한 번의 NumPy 연산)
+
+        Args:
+            phase_vector: 현재 위상 벡터
+            top_k: 블렌딩에 사용할 상위 K개
+            sigma: 가우시안 표준 편차
+            phase_wrap: 위상 wrapping 값
+            min_activation: 활성화 하한
+
+        Returns:
+            블렌딩된 bias (활성화된 Place가 없으면 None)
+        """
+        if self.center is None:
+            return None
+
+        radius = activation_radius(sigma, min_activation)
+        # 상위 K개만 필요하므로 k-최근접 링 탐색 (넓은 σ에서도 전체 스캔 없음) ✨ NEW
+        nearest = self.nearest(phase_vector, top_k, radius, phase_wrap)
+        if nearest is not None:
+            rows, sq_distances, _ = nearest
+        else:
+            rows = self.candidate_rows(phase_vector, radius)
+            sq_distances = None
+        if rows.size == 0:
+            return None
+
+        if sq_distances is None:
+            sq_distances = torus_sq_distances(self.center[rows], phase_vector, phase_wrap)
+        activations = gaussian_activations(sq_distances, sigma)
+        return blend_top_k(activations, self.bias[rows], top_k, min_activation)
+
+    @property
+    def nbytes(self) -> int:
+        """열 배열 + 인덱스 딕셔너리 메모리 (bytes)"""
+        total = sum(getattr(self, name).nbytes for name in self._columns())
+        return total + sys.getsizeof(self.rows)
+
+
+class PlaceHistoryView:
+    """
+    bias 이력 링 버퍼 뷰
+
+    기존 deque(maxlen=10) 사용처(append, len, 반복, 인덱싱)를 그대로 지원합니다.
+    """
+
+    __slots__ = ('_store', '_place_id')
+
+    def __init__(self, store: PlaceStore, place_id: int):
+        self._store = store
+        self._place_id = place_id
+
+    @property
+    def maxlen(self) -> int:
+        return self._store.history_len
+
+    def _row(self) -> int:
+        return self._store.row_of(self._place_id)
+
+    def append(self, bias: np.ndarray) -> None:
+        self._store.history_append(self._row(), bias)
+
+    def extend(self, biases: Iterable[np.ndarray]) -> None:
+        row = self._row()
+        for bias in biases:
+            self._store.history_append(row, bias)
+
+    def clear(self) -> None:
+        self._store.history_clear(self._row())
+
+    def __len__(self) -> int:
+        return int(self._store.history_count[self._row()])
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(list(self._store.history_array(self._row())))
+
+    def __getitem__(self, index):
+        return self._store.history_array(self._row())[index]
+
+    def __repr__(self) -> str:
+        return f"PlaceHistoryView({list(self)!r}, maxlen={self.maxlen})"
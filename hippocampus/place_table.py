@@ -0,0 +1,392 @@
+"""
+Place Table Module
+양자화된 위상 셀 → 밀집 Place ID 개방 주소법(open addressing) 해시 테이블
+
+핵심 개념:
+- 기존 hash(tuple(phase_int)) mod num_places는 서로 먼 셀이 같은 Place를 공유할 수 있음
+- 셀 키(정수 벡터) 전체를 저장하고 비교하므로 충돌 없이 셀마다 고유 ID
+- ID는 처음 방문한 순서대로 0, 1, 2, ... (메모리는 실제 방문한 셀 수에 비례)
+- 선형 탐사(linear probing), 적재율 초과 시 2배 확장 후 재배치
+- 해시는 uint64 혼합 해시 하나 (배치는 hash_rows, 단일 키는 같은 연산의 hash_key,
+  인터프리터 hash()와 무관)
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+Version: v0.4.2-alpha (Place Table)
+License: MIT License
+"""
+
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+
+# 열 혼합/마무리 상수 (splitmix64)
+_HASH_SEED = 0x243F6A8885A308D3
+_MIX_MULTIPLIER = 0x9E3779B97F4A7C15
+_FINAL_MULTIPLIER_1 = 0xBF58476D1CE4E5B9
+_FINAL_MULTIPLIER_2 = 0x94D049BB133111EB
+_MASK_64 = (1 << 64) - 1
+
+
+def hash_rows(keys: np.ndarray) -> np.ndarray:
+    """
+    셀 키 행별 해시 (uint64 곱셈은 2^64 모듈러로 감김)
+
+    열마다 h = (h ^ key) * C 로 섞은 뒤 splitmix64로 마무리합니다.
+    슬롯 위치만 정하므로 Place ID(처음 방문 순서)에는 영향이 없습니다.
+
+    Args:
+        keys: 셀 키 배열 (M, D) 정수
+
+    Returns:
+        해시 배열 (M,) int64
+    """
+    columns = np.ascontiguousarray(keys, dtype=np.int64).view(np.uint64)
+    hashes = np.full(columns.shape[0], _HASH_SEED, dtype=np.uint64)
+    for column in columns.T:
+        hashes ^= column
+        hashes *= np.uint64(_MIX_MULTIPLIER)
+    hashes ^= hashes >> np.uint64(30)
+    hashes *= np.uint64(_FINAL_MULTIPLIER_1)
+    hashes ^= hashes >> np.uint64(27)
+    hashes *= np.uint64(_FINAL_MULTIPLIER_2)
+    hashes ^= hashes >> np.uint64(31)
+    return hashes.view(np.int64)
+
+
+def hash_key(key: Sequence[int]) -> int:
+    """
+    셀 키 하나의 해시 (hash_rows와 같은 값, 작은 배열의 NumPy 호출 비용 없이 정수 연산)
+
+    Args:
+        key: 셀 키 (D,) 정수 목록
+
+    Returns:
+        hash_rows(key[np.newaxis])[0]과 같은 int64 값
+    """
+    value = _HASH_SEED
+    for column in key:
+        value = ((value ^ (column & _MASK_64)) * _MIX_MULTIPLIER) & _MASK_64
+    value ^= value >> 30
+    value = (value * _FINAL_MULTIPLIER_1) & _MASK_64
+    value ^= value >> 27
+    value = (value * _FINAL_MULTIPLIER_2) & _MASK_64
+    value ^= value >> 31
+    return value - (1 << 64) if value >> 63 else value
+
+
+class PlaceTable:
+    """
+    셀 키 → 밀집 ID 테이블
+
+    - slots: 슬롯별 ID (-1 = 빈 슬롯), 크기는 2의 거듭제곱
+    - keys / hashes: ID별 셀 키와 해시 (ID 순서로 밀집 저장)
+    - 슬롯은 삭제하지 않으므로 tombstone이 필요 없음
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 1024,
+        max_load_factor: float = 0.5
+    ):
+        """
+        Args:
+            initial_capacity: 초기 슬롯 수 힌트 (2의 거듭제곱으로 올림)
+            max_load_factor: 최대 적재율 (초과 시 슬롯 2배 확장)
+        """
+        if not 0.0 < max_load_factor < 1.0:
+            raise ValueError(f"max_load_factor는 (0, 1) 범위여야 합니다: {max_load_factor}")
+        self.max_load_factor = max_load_factor
+        capacity = 8
+        while capacity * max_load_factor < initial_capacity:
+            capacity *= 2
+        self._slots = np.full(capacity, -1, dtype=np.int64)
+        self._mask = capacity - 1
+
+        self.key_dim: Optional[int] = None  # 첫 삽입 시 결정
+        self._keys: Optional[np.ndarray] = None
+        self._hashes = np.zeros(0, dtype=np.int64)
+        self.size = 0
+
+        self.collisions = 0  # 삽입 시 다른 키가 차지한 슬롯을 지나친 횟수 (조회는 세지 않음)
+        self.resizes = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        """슬롯 수"""
+        return self._slots.shape[0]
+
+    @property
+    def load_factor(self) -> float:
+        """현재 적재율"""
+        return self.size / self.capacity
+
+    def key_of(self, place_id: int) -> np.ndarray:
+        """Place ID의 셀 키 (복사본)"""
+        if not 0 <= place_id < self.size:
+            raise KeyError(place_id)
+        return self._keys[place_id].copy()
+
+    def _init_keys(self, key_dim: int) -> None:
+        self.key_dim = key_dim
+        self._keys = np.zeros((max(8, self.capacity // 2), key_dim), dtype=np.int64)
+        self._hashes = np.zeros(self._keys.shape[0], dtype=np.int64)
+
+    def _check_dim(self, keys: np.ndarray) -> None:
+        if self.key_dim is not None and keys.shape[-1] != self.key_dim:
+            raise ValueError(f"셀 키 차원 불일치: {keys.shape[-1]} != {self.key_dim}")
+
+    # ------------------------------------------------------------------
+    # 단일 키 경로
+    # ------------------------------------------------------------------
+
+    def lookup(self, key: np.ndarray) -> int:
+        """
+        셀 키의 ID 조회 (없으면 -1, 할당/수정 없음)
+
+        Args:
+            key: 셀 키 (D,) 정수
+
+        Returns:
+            Place ID 또는 -1
+        """
+        if self.size == 0:
+            return -1
+        key = np.asarray(key, dtype=np.int64)
+        self._check_dim(key)
+        key_list = key.tolist()
+        slot = hash_key(key_list) & self._mask
+        slots = self._slots
+        while True:
+            place_id = int(slots[slot])
+            if place_id < 0:
+                return -1
+            if self._keys[place_id].tolist() == key_list:
+                return place_id
+            slot = (slot + 1) & self._mask
+
+    def get_or_add(self, key: np.ndarray) -> int:
+        """
+        셀 키의 ID 조회 (없으면 새 ID 할당)
+
+        Args:
+            key: 셀 키 (D,) 정수
+
+        Returns:
+            Place ID
+        """
+        key = np.asarray(key, dtype=np.int64)
+        self._check_dim(key)
+        if self.key_dim is None:
+            self._init_keys(key.shape[0])
+        if (self.size + 1) > self.max_load_factor * self.capacity:
+            self._resize(self.capacity * 2)
+
+        key_list = key.tolist()
+        key_hash = hash_key(key_list)
+        slot = key_hash & self._mask
+        slots = self._slots
+        while True:
+            place_id = int(slots[slot])
+            if place_id < 0:
+                break
+            if self._keys[place_id].tolist() == key_list:
+                return place_id
+            self.collisions += 1
+            slot = (slot + 1) & self._mask
+
+        place_id = self._append(key[None, :], np.array([key_hash], dtype=np.int64))
+        slots[slot] = place_id
+        return place_id
+
+    # ------------------------------------------------------------------
+    # 배치 경로 (벡터화 탐사)
+    # ------------------------------------------------------------------
+
+    def lookup_many(self, keys: np.ndarray, hashes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        여러 셀 키의 ID 조회 (없으면 -1, 할당/수정 없음)
+
+        모든 키를 동시에 한 칸씩 탐사합니다.
+
+        Args:
+            keys: 셀 키 배열 (M, D) 정수
+            hashes: 미리 계산한 해시 (None이면 계산)
+
+        Returns:
+            Place ID 배열 (M,) (없으면 -1)
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        result = np.full(keys.shape[0], -1, dtype=np.int64)
+        if self.size == 0 or keys.shape[0] == 0:
+            return result
+        self._check_dim(keys)
+        if hashes is None:
+            hashes = hash_rows(keys)
+
+        pending = np.arange(keys.shape[0])
+        slot = hashes & self._mask
+        while pending.size > 0:
+            place_ids = self._slots[slot]
+            occupied = place_ids >= 0
+            match = np.zeros(pending.shape[0], dtype=bool)
+            match[occupied] = np.all(
+                self._keys[place_ids[occupied]] == keys[pending[occupied]], axis=1
+            )
+            result[pending[match]] = place_ids[match]
+
+            # 다른 키가 차지한 슬롯이면 다음 슬롯으로 (빈 슬롯이면 없음)
+            advance = occupied & ~match
+            pending = pending[advance]
+            slot = (slot[advance] + 1) & self._mask
+        return result
+
+    def get_or_add_many(self, keys: np.ndarray) -> np.ndarray:
+        """
+        여러 셀 키의 ID 조회 (없는 키는 처음 등장 순서대로 새 ID 할당)
+
+        get_or_add를 순서대로 호출한 것과 같은 ID를 반환합니다.
+
+        Args:
+            keys: 셀 키 배열 (M, D) 정수
+
+        Returns:
+            Place ID 배열 (M,)
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        if keys.ndim != 2:
+            raise ValueError(f"keys는 (M, D) 배열이어야 합니다: {keys.shape}")
+        self._check_dim(keys)
+        if keys.shape[0] == 0:
+            return np.zeros(0, dtype=np.int64)
+        if self.key_dim is None:
+            self._init_keys(keys.shape[1])
+
+        hashes = hash_rows(keys)
+        result = self.lookup_many(keys, hashes)
+        missing = np.flatnonzero(result < 0)
+        if missing.size == 0:
+            return result
+
+        # 새 키: 중복 제거 후 처음 등장 순서대로 ID 할당
+        first_index, inverse = self._group_rows(keys[missing], hashes[missing])
+        appearance = np.argsort(first_index, kind='stable')
+        rank = np.empty_like(appearance)
+        rank[appearance] = np.arange(appearance.shape[0])
+        new_rows = missing[first_index[appearance]]
+
+        required = self.size + new_rows.shape[0]
+        capacity = self.capacity
+        while required > self.max_load_factor * capacity:
+            capacity *= 2
+        if capacity != self.capacity:
+            self._resize(capacity)
+
+        first_id = self._append(keys[new_rows], hashes[new_rows])
+        new_ids = np.arange(first_id, first_id + new_rows.shape[0], dtype=np.int64)
+        self._place(new_ids)
+        result[missing] = first_id + rank[inverse]
+        return result
+
+    # ------------------------------------------------------------------
+    # 내부: 저장/배치/확장
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _group_rows(keys: np.ndarray, hashes: np.ndarray):
+        """
+        같은 키끼리 묶기 (해시 우선 정렬 → 같은 키는 인접)
+
+        해시만으로 안정 정렬하고, 해시가 같은데 키가 다른 행(해시 충돌)이 있을 때만
+        키 열까지 포함해 다시 정렬합니다 (np.unique(axis=0)보다 빠름).
+
+        Returns:
+            (그룹별 첫 등장 행 인덱스, 행별 그룹 번호)
+        """
+        order = np.argsort(hashes, kind='stable')
+        sorted_keys = keys[order]
+        boundary = np.ones(order.shape[0], dtype=bool)
+        boundary[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+        sorted_hashes = hashes[order]
+        if np.any(boundary[1:] & (sorted_hashes[1:] == sorted_hashes[:-1])):
+            order = np.lexsort(tuple(keys.T[::-1]) + (hashes,))
+            sorted_keys = keys[order]
+            boundary[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+        group = np.cumsum(boundary) - 1
+        inverse = np.empty_like(group)
+        inverse[order] = group
+        # lexsort는 안정 정렬이므로 그룹의 첫 행이 가장 먼저 등장한 행
+        return order[boundary], inverse
+
+    def _append(self, keys: np.ndarray, hashes: np.ndarray) -> int:
+        """키/해시를 ID 순서 배열에 추가하고 첫 ID 반환"""
+        count = keys.shape[0]
+        if self.size + count > self._keys.shape[0]:
+            new_size = max(self.size + count, self._keys.shape[0] * 2)
+            new_keys = np.zeros((new_size, self.key_dim), dtype=np.int64)
+            new_keys[:self.size] = self._keys[:self.size]
+            new_hashes = np.zeros(new_size, dtype=np.int64)
+            new_hashes[:self.size] = self._hashes[:self.size]
+            self._keys, self._hashes = new_keys, new_hashes
+        first_id = self.size
+        self._keys[first_id:first_id + count] = keys
+        self._hashes[first_id:first_id + count] = hashes
+        self.size += count
+        return first_id
+
+    def _place(self, place_ids: np.ndarray) -> None:
+        """
+        ID들을 슬롯에 배치 (벡터화 선형 탐사)
+
+        빈 슬롯을 여러 ID가 노리면 ID가 가장 작은 것이 차지하고 나머지는 다음 슬롯으로
+        진행합니다. 지나친 슬롯은 모두 차 있으므로 조회 시 탐사 경로가 끊기지 않습니다.
+        """
+        pending = np.sort(place_ids)
+        slot = self._hashes[pending] & self._mask
+        while pending.size > 0:
+            free = self._slots[slot] < 0
+            free_slots, first = np.unique(slot[free], return_index=True)
+            winners = pending[free][first]
+            self._slots[free_slots] = winners
+
+            placed = np.zeros(pending.shape[0], dtype=bool)
+            placed[np.flatnonzero(free)[first]] = True
+            self.collisions += int(np.count_nonzero(~free))
+            pending = pending[~placed]
+            slot = (slot[~placed] + 1) & self._mask
+
+    def _resize(self, capacity: int) -> None:
+        """슬롯 수 확장 후 모든 ID 재배치"""
+        self._slots = np.full(capacity, -1, dtype=np.int64)
+        self._mask = capacity - 1
+        self.resizes += 1
+        if self.size > 0:
+            self._place(np.arange(self.size, dtype=np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        """슬롯 + 키 + 해시 배열 메모리 (bytes)"""
+        total = self._slots.nbytes + self._hashes.nbytes
+        if self._keys is not None:
+            total += self._keys.nbytes
+        return total
+
+    def get_statistics(self) -> Dict[str, float]:
+        """
+        테이블 통계
+
+        Returns:
+            통계 정보 딕셔너리
+        """
+        return {
+            'num_cells': self.size,
+            'capacity': self.capacity,
+            'load_factor': self.load_factor,
+            'collisions': self.collisions,
+            'resizes': self.resizes,
+            'memory_size_bytes': self.nbytes
+        }
@@ -5,18 +5,34 @@ Online phase에서 trajectory/error/state를 기록하는 버퍼
 핵심 개념:
 - Online phase: 기록만 (bias 업데이트 금지)
 - Replay phase: 기록된 데이터를 재생하여 학습
+- 미리 할당된 레코드 링 버퍼: 필드(시간, 위상, 상태, 목표, 오차, 속도, 가속도,
+  Place ID, Context ID)별 열 뷰, 포인트 추가는 한 행 제자리 쓰기 ✨ NEW
+- TrajectoryPoint는 필요할 때만 행 뷰로 생성 ✨ NEW
+- 안정 구간: 안정성 마스크 + 런 길이 부호화 → 인덱스 범위/구간 뷰 ✨ NEW
+- Place / (Place, Context) 보조 인덱스: 링 덮어쓰기와 함께 증분 갱신 ✨ NEW
+- 디스크 스필 (선택): 링이 가득 차면 덮어쓰는 대신 메모리 매핑 세그먼트 파일로 내보내고,
+  Replay는 세그먼트를 청크 단위로 스트리밍, clear() 시 파일 회수 ✨ NEW
+- 블록 단위 추가 (add_block): 열 배열/구조 배열을 슬라이스 대입, 인덱스는 그룹 단위 갱신 ✨ NEW
+- 안정 구간 스트리밍: 최대 chunk_size 행의 레코드 뷰 조각을 지연 생성, 소비자(Replay,
+  통계, 내보내기)는 조각을 당겨 씀 → 버퍼 크기와 무관한 추가 메모리 ✨ NEW
+- 머무름 집계 (선택): 같은 Place/Context의 연속 안정 포인트를 한 요약 행
+  (개수, 오차 합, 오차 제곱합, 첫/마지막 시간)으로 합침 ✨ NEW
 
 Author: GNJz
 Created: 2026-01-20
 Made in GNJz
-Version: v0.4.1-alpha (Replay Buffer extension)
+Version: v0.4.2-alpha (Columnar Replay Buffer)
 License: MIT License
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Hashable, Iterator, Sequence, Tuple, Union
 from dataclasses import dataclass, field
+import os
+import tempfile
 import numpy as np
-from collections import deque
+
+from .context_table import pair_key
+from .learning_gate import norms_exceed
 
 
 @dataclass
@@ -65,18 +81,242 @@ class TrajectoryPoint:
                 acceleration_norm < acceleration_threshold)
 
 
+# 벡터 필드 (TrajectoryPoint 필드 이름 = 레코드 필드 이름)
+_VECTOR_FIELDS = (
+    'phase_vector', 'current_state', 'target_state', 'error', 'velocity', 'acceleration'
+)
+
+# context_id 열에서 None을 나타내는 값
+NO_CONTEXT = -1
+
+# 스트리밍 청크 최대 행 수 (안정성 판정 임시 배열 크기 상한)
+STREAM_CHUNK_SIZE = 4096
+
+# 머무름 집계 판정 임계값 (TrajectoryPoint.is_stable 기본값)
+_AGGREGATE_VELOCITY_THRESHOLD = 0.01
+_AGGREGATE_ACCELERATION_THRESHOLD = 0.001
+
+
+def trajectory_dtype(dims: Sequence[int], aggregated: bool = False, tail: int = 0) -> np.dtype:
+    """
+    궤적 레코드 dtype
+    
+    Args:
+        dims: _VECTOR_FIELDS 순서의 벡터 차원
+        aggregated: True이면 머무름 요약 필드 추가 ✨ NEW
+            (count, error_sum, last_timestamp[, error_tail])
+        tail: 요약 행에 원시 오차로 남길 최근 포인트 수 (0이면 error_tail 필드 없음)
+    
+    Returns:
+        (timestamp, 벡터 필드들, place_id, context_id[, 요약 필드]) 구조 dtype
+    """
+    fields = (
+        [('timestamp', np.float64)] +
+        [(name, np.float64, (dim,)) for name, dim in zip(_VECTOR_FIELDS, dims)] +
+        [('place_id', np.int64), ('context_id', np.int64)]
+    )
+    if aggregated:
+        error_dim = dims[_VECTOR_FIELDS.index('error')]
+        fields += [
+            ('count', np.int64), ('error_sum', np.float64, (error_dim,)), ('last_timestamp', np.float64)
+        ]
+        if tail:
+            fields.append(('error_tail', np.float64, (tail, error_dim)))
+    return np.dtype(fields)
+
+
+def stable_runs(mask: np.ndarray, min_length: int = 1) -> np.ndarray:
+    """
+    bool 마스크의 True 런 구간 (런 길이 부호화) ✨ NEW
+    
+    Args:
+        mask: (N,) bool 배열
+        min_length: 최소 런 길이 (1 미만이면 1)
+    
+    Returns:
+        (K, 2) int64 배열, 각 행 = [start, stop)
+    """
+    edges = np.diff(np.concatenate(([0], np.asarray(mask, dtype=np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    keep = stops - starts >= max(min_length, 1)
+    return np.stack((starts[keep], stops[keep]), axis=1).astype(np.int64)
+
+
+def stable_run_statistics(runs: Iterator[Tuple[int, np.ndarray]]) -> Dict[str, Any]:
+    """
+    안정 구간 스트림 통계 (조각을 당겨 쓰는 소비자) ✨ NEW
+    
+    Args:
+        runs: ReplayBuffer.iter_stable_runs() 스트림
+    
+    Returns:
+        구간 수, 포인트 수, 평균 구간 길이, Place 수, 평균 오차
+        (머무름 요약 행은 요약된 포인트 수와 오차 합으로 집계)
+    """
+    segments = 0
+    points = 0
+    places = set()
+    error_sum = None
+    for run_id, piece in runs:
+        segments = run_id + 1
+        places.update(np.unique(piece['place_id']).tolist())
+        if 'count' in piece.dtype.names:
+            points += int(piece['count'].sum())
+            piece_sum = piece['error_sum'].sum(axis=0)
+        else:
+            points += len(piece)
+            piece_sum = piece['error'].sum(axis=0)
+        error_sum = piece_sum if error_sum is None else error_sum + piece_sum
+    return {
+        "segments": segments,
+        "points": points,
+        "mean_segment_length": points / segments if segments > 0 else 0.0,
+        "num_places": len(places),
+        "mean_error": None if error_sum is None else error_sum / points
+    }
+
+
+def export_stable_runs(runs: Iterator[Tuple[int, np.ndarray]], file) -> np.ndarray:
+    """
+    안정 구간 스트림을 이진 파일로 내보내기 (조각을 당겨 쓰는 소비자) ✨ NEW
+    
+    레코드를 시간 순서로 이어 씁니다. 읽을 때는 np.fromfile(file, dtype=buffer.records.dtype).
+    
+    Args:
+        runs: ReplayBuffer.iter_stable_runs() 스트림
+        file: 파일 경로 또는 쓰기용 이진 파일 객체
+    
+    Returns:
+        (K, 2) int64 배열, 각 행 = 내보낸 레코드 내 구간 [start, stop)
+    """
+    own = isinstance(file, (str, os.PathLike))
+    handle = open(file, 'wb') if own else file
+    bounds: List[List[int]] = []
+    written = 0
+    try:
+        for run_id, piece in runs:
+            if run_id == len(bounds):
+                bounds.append([written, written])
+            handle.write(np.ascontiguousarray(piece).tobytes())
+            written += len(piece)
+            bounds[-1][1] = written
+    finally:
+        if own:
+            handle.close()
+    return np.array(bounds, dtype=np.int64).reshape(-1, 2)
+
+
+class TrajectoryPointSequence(Sequence):
+    """
+    Replay Buffer 포인트 시퀀스 (오래된 포인트부터)
+    
+    기존 deque 사용처(len, 반복, 인덱싱)를 지원하며, 접근할 때만 TrajectoryPoint를
+    만듭니다. 벡터 필드는 버퍼 행의 뷰이므로 버퍼가 덮어쓰면 함께 바뀝니다.
+    """
+    
+    def __init__(self, replay_buffer: 'ReplayBuffer'):
+        self._replay_buffer = replay_buffer
+    
+    def __len__(self) -> int:
+        return len(self._replay_buffer)
+    
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("ReplayBuffer index out of range")
+        return self._replay_buffer.point(index)
+    
+    def __iter__(self) -> Iterator[TrajectoryPoint]:
+        replay_buffer = self._replay_buffer
+        for row in replay_buffer.rows():
+            yield replay_buffer._point_at(row)
+    
+    def __repr__(self) -> str:
+        return f"TrajectoryPointSequence({len(self)} points)"
+
+
+class TrajectorySegment(Sequence):
+    """
+    Replay Buffer의 연속 구간 뷰 [start, stop) (시간 순서 인덱스) ✨ NEW
+    
+    TrajectoryPoint 시퀀스로 반복할 수 있고 (접근 시 생성), column()으로
+    필드 열을 배열로 바로 읽을 수 있습니다 (링 경계를 넘지 않으면 뷰).
+    """
+    
+    def __init__(self, replay_buffer: 'ReplayBuffer', start: int, stop: int):
+        self._replay_buffer = replay_buffer
+        self.start = start
+        self.stop = stop
+    
+    def __len__(self) -> int:
+        return self.stop - self.start
+    
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("TrajectorySegment index out of range")
+        return self._replay_buffer.point(self.start + index)
+    
+    def __iter__(self) -> Iterator[TrajectoryPoint]:
+        replay_buffer = self._replay_buffer
+        for row in replay_buffer.rows(self.start, self.stop):
+            yield replay_buffer._point_at(row)
+    
+    def column(self, name: str) -> np.ndarray:
+        """구간의 필드 열 (시간 순서)"""
+        return self._replay_buffer.column(name, self.start, self.stop)
+    
+    def __repr__(self) -> str:
+        return f"TrajectorySegment({self.start}:{self.stop})"
+
+
 class ReplayBuffer:
     """
     Replay Buffer
     
     Online phase에서 trajectory/error/state를 기록하고,
     Replay phase에서 안정적인 구간만 재생합니다.
+    
+    포인트는 미리 할당된 구조 배열(records) 링 버퍼에 저장됩니다 ✨ NEW.
+    필드 열(timestamps, velocities, place_ids, ...)은 records의 뷰이며, 행 순서는
+    물리적 위치입니다 (시간 순서는 rows() 또는 column()). 용량은 max_size까지 2배씩
+    늘어나고, 가득 차면 가장 오래된 포인트를 덮어씁니다.
+    
+    spill_dir를 지정하면 가득 찬 링을 덮어쓰는 대신 세그먼트 파일(.npy 메모리 매핑)로
+    내보내고 링을 비웁니다 ✨ NEW. RAM은 max_size 행으로 제한되고, iter_chunks()/
+    iter_stable_runs()는 세그먼트와 링을 시간 순서로 스트리밍합니다. 필드 열, 구간 뷰,
+    보조 인덱스는 링(RAM)에 남은 포인트만 다룹니다. 세그먼트 파일은 clear()에서 삭제됩니다.
+    
+    aggregate=True이면 같은 Place/Context에 연속으로 머무는 안정 포인트를 직전 행에
+    합칩니다 ✨ NEW. 요약 행의 timestamp/벡터 필드는 첫 포인트 값이고, count/error_sum/
+    last_timestamp가 머무름 전체를 요약합니다. aggregate_tail > 0이면 머무름의 마지막
+    aggregate_tail개 오차를 error_tail에 시간 순서로 (오른쪽 정렬) 남깁니다.
+    행 단위 API(len, 필드 열, 안정 구간 범위, 보조 인덱스)는 요약 행을 세고,
+    total_points/stable_points와 iter_stable_runs()의 최소 구간 길이는 포인트 수를 셉니다.
+    aggregate_max_std를 주면 새 포인트를 포함한 머무름의 최근 aggregate_std_window개
+    오차 중 한 차원이라도 표준편차가 그 값 이상이면 합치지 않고 새 행을 시작합니다.
+    안정성 판정은 TrajectoryPoint.is_stable 기본 임계값을 사용합니다.
     """
     
     def __init__(
         self,
         max_size: int = 10000,  # 최대 버퍼 크기
-        stable_window: int = 10  # 안정성 판단 윈도우 (최근 N 포인트)
+        stable_window: int = 10,  # 안정성 판단 윈도우 (최근 N 포인트)
+        initial_capacity: int = 256,  # 초기 행 용량 ✨ NEW
+        spill_dir: Optional[str] = None,  # 디스크 스필 디렉터리 (None이면 덮어쓰기) ✨ NEW
+        aggregate: bool = False,  # 연속 안정 머무름 요약 저장 ✨ NEW
+        aggregate_tail: int = 0,  # 요약 행에 원시 오차로 남길 최근 포인트 수
+        aggregate_max_std: Optional[float] = None,  # 최근 오차 표준편차 상한 (None이면 제한 없음)
+        aggregate_std_window: int = 3  # 표준편차를 볼 최근 포인트 수 (새 포인트 포함)
     ):
         """
         Replay Buffer 초기화
@@ -84,16 +324,460 @@ class ReplayBuffer:
         Args:
             max_size: 최대 버퍼 크기
             stable_window: 안정성 판단 윈도우 크기
+            initial_capacity: 초기 행 용량 (max_size까지 2배씩 확장)
+            spill_dir: 가득 찬 링을 내보낼 디렉터리 (None이면 가장 오래된 포인트 덮어쓰기)
+            aggregate: True이면 같은 Place/Context의 연속 안정 포인트를 요약 행으로 합침
+            aggregate_tail: 요약 행마다 원시 오차로 남길 최근 포인트 수 (0이면 남기지 않음)
+            aggregate_max_std: 합칠 때 머무름의 최근 오차 차원별 표준편차 상한 (이상이면 새 행)
+            aggregate_std_window: 표준편차를 볼 최근 포인트 수 (aggregate_tail + 1 이하)
+        
+        Raises:
+            ValueError: max_size가 양수가 아니거나 aggregate_std_window가 남긴 오차로 채울 수 없는 경우
         """
+        if max_size <= 0:
+            raise ValueError(f"max_size는 양수여야 합니다: {max_size}")
+        if aggregate_max_std is not None and not 2 <= aggregate_std_window <= aggregate_tail + 1:
+            raise ValueError(
+                f"aggregate_std_window는 2 이상 aggregate_tail + 1 이하여야 합니다: {aggregate_std_window}"
+            )
         self.max_size = max_size
         self.stable_window = stable_window
+        self.initial_capacity = max(1, min(initial_capacity, max_size))
         
-        # 버퍼 (deque 사용하여 자동 오버플로우 처리)
-        self.buffer: deque = deque(maxlen=max_size)
+        # 레코드 링 버퍼 (첫 포인트의 벡터 차원으로 할당)
+        self.records: Optional[np.ndarray] = None
+        self.capacity = 0
+        self.head = 0  # 다음에 쓸 행
+        self.size = 0
         
         # 통계
         self.total_points: int = 0
-        self.stable_points: int = 0
+        self._stable_points: int = 0
+        self._scored_points: int = 0  # 안정성 집계가 끝난 포인트 수 (나머지는 일괄 집계)
+        
+        # 보조 인덱스 ✨ NEW: 키 → [첫 행, 마지막 행, 포인트 수], 같은 키의 행끼리 시간 순서 연결
+        # (링은 항상 가장 오래된 포인트를 덮어쓰므로 덮어쓸 행은 항상 자기 키의 첫 행)
+        self.place_index: Dict[int, List[int]] = {}  # place_id → 행 목록
+        self.pair_index: Dict[Hashable, List[int]] = {}  # pair_key(place_id, context_id) → 행 목록
+        self._place_next: List[int] = []  # 같은 Place의 다음 행 (-1 = 없음)
+        self._pair_next: List[int] = []  # 같은 (Place, Context)의 다음 행
+        self._row_place: List[int] = []  # 행 → place_id (덮어쓸 때 인덱스에서 제거용)
+        self._row_pair: List[Hashable] = []  # 행 → pair_key
+        
+        # 디스크 스필 세그먼트 (오래된 세그먼트부터) ✨ NEW
+        self.spill_dir = spill_dir
+        self.spill_paths: List[str] = []
+        self.spilled_points: int = 0
+        
+        # 머무름 집계 ✨ NEW
+        self.aggregate = aggregate
+        self._last_stable = False  # 마지막 행 (첫 포인트)이 안정인지 (합칠 수 있는지)
+        self.aggregate_tail = aggregate_tail
+        self.aggregate_max_std = aggregate_max_std
+        self.aggregate_std_window = aggregate_std_window
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    @property
+    def buffer(self) -> TrajectoryPointSequence:
+        """포인트 시퀀스 뷰 (오래된 포인트부터, 접근 시 TrajectoryPoint 생성)"""
+        return TrajectoryPointSequence(self)
+    
+    # 필드 열 (물리적 행 순서, records의 뷰)
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.records['timestamp']
+    
+    @property
+    def phase_vectors(self) -> np.ndarray:
+        return self.records['phase_vector']
+    
+    @property
+    def current_states(self) -> np.ndarray:
+        return self.records['current_state']
+    
+    @property
+    def target_states(self) -> np.ndarray:
+        return self.records['target_state']
+    
+    @property
+    def errors(self) -> np.ndarray:
+        return self.records['error']
+    
+    @property
+    def velocities(self) -> np.ndarray:
+        return self.records['velocity']
+    
+    @property
+    def accelerations(self) -> np.ndarray:
+        return self.records['acceleration']
+    
+    @property
+    def place_ids(self) -> np.ndarray:
+        return self.records['place_id']
+    
+    @property
+    def context_ids(self) -> np.ndarray:
+        """Context ID 열 (NO_CONTEXT = None)"""
+        return self.records['context_id']
+    
+    def _allocate(self, dims: Sequence[int]) -> None:
+        """첫 포인트의 벡터 차원으로 레코드 배열 할당"""
+        self.capacity = self.initial_capacity
+        tail = self.aggregate_tail if self.aggregate else 0
+        self.records = np.zeros(self.capacity, dtype=trajectory_dtype(dims, self.aggregate, tail))
+        self._resize_index(self.capacity)
+    
+    def _resize_index(self, capacity: int) -> None:
+        """인덱스 행 배열을 capacity 길이로 확장"""
+        extra = capacity - len(self._place_next)
+        self._place_next.extend([-1] * extra)
+        self._pair_next.extend([-1] * extra)
+        self._row_place.extend([0] * extra)
+        self._row_pair.extend([0] * extra)
+    
+    def _grow(self, min_capacity: int = 0) -> None:
+        """레코드 용량 2배씩 확장 (min_capacity 이상, max_size까지, 아직 덮어쓰기 전이라 행 순서 유지)"""
+        new_capacity = self.capacity * 2
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+        new_capacity = min(new_capacity, self.max_size)
+        records = np.zeros(new_capacity, dtype=self.records.dtype)
+        records[:self.size] = self.records[:self.size]
+        self.records = records
+        self.capacity = new_capacity
+        self.head = self.size
+        self._resize_index(new_capacity)
+    
+    @property
+    def stable_points(self) -> int:
+        """기록된 전체 포인트 중 안정 포인트 수 (미집계 포인트를 일괄 집계)"""
+        self._score_pending()
+        return self._stable_points
+    
+    def _score_pending(self) -> None:
+        """
+        미집계 포인트 안정성 일괄 집계 (TrajectoryPoint.is_stable 기본 임계값)
+        
+        포인트마다 노름 두 번을 계산하는 대신, 덮어쓰기 전이나 통계 조회 시 한 번에 집계합니다.
+        """
+        pending = self.total_points - self._scored_points
+        if pending == 0:
+            return
+        mask = self.stable_mask(start=self.size - pending)
+        self._stable_points += int(np.count_nonzero(mask))
+        self._scored_points = self.total_points
+    
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        저장된 포인트의 물리적 행 번호 (오래된 포인트부터)
+        
+        Args:
+            start, stop: 시간 순서 인덱스 범위 [start, stop) (기본값: 전체)
+        """
+        stop = self.size if stop is None else stop
+        first = (self.head - self.size + start) % self.capacity if self.capacity else 0
+        if first + (stop - start) <= self.capacity:
+            return np.arange(first, first + (stop - start))
+        return (first + np.arange(stop - start)) % self.capacity
+    
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        필드 열 (오래된 포인트부터)
+        
+        Args:
+            name: 레코드 필드 이름 ('timestamp', 'velocity', 'place_id', ...)
+            start, stop: 시간 순서 인덱스 범위 [start, stop) (기본값: 전체)
+        
+        Returns:
+            (stop - start, ...) 배열 (링 경계를 넘지 않으면 뷰, 넘으면 복사본)
+        """
+        if self.records is None:
+            return np.zeros(0)
+        stop = self.size if stop is None else stop
+        values = self.records[name]
+        first = (self.head - self.size + start) % self.capacity
+        last = first + (stop - start)
+        if last <= self.capacity:
+            return values[first:last]
+        return np.concatenate((values[first:], values[:last - self.capacity]))
+    
+    def stable_mask(
+        self,
+        velocity_threshold: float = 0.01,
+        acceleration_threshold: float = 0.001,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        포인트별 안정성 (TrajectoryPoint.is_stable과 동일한 판정, 벡터화)
+        
+        Args:
+            velocity_threshold: 속도 임계값
+            acceleration_threshold: 가속도 임계값
+            start, stop: 시간 순서 인덱스 범위 [start, stop) (기본값: 전체)
+        
+        Returns:
+            (stop - start,) bool 배열
+        """
+        if self.records is None:
+            return np.zeros(0, dtype=bool)
+        stop = self.size if stop is None else stop
+        whole = start == 0 and stop == self.size
+        if whole:
+            # 전체: 물리적 행 순서로 판정 후 마스크만 회전 (열 복사 없음)
+            velocities = self.velocities[:self.size]
+            accelerations = self.accelerations[:self.size]
+        else:
+            velocities = self.column('velocity', start, stop)
+            accelerations = self.column('acceleration', start, stop)
+        mask = ~norms_exceed(velocities, velocity_threshold, inclusive=True)
+        mask &= ~norms_exceed(accelerations, acceleration_threshold, inclusive=True)
+        first = (self.head - self.size) % self.capacity
+        if whole and first:
+            mask = np.roll(mask, -first)
+        return mask
+    
+    def _point_at(self, row: int) -> TrajectoryPoint:
+        """물리적 행 → TrajectoryPoint (벡터 필드는 행 뷰)"""
+        record = self.records[row]
+        context_id = int(record['context_id'])
+        return TrajectoryPoint(
+            timestamp=float(record['timestamp']),
+            phase_vector=record['phase_vector'],
+            current_state=record['current_state'],
+            target_state=record['target_state'],
+            error=record['error'],
+            velocity=record['velocity'],
+            acceleration=record['acceleration'],
+            place_id=int(record['place_id']),
+            context_id=None if context_id == NO_CONTEXT else context_id
+        )
+    
+    def point(self, index: int) -> TrajectoryPoint:
+        """
+        index번째 포인트 (0 = 가장 오래된 포인트)
+        
+        Args:
+            index: 시간 순서 인덱스
+        
+        Returns:
+            TrajectoryPoint (벡터 필드는 버퍼 행의 뷰)
+        """
+        if not 0 <= index < self.size:
+            raise IndexError("ReplayBuffer index out of range")
+        return self._point_at((self.head - self.size + index) % self.capacity)
+    
+    @staticmethod
+    def _append_row(index: Dict[Hashable, List[int]], links: List[int], key: Hashable, row: int) -> None:
+        """키의 행 목록 끝에 행 연결"""
+        links[row] = -1
+        entry = index.get(key)
+        if entry is None:
+            index[key] = [row, row, 1]
+        else:
+            links[entry[1]] = row
+            entry[1] = row
+            entry[2] += 1
+    
+    @staticmethod
+    def _pop_first_row(index: Dict[Hashable, List[int]], links: List[int], key: Hashable, row: int) -> None:
+        """키의 행 목록에서 첫 행 (= row) 제거"""
+        entry = index[key]
+        if entry[2] == 1:
+            del index[key]
+        else:
+            entry[0] = links[row]
+            entry[2] -= 1
+    
+    def _link(self, row: int, place_id: int, context_id: int) -> None:
+        """새 행을 Place / (Place, Context) 인덱스에 추가"""
+        pair = pair_key(place_id, context_id)
+        self._row_place[row] = place_id
+        self._row_pair[row] = pair
+        self._append_row(self.place_index, self._place_next, place_id, row)
+        self._append_row(self.pair_index, self._pair_next, pair, row)
+    
+    def _unlink_oldest(self, row: int) -> None:
+        """덮어쓸 (가장 오래된) 행을 인덱스에서 제거"""
+        self._pop_first_row(self.place_index, self._place_next, self._row_place[row], row)
+        self._pop_first_row(self.pair_index, self._pair_next, self._row_pair[row], row)
+    
+    @staticmethod
+    def _walk(index: Dict[Hashable, List[int]], links: List[int], key: Hashable) -> np.ndarray:
+        """키의 행 목록 순회 (O(포인트 수))"""
+        entry = index.get(key)
+        if entry is None:
+            return np.zeros(0, dtype=np.int64)
+        rows = np.empty(entry[2], dtype=np.int64)
+        row = entry[0]
+        for i in range(entry[2]):
+            rows[i] = row
+            row = links[row]
+        return rows
+    
+    @staticmethod
+    def _group_block(place_ids: np.ndarray, context_ids: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        블록 행을 키별로 안정 정렬
+        
+        Returns:
+            (order, starts) - 키 순서 블록 위치, 각 그룹의 order 내 시작 위치
+        """
+        if context_ids is None:
+            order = np.argsort(place_ids, kind='stable')
+            place_ids = place_ids[order]
+            boundary = place_ids[1:] != place_ids[:-1]
+        else:
+            order = np.lexsort((context_ids, place_ids))
+            place_ids, context_ids = place_ids[order], context_ids[order]
+            boundary = (place_ids[1:] != place_ids[:-1]) | (context_ids[1:] != context_ids[:-1])
+        return order, np.concatenate(([0], np.flatnonzero(boundary) + 1))
+    
+    @staticmethod
+    def _append_block(
+        index: Dict[Hashable, List[int]],
+        links: List[int],
+        keys: List[Hashable],
+        start: int,
+        order: np.ndarray,
+        starts: np.ndarray
+    ) -> None:
+        """연속 행 [start, start + k)를 키별 행 목록 끝에 연결 (키 그룹 단위)"""
+        k = order.shape[0]
+        stops = np.append(starts[1:], k)
+        next_rows = np.full(k, -1, dtype=np.int64)
+        same = np.ones(k, dtype=bool)
+        same[starts] = False
+        # 같은 키의 다음 블록 행 (그룹 안에서는 시간 순서)
+        next_rows[order[:-1][same[1:]]] = order[1:][same[1:]] + start
+        links[start:start + k] = next_rows.tolist()
+        firsts = (order[starts] + start).tolist()
+        lasts = (order[stops - 1] + start).tolist()
+        for first, last, count in zip(firsts, lasts, (stops - starts).tolist()):
+            key = keys[first - start]
+            entry = index.get(key)
+            if entry is None:
+                index[key] = [first, last, count]
+            else:
+                links[entry[1]] = first
+                entry[1] = last
+                entry[2] += count
+    
+    @staticmethod
+    def _pop_block(
+        index: Dict[Hashable, List[int]],
+        links: List[int],
+        keys: List[Hashable],
+        start: int,
+        order: np.ndarray,
+        starts: np.ndarray
+    ) -> None:
+        """가장 오래된 연속 행 [start, start + k)를 키별 행 목록 앞에서 제거 (키 그룹 단위)"""
+        stops = np.append(starts[1:], order.shape[0])
+        lasts = (order[stops - 1] + start).tolist()
+        for last, count in zip(lasts, (stops - starts).tolist()):
+            key = keys[last - start]
+            entry = index[key]
+            if entry[2] == count:
+                del index[key]
+            else:
+                entry[0] = links[last]
+                entry[2] -= count
+    
+    def _block_keys(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, List[Hashable]]:
+        """연속 행의 (place_id 열, context_id 열, pair_key 목록)"""
+        place_ids = self.records['place_id'][start:stop]
+        context_ids = self.records['context_id'][start:stop]
+        in_range = (place_ids >= 0) & (place_ids < 1 << 32) & (context_ids >= 0) & (context_ids < 1 << 32)
+        pairs = ((place_ids.astype(np.uint64) << np.uint64(32)) | context_ids.astype(np.uint64)).tolist()
+        for i in np.flatnonzero(~in_range).tolist():
+            pairs[i] = pair_key(int(place_ids[i]), int(context_ids[i]))
+        return place_ids, context_ids, pairs
+    
+    def _link_block(self, start: int, stop: int) -> None:
+        """새로 쓴 연속 행을 Place / (Place, Context) 인덱스에 추가"""
+        place_ids, context_ids, pairs = self._block_keys(start, stop)
+        places = place_ids.tolist()
+        self._row_place[start:stop] = places
+        self._row_pair[start:stop] = pairs
+        order, starts = self._group_block(place_ids)
+        self._append_block(self.place_index, self._place_next, places, start, order, starts)
+        order, starts = self._group_block(place_ids, context_ids)
+        self._append_block(self.pair_index, self._pair_next, pairs, start, order, starts)
+    
+    def _unlink_block(self, start: int, stop: int) -> None:
+        """덮어쓸 (가장 오래된) 연속 행을 인덱스에서 제거"""
+        place_ids = self.records['place_id'][start:stop]
+        context_ids = self.records['context_id'][start:stop]
+        order, starts = self._group_block(place_ids)
+        self._pop_block(self.place_index, self._place_next, self._row_place[start:stop], start, order, starts)
+        order, starts = self._group_block(place_ids, context_ids)
+        self._pop_block(self.pair_index, self._pair_next, self._row_pair[start:stop], start, order, starts)
+    
+    def place_rows(self, place_id: int, context_id: Optional[int] = None) -> np.ndarray:
+        """
+        Place (및 Context)의 물리적 행 번호 (오래된 포인트부터) ✨ NEW
+        
+        보조 인덱스를 따라가므로 버퍼 크기와 무관하게 해당 포인트 수에 비례합니다.
+        필드 열과 함께 사용합니다: buffer.errors[buffer.place_rows(p)]
+        
+        Args:
+            place_id: Place ID
+            context_id: Context ID (None이면 Context 무시)
+        
+        Returns:
+            (k,) int64 행 번호 배열
+        """
+        if context_id is None:
+            return self._walk(self.place_index, self._place_next, place_id)
+        return self._walk(self.pair_index, self._pair_next, pair_key(place_id, context_id))
+    
+    def place_count(self, place_id: int, context_id: Optional[int] = None) -> int:
+        """Place (및 Context)의 포인트 수 (O(1))"""
+        if context_id is None:
+            entry = self.place_index.get(place_id)
+        else:
+            entry = self.pair_index.get(pair_key(place_id, context_id))
+        return 0 if entry is None else entry[2]
+    
+    def iter_groups(self, by_context: bool = False) -> Iterator[Tuple[Any, np.ndarray]]:
+        """
+        모든 Place (또는 (Place, Context)) 그룹을 한 번에 순회 ✨ NEW
+        
+        시간 순서 행을 키로 안정 정렬하여 한 번에 나눕니다 (O(N log N), 키별 조회 반복 없음).
+        
+        Args:
+            by_context: True이면 (place_id, context_id) 단위 (context_id None = Context 없음)
+        
+        Yields:
+            (place_id 또는 (place_id, context_id), 물리적 행 번호 배열 (오래된 포인트부터))
+        """
+        if self.size == 0:
+            return
+        rows = self.rows()
+        place_ids = self.place_ids[rows]
+        if by_context:
+            context_ids = self.context_ids[rows]
+            order = np.lexsort((context_ids, place_ids))
+            place_ids, context_ids = place_ids[order], context_ids[order]
+            boundary = (place_ids[1:] != place_ids[:-1]) | (context_ids[1:] != context_ids[:-1])
+        else:
+            order = np.argsort(place_ids, kind='stable')
+            place_ids = place_ids[order]
+            boundary = place_ids[1:] != place_ids[:-1]
+        starts = np.concatenate(([0], np.flatnonzero(boundary) + 1))
+        stops = np.append(starts[1:], rows.shape[0])
+        grouped = rows[order]
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            place_id = int(place_ids[start])
+            if by_context:
+                context_id = int(context_ids[start])
+                key = (place_id, None if context_id == NO_CONTEXT else context_id)
+            else:
+                key = place_id
+            yield key, grouped[start:stop]
     
     def add_point(
         self,
@@ -110,6 +794,8 @@ class ReplayBuffer:
         """
         궤적 포인트 추가 (Online phase)
         
+        레코드 한 행에 제자리로 씁니다 (포인트 객체/배열 복사본 생성 없음).
+        
         Args:
             timestamp: 시간 (ms)
             phase_vector: 위상 벡터
@@ -121,31 +807,441 @@ class ReplayBuffer:
             place_id: Place ID
             context_id: Context ID (None이면 Context 없음)
         """
-        point = TrajectoryPoint(
-            timestamp=timestamp,
-            phase_vector=phase_vector.copy(),
-            current_state=current_state.copy(),
-            target_state=target_state.copy(),
-            error=error.copy(),
-            velocity=velocity.copy(),
-            acceleration=acceleration.copy(),
-            place_id=place_id,
-            context_id=context_id
-        )
+        if context_id is None:
+            context_id = NO_CONTEXT
+        if self.aggregate:
+            stable = (np.linalg.norm(velocity) < _AGGREGATE_VELOCITY_THRESHOLD and
+                      np.linalg.norm(acceleration) < _AGGREGATE_ACCELERATION_THRESHOLD)
+            if stable and self._merge_point(timestamp, error, place_id, context_id):
+                return
         
-        self.buffer.append(point)
+        if self.size == self.capacity:
+            if self.records is None:
+                self._allocate([
+                    np.shape(phase_vector)[0], np.shape(current_state)[0], np.shape(target_state)[0],
+                    np.shape(error)[0], np.shape(velocity)[0], np.shape(acceleration)[0]
+                ])
+            elif self.capacity < self.max_size:
+                self._grow()
+            elif self.spill_dir is not None:
+                self._spill()
+            else:
+                if self.total_points - self._scored_points >= self.size:
+                    # 가장 오래된 포인트를 덮어쓰기 전에 안정성 집계
+                    self._score_pending()
+                self._unlink_oldest(self.head)
+        
+        row = self.head
+        if self.aggregate:
+            summary = (1, error, timestamp) + ((0.0,) if self.aggregate_tail else ())
+            self.records[row] = (
+                timestamp, phase_vector, current_state, target_state, error,
+                velocity, acceleration, place_id, context_id
+            ) + summary
+            if self.aggregate_tail:
+                self.records['error_tail'][row, -1] = error
+        else:
+            self.records[row] = (
+                timestamp, phase_vector, current_state, target_state, error,
+                velocity, acceleration, place_id, context_id
+            )
+        self._link(row, int(place_id), int(context_id))
+        self.head = (row + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
         self.total_points += 1
+        if self.aggregate:
+            self._last_stable = stable
+    
+    def _merge_point(self, timestamp: float, error: np.ndarray, place_id: int, context_id: int) -> bool:
+        """
+        안정 포인트를 마지막 요약 행에 합치기 (같은 Place/Context의 안정 머무름일 때)
+        
+        Returns:
+            합쳤는지 여부 (False이면 새 행 필요)
+        """
+        if not self._last_stable or self.size == 0:
+            return False
+        record = self.records[(self.head - 1) % self.capacity]
+        if record['place_id'] != place_id or record['context_id'] != context_id:
+            return False
+        if self.aggregate_max_std is not None:
+            k = min(int(record['count']), self.aggregate_std_window - 1)
+            window = np.concatenate((record['error_tail'][self.aggregate_tail - k:], [error]))
+            if self._windows_too_noisy(window[np.newaxis], np.ones((1, k + 1), dtype=bool))[0]:
+                return False
+        record['count'] += 1
+        record['error_sum'] += error
+        record['last_timestamp'] = timestamp
+        if self.aggregate_tail:
+            tail = record['error_tail']
+            tail[:-1] = tail[1:].copy()
+            tail[-1] = error
+        self._count_merged(1)
+        return True
+    
+    def _windows_too_noisy(self, windows: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """
+        최근 오차 창마다 한 차원이라도 표준편차 (ddof=0)가 aggregate_max_std 이상인지
+        
+        Args:
+            windows: (N, K, D) 오차 창 (시간 순서)
+            valid: (N, K) 창 안에서 머무름에 속하는 칸 (앞쪽 칸만 빠질 수 있음)
+        
+        Returns:
+            (N,) bool
+        """
+        valid = valid[..., np.newaxis]
+        count = valid.sum(axis=1)
+        mean = np.where(valid, windows, 0.0).sum(axis=1) / count
+        deviation = np.where(valid, windows - mean[:, np.newaxis], 0.0)
+        variance = np.square(deviation).sum(axis=1) / count
+        return np.any(variance >= self.aggregate_max_std ** 2, axis=-1)
+    
+    def _split_noisy_dwells(self, merge: np.ndarray, errors: np.ndarray, last: Any) -> np.ndarray:
+        """
+        합칠 후보 중 최근 오차 표준편차가 상한 이상인 포인트에서 새 행 시작
+        
+        나누지 않았다고 보고 모든 후보의 최근 창을 한 번에 판정합니다. 상한을 넘는
+        후보가 있는 머무름만 add_point와 같은 순서로 다시 훑어 나눕니다
+        (나누면 새 행의 창이 거기서 다시 시작하므로).
+        
+        Args:
+            merge: (N,) 직전 포인트 (또는 마지막 행)에 합칠 후보 - 제자리 수정
+            errors: (N, D) 오차
+            last: 마지막 요약 행 (merge[0]이면 첫 머무름이 이어짐)
+        
+        Returns:
+            나눈 뒤의 합칠 마스크
+        """
+        n = merge.shape[0]
+        width = self.aggregate_std_window
+        prior = errors[:0]
+        if merge[0]:
+            k = min(int(last['count']), width - 1)
+            prior = last['error_tail'][self.aggregate_tail - k:]
+        
+        # 마지막 행의 최근 오차를 앞에 붙인 열에서 포인트마다 끝나는 창
+        extended = np.concatenate((np.zeros((width - 1, errors.shape[1])), prior, errors))
+        offset = width - 1 + prior.shape[0]
+        windows = np.lib.stride_tricks.sliding_window_view(extended, width, axis=0)
+        windows = windows[offset - width + 1:].transpose(0, 2, 1)
+        
+        # 창 칸이 머무름 시작 (마지막 행에 이어지면 앞에 붙인 오차의 시작) 이후인지
+        run = np.cumsum(~merge)  # 후보 머무름 번호 (0 = 마지막 행에 이어지는 머무름)
+        first = np.concatenate(([0], np.flatnonzero(~merge)))
+        start = first[run] + offset
+        start[run == 0] = offset - prior.shape[0]
+        position = np.arange(n)[:, np.newaxis] + offset - width + 1 + np.arange(width)
+        noisy = merge & self._windows_too_noisy(windows, position >= start[:, np.newaxis])
+        
+        for index in np.unique(run[noisy]):
+            begin = first[index]
+            stop = first[index + 1] if index + 1 < first.shape[0] else n
+            window = list(prior) if index == 0 else []
+            for i in range(begin, stop):
+                candidate = window[-(width - 1):] + [errors[i]]
+                if merge[i] and self._windows_too_noisy(
+                    np.array(candidate)[np.newaxis], np.ones((1, len(candidate)), dtype=bool)
+                )[0]:
+                    merge[i] = False
+                    candidate = [errors[i]]
+                window = candidate
+        return merge
+    
+    def _count_merged(self, count: int) -> None:
+        """요약 행에 합친 (안정) 포인트 집계 - 새 행이 없으므로 미집계 행 수는 그대로"""
+        self.total_points += count
+        self._scored_points += count
+        self._stable_points += count
+    
+    def _aggregate_block(self, columns: Dict[str, Any], n: int) -> Tuple[np.ndarray, bool]:
+        """
+        블록의 연속 안정 머무름을 요약 행으로 합치기 (벡터화)
+        
+        첫 머무름이 마지막 행의 머무름에 이어지면 그 행에 바로 합칩니다.
+        
+        Returns:
+            (새로 쓸 요약 행 구조 배열, 마지막 요약 행이 안정인지)
+        """
+        place_ids = np.broadcast_to(np.asarray(columns['place_id'], dtype=np.int64), (n,))
+        context_ids = np.broadcast_to(np.asarray(columns['context_id'], dtype=np.int64), (n,))
+        errors = np.asarray(columns['error'], dtype=np.float64)
+        stable = ~norms_exceed(columns['velocity'], _AGGREGATE_VELOCITY_THRESHOLD, inclusive=True)
+        stable &= ~norms_exceed(columns['acceleration'], _AGGREGATE_ACCELERATION_THRESHOLD, inclusive=True)
+        
+        # 직전 포인트 (또는 마지막 행)의 머무름에 이어지는지
+        merge = np.empty(n, dtype=bool)
+        merge[1:] = (stable[1:] & stable[:-1] &
+                     (place_ids[1:] == place_ids[:-1]) & (context_ids[1:] == context_ids[:-1]))
+        last = self.records[(self.head - 1) % self.capacity] if self.size else None
+        merge[0] = bool(
+            stable[0] and self._last_stable and last is not None and
+            last['place_id'] == place_ids[0] and last['context_id'] == context_ids[0]
+        )
+        if self.aggregate_max_std is not None and merge.any():
+            merge = self._split_noisy_dwells(merge, errors, last)
+        starts = np.flatnonzero(~merge)
+        lead = int(starts[0]) if starts.shape[0] else n
+        tail = self.aggregate_tail
+        if lead:
+            last['count'] += lead
+            last['error_sum'] += errors[:lead].sum(axis=0)
+            last['last_timestamp'] = columns['timestamp'][lead - 1]
+            if tail:
+                last['error_tail'] = np.concatenate((last['error_tail'], errors[max(lead - tail, 0):lead]))[-tail:]
+        self._count_merged(n - starts.shape[0])
+        if starts.shape[0] == 0:
+            return np.zeros(0, dtype=self.records.dtype), self._last_stable
+        
+        rows = np.zeros(starts.shape[0], dtype=self.records.dtype)
+        for name, value in columns.items():
+            rows[name] = value[starts] if np.ndim(value) else value
+        stops = np.append(starts[1:], n)
+        rows['count'] = stops - starts
+        rows['error_sum'] = np.add.reduceat(errors, starts, axis=0)
+        rows['last_timestamp'] = np.asarray(columns['timestamp'])[stops - 1]
+        for slot in range(tail):
+            # 오른쪽 정렬: slot은 머무름 끝에서 tail - slot번째 포인트
+            source = stops - tail + slot
+            present = source >= starts
+            rows['error_tail'][present, slot] = errors[source[present]]
+        return rows, bool(stable[starts[-1]])
+    
+    def add_block(
+        self,
+        block: Optional[np.ndarray] = None,
+        *,
+        timestamp: Optional[np.ndarray] = None,
+        phase_vector: Optional[np.ndarray] = None,
+        current_state: Optional[np.ndarray] = None,
+        target_state: Optional[np.ndarray] = None,
+        error: Optional[np.ndarray] = None,
+        velocity: Optional[np.ndarray] = None,
+        acceleration: Optional[np.ndarray] = None,
+        place_id: Union[int, np.ndarray, None] = None,
+        context_id: Union[int, np.ndarray, None] = None
+    ) -> None:
+        """
+        궤적 포인트 블록 추가 (Online phase, add_point N번과 동일) ✨ NEW
+        
+        구조 배열(block) 또는 필드별 열 배열을 받아 레코드 링에 슬라이스 대입으로
+        한 번만 복사합니다 (행 분할/포인트별 호출 없음). 블록이 링 경계나 max_size를
+        넘으면 경계마다 나누어 쓰고, 덮어쓰기/스필은 add_point와 같습니다.
+        보조 인덱스는 키 그룹 단위로 갱신하고 안정성은 기존처럼 일괄 집계합니다.
+        
+        Args:
+            block: (N,) 구조 배열 (trajectory_dtype 필드 이름, context_id 필드는 생략 가능)
+            timestamp: (N,) 시간 (ms) - block 대신 열 배열로 줄 때
+            phase_vector, current_state, target_state, error, velocity, acceleration: (N, D) 열 배열
+            place_id: (N,) Place ID 열 또는 블록 공통 정수
+            context_id: (N,) Context ID 열 (NO_CONTEXT = 없음) 또는 공통 정수 (None이면 Context 없음)
+        
+        Raises:
+            ValueError: 필드 누락 또는 block과 열 배열을 함께 준 경우
+        """
+        columns = {
+            'timestamp': timestamp, 'phase_vector': phase_vector, 'current_state': current_state,
+            'target_state': target_state, 'error': error, 'velocity': velocity,
+            'acceleration': acceleration, 'place_id': place_id, 'context_id': context_id
+        }
+        if block is not None:
+            if any(value is not None for value in columns.values()):
+                raise ValueError("block과 열 배열은 함께 줄 수 없습니다")
+            names = block.dtype.names or ()
+            columns = {name: block[name] if name in names else None for name in columns}
+        missing = [name for name, value in columns.items() if value is None and name != 'context_id']
+        if missing:
+            raise ValueError(f"필드가 없습니다: {missing}")
+        if columns['context_id'] is None:
+            columns['context_id'] = NO_CONTEXT
+        n = np.shape(columns['timestamp'])[0]
+        if n == 0:
+            return
+        
+        if self.records is None:
+            self._allocate([np.shape(columns[name])[1] for name in _VECTOR_FIELDS])
+        if self.aggregate:
+            # 머무름을 요약 행으로 합친 뒤 요약 행만 씀
+            block, last_stable = self._aggregate_block(columns, n)
+            n = block.shape[0]
+        # 같은 dtype의 구조 배열이면 행 단위 한 번에 복사
+        whole_rows = block is not None and block.dtype == self.records.dtype
+        
+        offset = 0
+        while offset < n:
+            remaining = n - offset
+            if self.size + remaining > self.capacity and self.capacity < self.max_size:
+                self._grow(self.size + remaining)
+            elif self.size == self.capacity and self.spill_dir is not None:
+                self._spill()
+            
+            row = self.head
+            if self.size < self.capacity:
+                k = min(remaining, self.capacity - self.size)
+            else:
+                k = min(remaining, self.capacity - row)
+                if self.total_points - self._scored_points > self.size - k:
+                    # 덮어쓸 포인트가 미집계이면 먼저 안정성 집계
+                    self._score_pending()
+                self._unlink_block(row, row + k)
+            
+            target = self.records[row:row + k]
+            if whole_rows:
+                target[...] = block[offset:offset + k]
+            else:
+                for name, value in columns.items():
+                    target[name] = value[offset:offset + k] if np.ndim(value) else value
+            self._link_block(row, row + k)
+            self.head = (row + k) % self.capacity
+            self.size = min(self.size + k, self.capacity)
+            self.total_points += k
+            offset += k
+        if self.aggregate:
+            self._last_stable = last_stable
+    
+    def _spill(self) -> None:
+        """
+        링 전체를 세그먼트 파일로 내보내고 링 비우기 ✨ NEW
+        
+        안정성을 먼저 집계한 뒤 시간 순서로 한 번에 씁니다 (포인트당 O(1) 분할 상환).
+        """
+        self._score_pending()
+        os.makedirs(self.spill_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix='replay_segment_', suffix='.npy', dir=self.spill_dir)
+        os.close(fd)
+        segment = np.lib.format.open_memmap(
+            path, mode='w+', dtype=self.records.dtype, shape=(self.size,)
+        )
+        first = (self.head - self.size) % self.capacity
+        split = self.capacity - first
+        segment[:split] = self.records[first:]
+        segment[split:] = self.records[:first]
+        segment.flush()
+        del segment
+        
+        self.spill_paths.append(path)
+        self.spilled_points += self.size
+        self.head = 0
+        self.size = 0
+        self.place_index.clear()
+        self.pair_index.clear()
+        self._last_stable = False
+    
+    def iter_chunks(self, chunk_size: Optional[int] = STREAM_CHUNK_SIZE) -> Iterator[np.ndarray]:
+        """
+        기록된 모든 포인트를 레코드 청크로 순회 (오래된 포인트부터) ✨ NEW
+        
+        스필 세그먼트(읽기 전용 메모리 매핑) 다음 링의 포인트를 내보냅니다.
+        링이 경계를 넘으면 두 청크로 나누므로 모든 청크는 복사 없는 뷰입니다.
+        
+        Args:
+            chunk_size: 청크 최대 행 수 (None이면 세그먼트/링 구간 단위)
+        
+        Yields:
+            구조 배열 청크 (trajectory_dtype)
+        """
+        for region in self._iter_regions():
+            if chunk_size is None or len(region) <= chunk_size:
+                yield region
+            else:
+                for start in range(0, len(region), chunk_size):
+                    yield region[start:start + chunk_size]
+    
+    def _iter_regions(self) -> Iterator[np.ndarray]:
+        """스필 세그먼트와 링의 연속 구간 (오래된 포인트부터)"""
+        for path in self.spill_paths:
+            yield np.load(path, mmap_mode='r')
+        if self.size == 0:
+            return
+        first = (self.head - self.size) % self.capacity
+        if first + self.size <= self.capacity:
+            yield self.records[first:first + self.size]
+        else:
+            yield self.records[first:]
+            yield self.records[:self.head]
+    
+    def iter_stable_runs(
+        self,
+        velocity_threshold: float = 0.01,
+        acceleration_threshold: float = 0.001,
+        min_segment_length: int = 5,
+        chunk_size: Optional[int] = STREAM_CHUNK_SIZE
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        스필 세그먼트를 포함한 안정 구간 스트리밍 ✨ NEW
+        
+        청크마다 안정성 마스크를 RLE하고, 청크 경계에 걸친 구간은 이어 붙입니다.
+        구간 조각은 청크의 뷰이며, 길이가 min_segment_length에 이르기 전까지만
+        조각을 보류하므로 추가 메모리는 청크 하나 + 최소 구간 길이입니다.
+        조각은 요청할 때만 만들어지므로 소비자가 멈추면 판정도 멈춥니다.
         
-        # 안정적인 포인트인지 확인
-        if point.is_stable():
-            self.stable_points += 1
+        Args:
+            velocity_threshold: 속도 임계값
+            acceleration_threshold: 가속도 임계값
+            min_segment_length: 최소 구간 길이
+            chunk_size: 청크 최대 행 수 (조각 길이 상한, None이면 세그먼트/링 구간 단위)
+        
+        Yields:
+            (구간 번호, 레코드 조각) - 한 구간이 여러 조각으로 나뉘면 같은 구간 번호
+        """
+        min_length = max(min_segment_length, 1)
+        run_id = -1
+        pending: List[np.ndarray] = []  # 아직 최소 길이에 못 미친 현재 구간 조각
+        pending_length = 0
+        emitted = False  # 현재 구간이 이미 최소 길이를 넘겨 내보내는 중인지
+        open_run = False  # 현재 구간이 직전 청크 끝까지 이어졌는지
+        for chunk in self.iter_chunks(chunk_size):
+            mask = ~norms_exceed(chunk['velocity'], velocity_threshold, inclusive=True)
+            mask &= ~norms_exceed(chunk['acceleration'], acceleration_threshold, inclusive=True)
+            counts = chunk['count'] if self.aggregate else None
+            stop = 0
+            for start, stop in stable_runs(mask).tolist():
+                if not (open_run and start == 0):
+                    pending, pending_length, emitted = [], 0, False
+                piece = chunk[start:stop]
+                if emitted:
+                    yield run_id, piece
+                else:
+                    pending.append(piece)
+                    pending_length += stop - start if counts is None else int(counts[start:stop].sum())
+                    if pending_length >= min_length:
+                        run_id += 1
+                        emitted = True
+                        for piece in pending:
+                            yield run_id, piece
+                        pending = []
+            open_run = stop == len(chunk)
+    
+    def stable_segment_ranges(
+        self,
+        velocity_threshold: float = 0.01,
+        acceleration_threshold: float = 0.001,
+        min_segment_length: int = 5
+    ) -> np.ndarray:
+        """
+        안정 구간 인덱스 범위 (벡터화) ✨ NEW
+        
+        안정성 마스크를 런 길이 부호화(RLE)하여 연속된 안정 포인트 구간 중
+        길이가 min_segment_length 이상인 구간만 남깁니다.
+        
+        Args:
+            velocity_threshold: 속도 임계값
+            acceleration_threshold: 가속도 임계값
+            min_segment_length: 최소 구간 길이
+        
+        Returns:
+            (K, 2) int64 배열, 각 행 = [start, stop) (시간 순서 인덱스)
+        """
+        mask = self.stable_mask(velocity_threshold, acceleration_threshold)
+        return stable_runs(mask, min_segment_length)
     
     def get_stable_segments(
         self,
         velocity_threshold: float = 0.01,
         acceleration_threshold: float = 0.001,
         min_segment_length: int = 5
-    ) -> List[List[TrajectoryPoint]]:
+    ) -> List[TrajectorySegment]:
         """
         안정적인 구간만 추출 (Replay phase용)
         
@@ -159,28 +1255,13 @@ class ReplayBuffer:
             min_segment_length: 최소 구간 길이
         
         Returns:
-            안정적인 구간 리스트 (각 구간은 TrajectoryPoint 리스트)
-        """
-        if len(self.buffer) < min_segment_length:
-            return []
-        
-        stable_segments = []
-        current_segment = []
+            안정적인 구간 리스트 (각 구간은 TrajectorySegment 뷰, TrajectoryPoint 시퀀스로 반복 가능)
         
-        for point in self.buffer:
-            if point.is_stable(velocity_threshold, acceleration_threshold):
-                current_segment.append(point)
-            else:
-                # 안정적인 구간이 끝남
-                if len(current_segment) >= min_segment_length:
-                    stable_segments.append(current_segment)
-                current_segment = []
-        
-        # 마지막 구간 처리
-        if len(current_segment) >= min_segment_length:
-            stable_segments.append(current_segment)
-        
-        return stable_segments
+        링(RAM)의 포인트만 다룹니다. 스필 세그먼트까지 버퍼 크기와 무관한 메모리로
+        순회하려면 iter_stable_runs()를 사용합니다.
+        """
+        ranges = self.stable_segment_ranges(velocity_threshold, acceleration_threshold, min_segment_length)
+        return [TrajectorySegment(self, start, stop) for start, stop in ranges.tolist()]
     
     def get_place_bias_data(
         self,
@@ -197,27 +1278,47 @@ class ReplayBuffer:
         Returns:
             해당 Place의 TrajectoryPoint 리스트
         """
-        if context_id is None:
-            # Context 무시
-            return [p for p in self.buffer if p.place_id == place_id]
-        else:
-            # Place + Context 조합
-            return [p for p in self.buffer 
-                   if p.place_id == place_id and p.context_id == context_id]
+        # 보조 인덱스로 해당 포인트만 (context_id None이면 Context 무시, 아니면 Place + Context 조합)
+        rows = self.place_rows(place_id, context_id)
+        return [self._point_at(row) for row in rows.tolist()]
+    
+    def release_spill(self) -> None:
+        """스필 세그먼트 파일 삭제 (디스크 회수) ✨ NEW"""
+        for path in self.spill_paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.spill_paths.clear()
+        self.spilled_points = 0
     
     def clear(self):
-        """버퍼 초기화"""
-        self.buffer.clear()
+        """버퍼 초기화 (레코드 배열은 재사용, 스필 세그먼트 파일 삭제)"""
+        self.release_spill()
+        self.head = 0
+        self.size = 0
         self.total_points = 0
-        self.stable_points = 0
+        self._stable_points = 0
+        self._scored_points = 0
+        self.place_index.clear()
+        self.pair_index.clear()
+        self._last_stable = False
     
     def get_statistics(self) -> Dict[str, Any]:
         """Replay Buffer 통계 정보"""
+        stable_points = self.stable_points
         return {
             "buffer_size": len(self.buffer),
             "total_points": self.total_points,
-            "stable_points": self.stable_points,
-            "stable_ratio": self.stable_points / self.total_points if self.total_points > 0 else 0.0,
-            "max_size": self.max_size
+            "stable_points": stable_points,
+            "stable_ratio": stable_points / self.total_points if self.total_points > 0 else 0.0,
+            "max_size": self.max_size,
+            "num_places": len(self.place_index),
+            "num_place_contexts": len(self.pair_index),
+            "memory_size_bytes": 0 if self.records is None else self.records.nbytes,
+            "spilled_points": self.spilled_points,
+            "spill_segments": len(self.spill_paths),
+            "aggregate": self.aggregate,
+            "aggregate_tail": self.aggregate_tail,
+            "aggregate_max_std": self.aggregate_max_std
         }
-
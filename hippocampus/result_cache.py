@@ -0,0 +1,252 @@
+"""
+Result Cache Module
+버전 카운터로 검증하는 블렌딩 결과 캐시
+
+핵심 개념:
+- 같은 setpoint를 업데이트 사이에 반복 질의하면 가우시안 블렌딩을 다시 계산하지 않음
+- 키 = 양자화된 위상 벡터 + 질의 옵션 (context_id, top_k, sigma 등)
+- 항목마다 의존하는 버전 카운터의 스냅샷을 저장하고, 조회 시 하나라도 바뀌었으면 무효
+- Place 변경은 그 Place가 속한 격자 셀(주변 영역)의 버전만 올리므로
+  변경된 Place를 이웃에 포함하는 항목만 무효화됨
+- 크기 제한 LRU + hit/miss 카운터
+- PlaceStore 배열을 직접 수정한 경우는 감지되지 않으므로 PlaceStore.mark_changed(row)를
+  호출해야 함 (PlaceMemory 뷰는 복사본을 반환하고 대입 시 자동으로 표시)
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+Version: v0.4.2-alpha (Versioned Result Cache)
+License: MIT License
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+from functools import partial
+from itertools import repeat
+import numpy as np
+
+from .place_store import PlaceStore
+
+
+# 의존성: (현재 버전을 돌려주는 함수, 저장 시점 버전)
+Dependency = Tuple[Callable[[], Any], Any]
+
+
+class ResultCache:
+    """
+    버전 검증 LRU 결과 캐시
+
+    항목은 (값, 의존성 튜플)로 저장되며, 조회 시 모든 의존성의 현재 버전이
+    저장 시점과 같을 때만 hit입니다.
+    """
+
+    def __init__(self, max_entries: int = 4096, resolution: float = 1e-6):
+        """
+        Args:
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            resolution: 위상 키 양자화 간격 (rad). 같은 간격 안의 질의는 결과를 공유
+        """
+        if max_entries <= 0:
+            raise ValueError(f"max_entries는 양수여야 합니다: {max_entries}")
+        self.max_entries = max_entries
+        self.resolution = resolution
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Tuple[Dependency, ...]]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # 크기 제한으로 제거된 항목 수
+        self.invalidations = 0  # 버전 불일치로 제거된 항목 수
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def make_key(self, phase_vector: np.ndarray, *options: Hashable) -> Tuple:
+        """
+        캐시 키 생성
+
+        Args:
+            phase_vector: 위상 벡터
+            *options: 질의 옵션 (context_id, top_k, sigma 등)
+
+        Returns:
+            (양자화 위상 bytes, *options)
+        """
+        quantized = np.round(np.asarray(phase_vector, dtype=float) / self.resolution)
+        return (quantized.astype(np.int64).tobytes(),) + options
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        캐시 조회 (없거나 무효화되었으면 None)
+
+        Args:
+            key: make_key로 만든 키
+
+        Returns:
+            저장된 값 또는 None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, dependencies = entry
+        for source, version in dependencies:
+            if source() != version:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        dependencies: Tuple[Dependency, ...]
+    ) -> None:
+        """
+        캐시 저장
+
+        Args:
+            key: make_key로 만든 키
+            value: 저장할 값 (호출자가 수정하지 않는 값)
+            dependencies: 값을 계산하기 전에 스냅샷한 의존성
+        """
+        self._entries[key] = (value, dependencies)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """모든 항목 삭제 (카운터 유지)"""
+        self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            통계 정보 딕셔너리
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
+
+
+class PlaceVersionTracker:
+    """
+    Place 저장소 버전 카운터
+
+    - place_versions: Place별 버전 (bias/방문 횟수/중심 변경, 추가 시점의 global_version)
+    - cell_versions: 공간 인덱스 격자 셀별 버전 (셀 안 Place 변경 또는 셀 진입/이탈)
+    - global_version: 모든 변경 (주변 셀만으로 한정할 수 없는 전체 스캔 질의용)
+
+    버전은 단조 증가하므로 주변 셀 버전 합이 같으면 모든 셀 버전이 같습니다.
+    읽기는 항목을 만들지 않고 (없으면 0), 삭제된 Place의 항목은 제거합니다.
+    Place 버전은 global_version 값으로 찍으므로 삭제 후 다시 추가되어도
+    이전 스냅샷과 겹치지 않습니다.
+    """
+
+    def __init__(self, store: PlaceStore):
+        """
+        Args:
+            store: 추적할 Place 저장소 (변경 리스너로 등록됨)
+        """
+        self.store = store
+        self.index = store.index
+        self.epoch = 0  # 저장소 전체 초기화 횟수
+        self.global_version = 0
+        self.place_versions: Dict[int, int] = {}
+        self.cell_versions: Dict[int, int] = {}
+        store.change_listeners.append(self.on_change)
+
+    def on_change(self, row: Optional[int]) -> None:
+        """
+        저장소 행 변경 알림 처리
+
+        Args:
+            row: 변경된 행 (None이면 전체)
+        """
+        self.global_version += 1
+        if row is None:
+            self.epoch += 1
+            self.place_versions.clear()
+            self.cell_versions.clear()
+            return
+        place_id = int(self.store.place_ids[row])
+        if place_id in self.store.rows:
+            self.place_versions[place_id] = self.global_version
+        else:
+            # 삭제(교체/병합)된 Place: 항목 제거 (읽기는 0 = 없음)
+            self.place_versions.pop(place_id, None)
+        if self.index is not None:
+            key = self.index.key_of(row)
+            if key >= 0:
+                self.cell_versions[key] = self.cell_versions.get(key, 0) + 1
+
+    def _global(self) -> int:
+        return self.global_version
+
+    def _cells(self, keys: list) -> Tuple[int, int]:
+        return self.epoch, sum(map(self.cell_versions.get, keys, repeat(0)))
+
+    def _place(self, place_id: int) -> Tuple[int, int]:
+        return self.epoch, self.place_versions.get(place_id, 0)
+
+    def neighborhood_dependency(
+        self,
+        phase_vector: np.ndarray,
+        radius: float,
+        top_k: Optional[int] = None
+    ) -> Dependency:
+        """
+        반경 내 Place에 대한 의존성
+
+        공간 인덱스가 주변 셀만 질의하는 경우 그 셀들의 버전에,
+        그 외(인덱스 없음, 전체 스캔)에는 전체 버전에 의존합니다.
+        상위 K개 블렌딩은 k번째 최근접 거리 안의 Place에만 의존하므로
+        넓은 반경이면 그 거리로 좁힙니다.
+
+        Args:
+            phase_vector: 질의 위상 벡터
+            radius: 활성화 반경 (rad)
+            top_k: 블렌딩 상위 K개 (None이면 반경 내 전체)
+
+        Returns:
+            (버전 함수, 현재 버전)
+        """
+        index = self.index
+        if index is None:
+            return self._global, self.global_version
+        if top_k is not None and not index.is_local(radius):
+            nearest = self.store.nearest(phase_vector, top_k, radius, index.phase_wrap)
+            if nearest is not None:
+                radius = nearest[2]
+        if not index.is_local(radius):
+            return self._global, self.global_version
+        source = partial(self._cells, index.ball_keys(phase_vector, radius).tolist())
+        return source, source()
+
+    def place_dependency(self, place_id: int) -> Dependency:
+        """
+        단일 Place에 대한 의존성 (Hard-switching 결과용)
+
+        Args:
+            place_id: Place ID
+
+        Returns:
+            (버전 함수, 현재 버전)
+        """
+        source = partial(self._place, place_id)
+        return source, source()
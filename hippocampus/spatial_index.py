@@ -0,0 +1,514 @@
+"""
+Spatial Index Module
+토러스(주기 경계) 위상 공간을 위한 균일 셀 격자 공간 인덱스
+
+핵심 개념:
+- 위상 공간 T^n을 축마다 n개의 균일 셀로 분할 (wrapping 고려)
+- 각 셀은 그 안에 중심이 있는 행(row) 집합을 보관
+- 반경 r 이웃 질의는 주변 셀만 확인 → Place 수와 무관하게 거의 일정한 비용
+- k-최근접 질의는 셀 링을 안쪽부터 넓혀 가며 k번째 거리가 확정되면 중단 ✨ NEW
+  (넓은 활성화 반경에서도 전체 스캔 없이 상위 K개 블렌딩 후보를 찾음)
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+Version: v0.4.2-alpha (Periodic Spatial Index)
+License: MIT License
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+from itertools import chain
+import numpy as np
+import math
+
+
+class PeriodicGridIndex:
+    """
+    주기 경계 균일 셀 격자 인덱스
+
+    행 번호(row)를 셀에 등록하고, 중심이 이동하면 셀을 증분 갱신합니다.
+    """
+
+    # 질의 영역이 전체 공간의 이 비율을 넘으면 셀 순회 대신 전체 스캔
+    max_covered_fraction: float = 0.05
+
+    def __init__(
+        self,
+        phase_wrap: float = 2.0 * math.pi,
+        cell_size: float = 0.5
+    ):
+        """
+        공간 인덱스 초기화
+
+        Args:
+            phase_wrap: 위상 wrapping 값 (기본값: 2π)
+            cell_size: 목표 셀 크기 (rad, wrap을 나누어 떨어지도록 조정됨)
+        """
+        if cell_size <= 0:
+            raise ValueError(f"cell_size는 양수여야 합니다: {cell_size}")
+
+        self.phase_wrap = phase_wrap
+        # 축당 셀 수 (셀 크기는 wrap / cells_per_axis로 정확히 맞춤)
+        self.cells_per_axis = max(1, int(phase_wrap // cell_size))
+        self.cell_size = phase_wrap / self.cells_per_axis
+        # 셀 좌표 dtype (좌표 차이 계산용, 작을수록 빠름)
+        self._coord_dtype = np.int16 if self.cells_per_axis < (1 << 14) else np.int64
+
+        self.phase_dim: Optional[int] = None  # 첫 등록 시 결정
+        self._strides: Optional[np.ndarray] = None
+
+        # 셀 키 → 행 집합
+        self._cells: Dict[int, set] = {}
+        # 행 → 셀 키 (-1: 미등록)
+        self._row_keys = np.full(64, -1, dtype=np.int64)
+        # 점유 셀 (정렬된 키, 셀 좌표) 캐시 - 셀이 생기거나 비면 무효화
+        self._occupied: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        # 링 반경 → 링 셀 좌표 오프셋 (S, D) 캐시
+        self._shell_offsets: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        """등록된 셀 수 (비어 있지 않은 셀)"""
+        return len(self._cells)
+
+    def _init_dim(self, phase_dim: int) -> None:
+        """차원 결정 및 셀 키 stride 계산"""
+        if self.cells_per_axis ** phase_dim >= 2 ** 62:
+            raise ValueError(
+                f"셀 수가 너무 많습니다: {self.cells_per_axis}^{phase_dim}"
+            )
+        self.phase_dim = phase_dim
+        self._strides = self.cells_per_axis ** np.arange(phase_dim, dtype=np.int64)
+
+    def cell_coords(self, points: np.ndarray) -> np.ndarray:
+        """
+        위상 벡터 → 축별 셀 좌표
+
+        Args:
+            points: 위상 벡터 (D,) 또는 (N, D)
+
+        Returns:
+            셀 좌표 (정수, 같은 shape)
+        """
+        wrapped = np.mod(points, self.phase_wrap)
+        coords = np.floor(wrapped / self.cell_size).astype(np.int64)
+        # mod 결과가 부동소수점 오차로 wrap과 같아지는 경우 보정
+        return coords % self.cells_per_axis
+
+    def cell_keys(self, points: np.ndarray) -> np.ndarray:
+        """
+        위상 벡터 → 선형 셀 키
+
+        Args:
+            points: 위상 벡터 (N, D)
+
+        Returns:
+            셀 키 배열 (N,)
+        """
+        if self.phase_dim is None:
+            self._init_dim(points.shape[-1])
+        return self.cell_coords(points) @ self._strides
+
+    def _ensure_rows(self, row: int) -> None:
+        """행 → 셀 키 배열 용량 확보"""
+        if row >= self._row_keys.shape[0]:
+            new_size = max(row + 1, self._row_keys.shape[0] * 2)
+            row_keys = np.full(new_size, -1, dtype=np.int64)
+            row_keys[:self._row_keys.shape[0]] = self._row_keys
+            self._row_keys = row_keys
+
+    def _detach(self, row: int, key: int) -> None:
+        cell = self._cells.get(key)
+        if cell is not None:
+            cell.discard(row)
+            if not cell:
+                del self._cells[key]
+                self._occupied = None
+
+    def update(self, row: int, point: np.ndarray) -> None:
+        """
+        행 등록 또는 이동 (증분 갱신)
+
+        셀이 바뀐 경우에만 셀 집합을 수정합니다.
+
+        Args:
+            row: 행 번호
+            point: 중심 위상 벡터 (D,)
+        """
+        if self.phase_dim is None:
+            self._init_dim(point.shape[0])
+        self._ensure_rows(row)
+
+        key = int(self.cell_coords(point) @ self._strides)
+        old_key = int(self._row_keys[row])
+        if key == old_key:
+            return
+
+        if old_key >= 0:
+            self._detach(row, old_key)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = set()
+            self._occupied = None
+        cell.add(row)
+        self._row_keys[row] = key
+
+    def remove(self, row: int) -> None:
+        """
+        행 삭제
+
+        Args:
+            row: 행 번호
+        """
+        if row >= self._row_keys.shape[0]:
+            return
+        old_key = int(self._row_keys[row])
+        if old_key >= 0:
+            self._detach(row, old_key)
+            self._row_keys[row] = -1
+
+    def move(self, src: int, dst: int) -> None:
+        """
+        행 번호 변경 (swap-remove 후 마지막 행 재배치)
+
+        Args:
+            src: 기존 행 번호
+            dst: 새 행 번호
+        """
+        key = int(self._row_keys[src]) if src < self._row_keys.shape[0] else -1
+        self.remove(dst)
+        if key < 0:
+            return
+        self._ensure_rows(dst)
+        cell = self._cells[key]
+        cell.discard(src)
+        cell.add(dst)
+        self._row_keys[src] = -1
+        self._row_keys[dst] = key
+
+    def clear(self) -> None:
+        """모든 행 삭제"""
+        self._cells.clear()
+        self._row_keys.fill(-1)
+        self._occupied = None
+
+    def neighbor_keys(self, point: np.ndarray, radius: float) -> np.ndarray:
+        """
+        반경 내 점을 포함할 수 있는 모든 셀 키 (wrapping 고려)
+
+        |φ - q| ≤ r 이면 축별 셀 좌표 차이는 ceil(r / cell_size) 이하입니다.
+
+        Args:
+            point: 질의 위상 벡터 (D,)
+            radius: 질의 반경 (rad)
+
+        Returns:
+            셀 키 배열 (중복 없음)
+        """
+        reach = int(math.ceil(radius / self.cell_size))
+        coords = self.cell_coords(point)
+
+        keys = np.zeros(1, dtype=np.int64)
+        for axis in range(self.phase_dim):
+            if 2 * reach + 1 >= self.cells_per_axis:
+                axis_coords = np.arange(self.cells_per_axis, dtype=np.int64)
+            else:
+                axis_coords = (
+                    coords[axis] + np.arange(-reach, reach + 1, dtype=np.int64)
+                ) % self.cells_per_axis
+            keys = np.add.outer(keys, axis_coords * self._strides[axis]).ravel()
+        return keys
+
+    def _shell_keys(self, coords: np.ndarray, reach: int) -> np.ndarray:
+        """
+        셀 좌표 차이 (체비쇼프, wrapping 고려)가 정확히 reach인 셀 키 (2·reach + 1 < 축당 셀 수)
+        """
+        offsets = self._shell_offsets.get(reach)
+        if offsets is None:
+            axis = np.arange(-reach, reach + 1, dtype=np.int64)
+            cube = np.stack(np.meshgrid(*([axis] * self.phase_dim), indexing='ij'), axis=-1)
+            cube = cube.reshape(-1, self.phase_dim)
+            offsets = cube[np.abs(cube).max(axis=1) == reach]
+            self._shell_offsets[reach] = offsets
+        return ((coords + offsets) % self.cells_per_axis) @ self._strides
+
+    def ball_keys(self, point: np.ndarray, radius: float) -> np.ndarray:
+        """
+        반경 내 점을 포함할 수 있는 셀 키 (셀까지 최소 거리로 거름, wrapping 고려) ✨ NEW
+
+        neighbor_keys의 정육면체에서 질의 점까지의 최소 거리가 반경을 넘는
+        모서리 셀을 뺍니다 (5차원에서 약 1/6만 남음).
+
+        Args:
+            point: 질의 위상 벡터 (D,)
+            radius: 질의 반경 (rad)
+
+        Returns:
+            셀 키 배열 (중복 없음)
+        """
+        reach = int(math.ceil(radius / self.cell_size))
+        if 2 * reach + 1 >= self.cells_per_axis:
+            return self.neighbor_keys(point, radius)
+        coords = self.cell_coords(point)
+        fraction = (np.mod(point, self.phase_wrap) / self.cell_size - coords)[:, np.newaxis]
+        steps = np.arange(-reach, reach + 1, dtype=np.int64)
+        # 축별 질의 점 → 오프셋 셀까지 최소 거리 제곱 (D, 2·reach + 1)
+        gaps = np.maximum(0.0, np.maximum(steps - fraction, fraction - steps - 1))
+        sq_gaps = (gaps * self.cell_size) ** 2
+        limit = radius * radius * (1.0 + 1e-9)
+
+        # 축마다 외적으로 넓히며 부분 거리 제곱이 반경을 넘는 셀은 바로 제외
+        keys = np.zeros(1, dtype=np.int64)
+        sq_distances = np.zeros(1)
+        for axis in range(self.phase_dim):
+            axis_coords = (coords[axis] + steps) % self.cells_per_axis
+            keys = np.add.outer(keys, axis_coords * self._strides[axis]).ravel()
+            sq_distances = np.add.outer(sq_distances, sq_gaps[axis]).ravel()
+            inside = sq_distances <= limit
+            keys, sq_distances = keys[inside], sq_distances[inside]
+        return keys
+
+    def _occupied_cells(self) -> Tuple[np.ndarray, np.ndarray]:
+        """점유 셀 (정렬된 키, 셀 좌표) - 셀 구성이 바뀔 때만 다시 만듦"""
+        if self._occupied is None:
+            cells = self._cells
+            occupied = np.sort(np.fromiter(cells.keys(), dtype=np.int64, count=len(cells)))
+            occupied_coords = (occupied[:, None] // self._strides) % self.cells_per_axis
+            self._occupied = (occupied, occupied_coords.astype(self._coord_dtype))
+        return self._occupied
+
+    def _occupied_keys(self, keys: np.ndarray) -> np.ndarray:
+        """셀 키 중 점유된 키만 (정렬된 점유 키 배열에서 이진 탐색)"""
+        occupied = self._occupied_cells()[0]
+        if occupied.shape[0] == 0:
+            return occupied
+        position = np.minimum(np.searchsorted(occupied, keys), occupied.shape[0] - 1)
+        return keys[occupied[position] == keys]
+
+    def _occupied_chebyshev(self, coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """점유 셀 키와 질의 셀까지의 셀 좌표 차이 (체비쇼프, wrapping 고려)"""
+        occupied, occupied_coords = self._occupied_cells()
+        delta = np.abs(occupied_coords - coords.astype(self._coord_dtype))
+        delta = np.minimum(delta, self.cells_per_axis - delta)
+        return occupied, delta.max(axis=1)
+
+    def nearest(
+        self,
+        point: np.ndarray,
+        k: int,
+        radius: float,
+        sq_distances: Callable[[np.ndarray], np.ndarray]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        반경 내 k-최근접 후보 행 (확장 링 탐색) ✨ NEW
+
+        질의 셀에서 체비쇼프 셀 거리 0, 1, 2, ... 인 셀 링을 차례로 확인합니다.
+        링 reach까지 확인하면 나머지 점은 모두 (reach + m)·cell_size 이상 떨어져 있으므로
+        (m: 질의 점에서 자기 셀 경계까지 가장 가까운 축 거리 / cell_size),
+        지금까지 k번째 거리가 그 이하이면 (또는 반경을 다 덮으면) 중단합니다.
+        링이 점유 셀 수보다 커지면 점유 셀의 셀 거리를 한 번 계산해 이어서 씁니다.
+
+        Args:
+            point: 질의 위상 벡터 (D,)
+            k: 최근접 개수 (1 이상)
+            radius: 질의 반경 (rad, 이 밖의 점은 필요 없음)
+            sq_distances: 행 배열 → 정확한 거리 제곱 (호출자 계산)
+
+        Returns:
+            (후보 행, 거리 제곱) - 반경 내 k-최근접 행을 모두 포함
+            (링이 축 전체를 덮어야 하면 None: 전체 스캔이 더 저렴)
+        """
+        if self.phase_dim is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        cells = self._cells
+        coords = self.cell_coords(point)
+        # 셀 안 위치 → 셀 경계까지의 여유 (부동소수점 오차만큼 보수적으로)
+        fraction = np.mod(point, self.phase_wrap) / self.cell_size - coords
+        margin = max(0.0, min(float(fraction.min()), float(1.0 - fraction.max())) - 1e-9)
+        max_reach = max(0, int(math.ceil(radius / self.cell_size - margin)))
+        found_rows = []
+        found_distances = []
+        total = 0
+        occupied = None
+        for reach in range(max_reach + 1):
+            if 2 * reach + 1 >= self.cells_per_axis:
+                return None
+            if occupied is None and (2 * reach + 1) ** self.phase_dim > len(cells):
+                occupied, chebyshev = self._occupied_chebyshev(coords)
+            if occupied is None:
+                keys = self._occupied_keys(self._shell_keys(coords, reach))
+                hits = [cells[key] for key in keys.tolist()]
+            else:
+                hits = [cells[key] for key in occupied[chebyshev == reach].tolist()]
+            count = sum(len(cell) for cell in hits)
+            if count:
+                rows = np.fromiter(chain.from_iterable(hits), dtype=np.int64, count=count)
+                found_rows.append(rows)
+                found_distances.append(sq_distances(rows))
+                total += count
+            if total >= k:
+                distances = np.concatenate(found_distances)
+                kth = np.partition(distances, k - 1)[k - 1]
+                if kth <= ((reach + margin) * self.cell_size) ** 2:
+                    break
+
+        if not found_rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.concatenate(found_rows), np.concatenate(found_distances)
+
+    def key_of(self, row: int) -> int:
+        """행의 셀 키 (등록되지 않았으면 -1)"""
+        if row >= self._row_keys.shape[0]:
+            return -1
+        return int(self._row_keys[row])
+
+    def is_local(self, radius: float) -> bool:
+        """
+        반경 질의가 주변 셀만 확인하는지 여부
+
+        반경이 공간의 max_covered_fraction 이상을 덮으면 전체 스캔이 더 저렴합니다.
+
+        Args:
+            radius: 질의 반경 (rad)
+
+        Returns:
+            주변 셀 질의 여부 (차원이 아직 정해지지 않았으면 False)
+        """
+        if self.phase_dim is None:
+            return False
+        reach = int(math.ceil(radius / self.cell_size))
+        covered_fraction = (
+            min(2 * reach + 1, self.cells_per_axis) / self.cells_per_axis
+        ) ** self.phase_dim
+        return covered_fraction <= self.max_covered_fraction
+
+    def query(self, point: np.ndarray, radius: float) -> Optional[np.ndarray]:
+        """
+        반경 내 후보 행 검색
+
+        후보에는 반경 밖의 점이 포함될 수 있으므로 호출자가 정확한 거리로 걸러야 합니다.
+
+        Args:
+            point: 질의 위상 벡터 (D,)
+            radius: 질의 반경 (rad)
+
+        Returns:
+            후보 행 배열 (반경이 공간의 상당 부분을 덮으면 None: 전체 스캔이 더 저렴)
+        """
+        if self.phase_dim is None:
+            return np.zeros(0, dtype=np.int64)
+        if not self.is_local(radius):
+            return None
+
+        reach = int(math.ceil(radius / self.cell_size))
+        cells = self._cells
+        num_neighbors = (2 * reach + 1) ** self.phase_dim
+        if num_neighbors <= len(cells):
+            # 이웃 셀 키를 직접 열거
+            keys = self.neighbor_keys(point, radius).tolist()
+        else:
+            # 점유 셀이 더 적으면 점유 셀의 셀 좌표 거리로 선별
+            occupied = np.fromiter(cells.keys(), dtype=np.int64, count=len(cells))
+            occupied_coords = (
+                occupied[:, None] // self._strides
+            ) % self.cells_per_axis
+            delta = np.abs(occupied_coords - self.cell_coords(point))
+            delta = np.minimum(delta, self.cells_per_axis - delta)
+            keys = occupied[np.all(delta <= reach, axis=1)].tolist()
+
+        hits = [cells[key] for key in keys if key in cells]
+        count = sum(len(cell) for cell in hits)
+        return np.fromiter(chain.from_iterable(hits), dtype=np.int64, count=count)
+
+
+def periodic_close_pairs(
+    points: np.ndarray,
+    radius: float,
+    phase_wrap: float = 2.0 * math.pi
+) -> np.ndarray:
+    """
+    토러스 거리가 radius 미만인 모든 점 쌍 (셀 격자 + 정렬 조인)
+
+    셀 크기 ≥ radius인 격자에서 각 점은 인접 셀(축당 ±1)의 점만 비교하면 됩니다.
+    점유 셀을 정렬해 두고 인접 오프셋(절반만, 대칭 제외)마다 searchsorted로
+    셀 쌍을 조인하므로 전체 비용은 O(3^D · U log U + 후보 쌍 수)입니다 (U: 점유 셀 수).
+
+    Args:
+        points: 위상 벡터 배열 (N, D)
+        radius: 임계 거리 (rad)
+        phase_wrap: 위상 wrapping 값
+
+    Returns:
+        쌍 배열 (M, 2), 각 행은 i < j, 사전순 정렬
+    """
+    num_points = points.shape[0]
+    if num_points < 2 or radius <= 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    phase_dim = points.shape[1]
+    # 셀 키가 int64를 넘지 않도록 축당 셀 수 제한 (셀이 커져도 결과는 동일)
+    max_cells = max(1, int(2 ** (62.0 / phase_dim)) - 1)
+    grid = PeriodicGridIndex(
+        phase_wrap=phase_wrap,
+        cell_size=max(radius, phase_wrap / max_cells)
+    )
+    keys = grid.cell_keys(points)
+    n = grid.cells_per_axis
+
+    # 점유 셀 정렬: 셀 c의 점들 = order[cell_start[c]:cell_start[c] + cell_count[c]]
+    cell_keys, first_index, inverse, cell_count = np.unique(
+        keys, return_index=True, return_inverse=True, return_counts=True
+    )
+    order = np.argsort(inverse, kind='stable')
+    cell_start = np.cumsum(cell_count) - cell_count
+    cell_coords = grid.cell_coords(points[first_index])
+
+    # 인접 셀 오프셋: 축당 {-1, 0, 1}
+    # 셀 수 ≥ 3이면 o와 -o 중 하나만 (사전순 양수 + 0) 사용하여 중복 조인 제거
+    offsets = np.array(
+        np.meshgrid(*([[-1, 0, 1]] * phase_dim), indexing='ij')
+    ).reshape(phase_dim, -1).T
+    if n >= 3:
+        nonzero = offsets != 0
+        first_nonzero = np.argmax(nonzero, axis=1)
+        leading = offsets[np.arange(len(offsets)), first_nonzero]
+        offsets = offsets[(leading > 0) | ~nonzero.any(axis=1)]
+    else:
+        offsets = np.unique(offsets % n, axis=0)
+
+    pair_blocks = []
+    for offset in offsets:
+        neighbor_keys = ((cell_coords + offset) % n) @ grid._strides
+        position = np.searchsorted(cell_keys, neighbor_keys)
+        position = np.minimum(position, len(cell_keys) - 1)
+        matched = cell_keys[position] == neighbor_keys
+        cell_a = np.flatnonzero(matched)
+        cell_b = position[matched]
+        if cell_a.size == 0:
+            continue
+
+        # 셀 쌍 (a, b)의 모든 점 쌍 전개: t ∈ [0, |a|·|b|)
+        count_a = cell_count[cell_a]
+        count_b = cell_count[cell_b]
+        sizes = count_a * count_b
+        total = int(sizes.sum())
+        block = np.repeat(np.arange(cell_a.size), sizes)
+        t = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        left = order[cell_start[cell_a][block] + t // count_b[block]]
+        right = order[cell_start[cell_b][block] + t % count_b[block]]
+
+        keep = left != right
+        left, right = left[keep], right[keep]
+        diff = points[left] - points[right]
+        diff = diff - phase_wrap * np.round(diff / phase_wrap)
+        close = np.einsum('ij,ij->i', diff, diff) < radius * radius
+        if np.any(close):
+            left, right = left[close], right[close]
+            pair_blocks.append(
+                np.stack([np.minimum(left, right), np.maximum(left, right)], axis=1)
+            )
+
+    if not pair_blocks:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    return np.unique(np.concatenate(pair_blocks), axis=0)
@@ -14,10 +14,14 @@ Version: v0.4.0-alpha (Universal Memory Interface)
 License: MIT License
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
+from functools import partial
 import numpy as np
 from .place_cells import PlaceCellManager, PlaceMemory
-from .context_binder import ContextBinder, ContextMemory
+from .context_binder import ContextBinder, ContextHandle, ContextMemory
+from .context_schema import ContextSchema
+from .eviction import ConsolidationAwareEvictionPolicy
+from .result_cache import ResultCache
 from .learning_gate import LearningGate, LearningGateConfig
 from .replay_consolidation import ReplayConsolidation
 from .replay_buffer import ReplayBuffer, TrajectoryPoint
@@ -38,20 +42,39 @@ class UniversalMemory:
     def __init__(
         self,
         memory_dim: int = 5,  # 메모리 차원 (기본값: 5D)
-        num_places: int = 1000,  # Place 수
+        num_places: int = 1000,  # 예상 Place 수 (셀 테이블 초기 크기 힌트)
         num_contexts: int = 10000,  # Context 수
         phase_wrap: float = 2.0 * np.pi,  # 위상 래핑
-        quantization_level: int = 100  # 양자화 레벨
+        quantization_level: int = 100,  # 양자화 레벨
+        place_capacity: Optional[int] = None,  # 최대 저장 Place 수 (None이면 무제한)
+        context_capacity: Optional[int] = None,  # 최대 저장 (Place, Context) 조합 수
+        eviction_policy: str = "lru",  # 교체 정책 ("lru", "lfu", "consolidation")
+        result_cache_size: int = 0,  # 검색 결과 캐시 크기 (0이면 사용 안 함)
+        context_schema: Optional[ContextSchema] = None,  # 외부 상태 구간화 규칙
+        replay_spill_dir: Optional[str] = None,  # Replay Buffer 디스크 스필 디렉터리 ✨ NEW
+        replay_aggregate: bool = False  # 연속 안정 머무름을 요약 행으로 저장 ✨ NEW
     ):
         """
         Universal Memory 초기화
         
         Args:
             memory_dim: 메모리 차원 (기본값: 5D)
-            num_places: Place 수
+            num_places: 예상 Place 수 (셀 테이블 초기 크기 힌트)
             num_contexts: Context 수
             phase_wrap: 위상 래핑 값
             quantization_level: 양자화 레벨
+            place_capacity: 최대 저장 Place 수 (None이면 무제한)
+            context_capacity: 최대 저장 (Place, Context) 조합 수 (None이면 무제한)
+            eviction_policy: 용량 초과 시 교체 정책
+                ("consolidation"이면 Consolidation된 Place와 그 Context를 보호)
+            result_cache_size: get_bias_estimate/retrieve 결과 캐시 크기 (0이면 사용 안 함)
+            context_schema: 외부 상태 구간화 규칙 (있으면 구간화된 상태별 밀집 Context ID)
+            replay_spill_dir: Replay Buffer가 가득 차면 세그먼트 파일을 쓸 디렉터리
+                (None이면 가장 오래된 기록을 덮어씀)
+            replay_aggregate: 같은 Place/Context의 연속 안정 포인트를 요약 행으로 합쳐 저장
+                (최근 Consolidation 창의 오차 표준편차가 유의성 임계값 이상이 되는 포인트는
+                합치지 않음. Replay는 머무름의 마지막 bias 이력 길이만큼 오차를 그대로 재생하고
+                그 앞 포인트만 평균 오차로 한 번에 반영)
         """
         self.memory_dim = memory_dim
         
@@ -59,10 +82,34 @@ class UniversalMemory:
         self.place_manager = PlaceCellManager(
             num_places=num_places,
             phase_wrap=phase_wrap,
-            quantization_level=quantization_level
+            quantization_level=quantization_level,
+            bias_dim=memory_dim,
+            capacity=place_capacity,
+            eviction_policy=eviction_policy,
+            result_cache_size=result_cache_size
         )
         
-        self.context_binder = ContextBinder(num_contexts=num_contexts)
+        context_policy = eviction_policy
+        if eviction_policy == ConsolidationAwareEvictionPolicy.name:
+            # Context 조합은 해당 Place가 Consolidation되었으면 보호
+            context_policy = ConsolidationAwareEvictionPolicy(
+                is_protected=lambda key: self.place_manager.is_place_consolidated(key[0])
+            )
+        self.context_binder = ContextBinder(
+            num_contexts=num_contexts,
+            capacity=context_capacity,
+            eviction_policy=context_policy,
+            bias_dim=memory_dim,
+            schema=context_schema
+        )
+        
+        # Place 교체 시 해당 Place의 Context Memory도 연쇄 삭제 ✨ NEW
+        self.place_manager.add_eviction_listener(self.context_binder.remove_place)
+        
+        # 검색 결과 캐시 (선택): 주변 Place/해당 Context가 바뀌면 무효화 ✨ NEW
+        self.retrieve_cache: Optional[ResultCache] = None
+        if result_cache_size > 0:
+            self.retrieve_cache = ResultCache(max_entries=result_cache_size)
         
         self.learning_gate = LearningGate(
             config=LearningGateConfig(
@@ -79,19 +126,57 @@ class UniversalMemory:
         
         self.replay_buffer = ReplayBuffer(
             max_size=10000,
-            stable_window=10
+            stable_window=10,
+            spill_dir=replay_spill_dir,
+            aggregate=replay_aggregate,
+            aggregate_tail=self.place_manager.store.history_len,
+            aggregate_max_std=self.replay_consolidation.significance_threshold,
+            aggregate_std_window=self.replay_consolidation.consolidation_window
         )
         
         # 상태 관리
         self.external_state: Dict[str, Any] = {}
+        self.context_handle: Optional[ContextHandle] = None  # set_context 핸들 ✨ NEW
         self.last_update_time: float = 0.0
         self.is_replay_phase: bool = False
     
+    def set_context(self, context: Dict[str, Any]) -> ContextHandle:
+        """
+        현재 맥락 설정 (Context ID를 한 번만 계산) ✨ NEW
+        
+        이후 context 없이 호출한 store/retrieve는 해시 없이 이 핸들의 Context ID를 사용합니다.
+        반환된 핸들을 store/retrieve의 context로 전달해도 됩니다.
+        
+        Args:
+            context: 맥락 정보
+        
+        Returns:
+            ContextHandle
+        """
+        handle = self.context_binder.set_context(context)
+        self.external_state = handle.state
+        self.context_handle = handle
+        return handle
+    
+    def _current_context_id(self, context: Any) -> int:
+        """context 인자 반영 후 현재 Context ID (핸들이면 해시 없음)"""
+        if isinstance(context, ContextHandle):
+            self.external_state = context.state
+            self.context_handle = context
+        elif context is not None:
+            self.external_state = context
+            self.context_handle = None
+        
+        handle = self.context_handle
+        if handle is not None and handle.state is self.external_state:
+            return handle.context_id
+        return self.context_binder.get_context_id(self.external_state)
+    
     def store(
         self,
         key: Any,
         value: Any,
-        context: Optional[Dict[str, Any]] = None,
+        context: Union[Dict[str, Any], ContextHandle, None] = None,
         timestamp: Optional[float] = None
     ) -> None:
         """
@@ -102,7 +187,7 @@ class UniversalMemory:
         Args:
             key: 기억 키 (위상 벡터, 상태 벡터, 또는 해시 가능한 값)
             value: 기억 값 (bias, 경향, 습관 등)
-            context: 맥락 정보 (도메인 독립적)
+            context: 맥락 정보 (도메인 독립적, set_context 핸들 가능)
             timestamp: 타임스탬프 (None이면 현재 시간)
         """
         # key를 위상 벡터로 변환
@@ -111,25 +196,20 @@ class UniversalMemory:
         # value를 bias로 변환
         bias = self._value_to_bias(value)
         
-        # Context 설정
-        if context is not None:
-            self.external_state = context
-        
         # Place ID 할당
         place_id = self.place_manager.get_place_id(phase_vector)
         
-        # Context ID 할당
-        context_id = self.context_binder.get_context_id(self.external_state)
-        
-        # Place Memory 업데이트
-        place_memory = self.place_manager.get_place_memory(place_id)
-        place_memory.update_bias(bias, learning_rate=0.1)
-        place_memory.add_bias_to_history(bias)
+        # Context 설정 + Context ID 할당 (상태가 바뀌었을 때만 해시)
+        context_id = self._current_context_id(context)
         
-        if place_memory.place_center is None:
-            place_memory.place_center = phase_vector.copy()
-        else:
-            place_memory.update_place_center(phase_vector, learning_rate=0.05)
+        # Place Memory 업데이트 (bias, 이력, 중심, 교체 정책 방문 기록 - 방문 시간은 그대로)
+        self.place_manager.update_place_memory(
+            place_id=place_id,
+            phase_vector=phase_vector,
+            bias=bias,
+            current_time=None,
+            learning_rate=0.1
+        )
         
         # Context Memory 업데이트
         self.context_binder.update_context_memory(
@@ -157,7 +237,7 @@ class UniversalMemory:
     def retrieve(
         self,
         query: Any,
-        context: Optional[Dict[str, Any]] = None,
+        context: Union[Dict[str, Any], ContextHandle, None] = None,
         top_k: int = 5
     ) -> List[Dict[str, Any]]:
         """
@@ -167,7 +247,7 @@ class UniversalMemory:
         
         Args:
             query: 검색 쿼리 (위상 벡터, 상태 벡터, 또는 해시 가능한 값)
-            context: 맥락 정보
+            context: 맥락 정보 (set_context 핸들 가능)
             top_k: 상위 K개 기억 반환
         
         Returns:
@@ -176,57 +256,90 @@ class UniversalMemory:
         # query를 위상 벡터로 변환
         phase_vector = self._key_to_phase_vector(query)
         
-        # Context 설정
-        if context is not None:
-            self.external_state = context
-        
-        # Place ID 할당
-        place_id = self.place_manager.get_place_id(phase_vector)
-        
-        # Context ID 할당
-        context_id = self.context_binder.get_context_id(self.external_state)
+        # Place ID 조회 (읽기 경로: 방문하지 않은 셀이면 None, 할당 없음) ✨ FIXED
+        place_id = self.place_manager.lookup_place_id(phase_vector)
+        
+        # Context 설정 + Context ID 할당 (상태가 바뀌었을 때만 해시)
+        context_id = self._current_context_id(context)
+        
+        # 결과 캐시 조회 (양자화 위상, context_id, top_k, sigma) ✨ NEW
+        sigma = 0.5
+        cache = self.retrieve_cache
+        if cache is not None:
+            cache_key = cache.make_key(phase_vector, context_id, top_k, sigma)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return self._copy_memories(cached)
+            context_versions = self.context_binder.place_versions
+            dependencies = self.place_manager.bias_dependencies(
+                phase_vector, place_id, use_blending=True, sigma=sigma, top_k=top_k
+            )
+            if place_id is not None:
+                dependencies += (
+                    (partial(context_versions.get, place_id, 0), context_versions.get(place_id, 0)),
+                )
         
         # Place Memory에서 bias 검색
         place_bias = self.place_manager.get_bias_estimate(
             phase_vector,
             use_blending=True,
             top_k=top_k,
-            sigma=0.5
+            sigma=sigma
         )
         
         # Context Memory에서 bias 검색
-        context_bias = self.context_binder.get_bias_estimate(place_id, context_id)
+        if place_id is None:
+            context_bias = np.zeros(self.context_binder.bias_dim)
+        else:
+            context_bias = self.context_binder.get_bias_estimate(place_id, context_id)
         
-        # 결과 반환
+        # 결과 반환 (읽기 경로: 없는 Place/Context는 생성하지 않고 방문 0으로 보고) ✨ FIXED
         memories = []
         
         # Place 기반 기억
-        place_memory = self.place_manager.get_place_memory(place_id)
+        place_memory = None if place_id is None else self.place_manager.peek_place_memory(place_id)
+        place_visits = place_memory.visit_count if place_memory is not None else 0
         memories.append({
             "type": "place",
             "place_id": place_id,
             "bias": place_bias,
-            "visit_count": place_memory.visit_count,
-            "confidence": min(1.0, place_memory.visit_count / 10.0)
+            "visit_count": place_visits,
+            "confidence": min(1.0, place_visits / 10.0)
         })
         
         # Context 기반 기억
-        context_memory = self.context_binder.get_context_memory(place_id, context_id)
+        context_memory = (
+            None if place_id is None
+            else self.context_binder.peek_context_memory(place_id, context_id)
+        )
+        context_visits = context_memory.visit_count if context_memory is not None else 0
         memories.append({
             "type": "context",
             "place_id": place_id,
             "context_id": context_id,
             "bias": context_bias,
-            "visit_count": context_memory.visit_count,
-            "confidence": min(1.0, context_memory.visit_count / 10.0)
+            "visit_count": context_visits,
+            "confidence": min(1.0, context_visits / 10.0)
         })
         
+        if cache is not None:
+            cache.put(cache_key, self._copy_memories(memories), dependencies)
+        
         return memories
     
+    @staticmethod
+    def _copy_memories(memories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """검색 결과 복사 (bias 배열 포함, 공유 읽기 전용 0 벡터는 그대로)"""
+        copied = []
+        for memory in memories:
+            bias = memory["bias"]
+            copied.append(dict(memory, bias=bias.copy() if bias.flags.writeable else bias))
+        return copied
+    
     def augment(
         self,
         query: Any,
-        context: Optional[Dict[str, Any]] = None
+        context: Union[Dict[str, Any], ContextHandle, None] = None
     ) -> Dict[str, Any]:
         """
         기억 증강 (범용 인터페이스)
@@ -246,7 +359,7 @@ class UniversalMemory:
         # 컨텍스트 구성
         augmented_context = {
             "query": query,
-            "context": context or {},
+            "context": dict(context.state) if isinstance(context, ContextHandle) else (context or {}),
             "memories": memories,
             "summary": self._summarize_memories(memories)
         }
@@ -343,6 +456,90 @@ class UniversalMemory:
             "has_memory": average_confidence > 0.1
         }
     
+    def _replay_point(
+        self,
+        place_id: int,
+        error: np.ndarray,
+        current_time_s: float,
+        count: int = 1
+    ) -> int:
+        """
+        Replay 포인트 (또는 같은 오차 count개로 이루어진 머무름 요약) 반영
+        
+        같은 오차를 count번 반영한 결과와 같습니다: 이력 창이 모두 같은 오차로 채워진 뒤
+        Consolidation이 성공하면 이후 단계는 같은 값으로 계속 성공하는 고정점이므로
+        나머지 방문 수/이력/Consolidation 횟수를 한 번에 반영합니다 ✨ NEW
+        
+        Args:
+            place_id: Place ID
+            error: 오차 (머무름 요약이면 평균 오차)
+            current_time_s: 현재 시간 (초)
+            count: 포인트 수
+        
+        Returns:
+            Consolidation 성공 횟수
+        """
+        # Place Memory 업데이트
+        place_memory = self.place_manager.get_place_memory(place_id)
+        self.place_manager.mark_place_visited(place_id, count)
+        window = max(self.replay_consolidation.consolidation_window, 2)
+        consolidated = 0
+        last_success = False
+        for done in range(count):
+            if done >= window and last_success:
+                # 고정점: 나머지 단계를 한 번에
+                rest = count - done
+                place_memory.update_bias(error, learning_rate=0.1, count=rest)
+                for _ in range(min(rest, place_memory.bias_history.maxlen)):
+                    place_memory.add_bias_to_history(error)
+                self.replay_consolidation.consolidate_place_memory(place_memory, current_time_s)
+                return consolidated + rest
+            place_memory.update_bias(error, learning_rate=0.1)
+            place_memory.add_bias_to_history(error)
+            
+            # Consolidation 수행
+            last_success = self.replay_consolidation.consolidate_place_memory(
+                place_memory, current_time_s
+            )
+            if last_success:
+                consolidated += 1
+        return consolidated
+    
+    def _replay_summaries(self, piece: np.ndarray, current_time_s: float) -> int:
+        """
+        머무름 요약 행 Replay
+        
+        요약 행에 남은 마지막 오차 (error_tail)는 포인트별 Replay와 같게 하나씩 반영하고,
+        그 앞 포인트들은 평균 오차로 count번 갱신한 결과를 한 번에 반영합니다.
+        마지막 오차가 bias 이력 길이만큼 남아 있으면 머무름 뒤의 이력과 Consolidation은
+        포인트별 Replay와 같습니다.
+        
+        Args:
+            piece: 요약 행 구조 배열 조각
+            current_time_s: 현재 시간 (초)
+        
+        Returns:
+            Consolidation 성공 횟수
+        """
+        tail = self.replay_buffer.aggregate_tail
+        counts = piece['count'].tolist()
+        if tail:
+            tails = piece['error_tail']
+        else:
+            tails = np.zeros((len(piece), 0, piece['error_sum'].shape[1]))
+        consolidated = 0
+        for place_id, count, error_sum, error_tail in zip(
+            piece['place_id'].tolist(), counts, piece['error_sum'], tails
+        ):
+            recent = error_tail[tail - min(count, tail):]
+            prefix = count - len(recent)
+            if prefix:
+                mean = (error_sum - recent.sum(axis=0)) / prefix
+                consolidated += self._replay_point(place_id, mean, current_time_s, prefix)
+            for error in recent:
+                consolidated += self._replay_point(place_id, error, current_time_s)
+        return consolidated
+    
     def replay(self, current_time: Optional[float] = None) -> Dict[str, Any]:
         """
         Replay 수행 (기억 정제)
@@ -361,33 +558,31 @@ class UniversalMemory:
         # Replay phase 시작
         self.is_replay_phase = True
         
-        # 안정적인 구간 추출
-        # ReplayBuffer의 get_stable_segments는 내부적으로 안정성 판단을 수행
-        stable_segments = self.replay_buffer.get_stable_segments(min_segment_length=5)
+        # 안정적인 구간을 청크 단위로 스트리밍 (스필 세그먼트 포함) ✨ NEW
+        # ReplayBuffer의 iter_stable_runs는 내부적으로 안정성 판단을 수행
+        stable_runs = self.replay_buffer.iter_stable_runs(min_segment_length=5)
         
         # Replay 수행
         consolidated_count = 0
-        for segment in stable_segments:
-            for point in segment:
-                # Place Memory 업데이트
-                place_memory = self.place_manager.get_place_memory(point.place_id)
-                place_memory.update_bias(point.error, learning_rate=0.1)
-                place_memory.add_bias_to_history(point.error)
-                
-                # Consolidation 수행
-                if self.replay_consolidation.consolidate_place_memory(
-                    place_memory, current_time_s
-                ):
-                    consolidated_count += 1
+        segments_processed = 0
+        for run_id, piece in stable_runs:
+            segments_processed = run_id + 1
+            if self.replay_buffer.aggregate:
+                # 머무름 요약 행: 앞 포인트는 평균 오차로 한 번에, 마지막 오차들은 그대로 ✨ NEW
+                consolidated_count += self._replay_summaries(piece, current_time_s)
+                continue
+            # 레코드 열 뷰로 순회 (TrajectoryPoint 생성 없음)
+            for place_id, error in zip(piece['place_id'].tolist(), piece['error']):
+                consolidated_count += self._replay_point(place_id, error, current_time_s)
         
         # Replay phase 종료
         self.is_replay_phase = False
         
-        # Replay Buffer 비우기
+        # Replay Buffer 비우기 (스필 세그먼트 파일 회수)
         self.replay_buffer.clear()
         
         return {
-            "segments_processed": len(stable_segments),
+            "segments_processed": segments_processed,
             "consolidated_count": consolidated_count,
             "total_places": len(self.place_manager.place_memory)
         }
@@ -404,7 +599,7 @@ def create_universal_memory(
     
     Args:
         memory_dim: 메모리 차원
-        num_places: Place 수
+        num_places: 예상 Place 수 (셀 테이블 초기 크기 힌트)
         num_contexts: Context 수
     
     Returns:
@@ -0,0 +1,178 @@
+"""
+Learning Gate 테스트
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import unittest
+from hippocampus import LearningGate, LearningGateConfig, MultiStreamLearningGate
+
+
+def reference_variance_rule(states, window, threshold):
+    """기존 리스트 기반 구현의 분산 조건 (통과 여부)"""
+    recent = []
+    decisions = []
+    for state in states:
+        recent.append(state.copy())
+        if len(recent) > window:
+            recent.pop(0)
+        if len(recent) >= window:
+            decisions.append(not np.linalg.norm(np.var(np.array(recent), axis=0)) > threshold)
+        else:
+            decisions.append(True)
+    return decisions
+
+
+class TestLearningGate(unittest.TestCase):
+    """Learning Gate 테스트"""
+    
+    def make_gate(self, **kwargs):
+        config = LearningGateConfig(default_enabled=True, replay_only=False, min_visit_count=0, **kwargs)
+        return LearningGate(config)
+    
+    def test_ring_buffer_history(self):
+        """링 버퍼 기록 순서/길이 및 reset 테스트"""
+        gate = self.make_gate(variance_window=3)
+        for i in range(5):
+            gate.should_learn(
+                np.full(2, float(i)),
+                current_velocity=np.zeros(2),
+                is_replay_phase=True
+            )
+        
+        # 가장 오래된 값부터, 최근 3개만 유지
+        np.testing.assert_array_equal(np.array(gate.recent_states), [[2, 2], [3, 3], [4, 4]])
+        self.assertEqual(len(gate.recent_velocities), 3)
+        self.assertEqual(len(gate.recent_accelerations), 0)
+        self.assertEqual(gate.get_statistics()["recent_states_count"], 3)
+        
+        gate.reset()
+        self.assertEqual(gate.recent_states, [])
+        # reset 후에는 다른 차원도 허용
+        gate.should_learn(np.zeros(3), is_replay_phase=True)
+        self.assertEqual(len(gate.recent_states), 1)
+        with self.assertRaises(ValueError):
+            gate.should_learn(np.zeros(4), is_replay_phase=True)
+    
+    def test_variance_decisions_match_reference(self):
+        """이동 분산 판정이 기존 np.var 판정과 동일한지 테스트 (임계값 근처 포함)"""
+        rng = np.random.default_rng(7)
+        for window, dtype in [(1, np.float64), (4, np.float64), (10, np.float32), (25, np.int64)]:
+            base = np.array([1000.0, -3.0, 0.5])
+            states = []
+            for t in range(300):
+                if t % 40 == 0:
+                    base = base + rng.normal(size=3)
+                noise = rng.normal(size=3) * 10.0 ** rng.uniform(-5, 0)
+                # 같은 값 반복 구간 (분산 0) 포함
+                state = base if t % 40 >= 30 else base + noise
+                states.append(state.astype(dtype))
+            
+            # 실제 분산 노름 근처 임계값 → 경계 판정 확인
+            norms = [
+                np.linalg.norm(np.var(np.array(states[i - window + 1:i + 1]), axis=0))
+                for i in range(window - 1, len(states))
+            ]
+            for threshold in [0.0, float(np.median(norms)), float(norms[len(norms) // 2])]:
+                gate = self.make_gate(variance_window=window, variance_threshold=threshold)
+                decisions = [gate.should_learn(s, is_replay_phase=True) for s in states]
+                self.assertEqual(
+                    decisions, reference_variance_rule(states, window, threshold),
+                    f"window={window}, dtype={dtype.__name__}, threshold={threshold}"
+                )
+
+    
+    def test_batch_matches_sequential(self):
+        """배치 판정이 샘플별 should_learn 호출과 같은 결과/기록을 남기는지 테스트"""
+        rng = np.random.default_rng(11)
+        T = 500
+        base = np.cumsum(rng.normal(size=(T, 4)) * (rng.random((T, 1)) < 0.05), axis=0) + 100.0
+        states = base + rng.normal(size=(T, 4)) * 1e-3 * (rng.random((T, 1)) < 0.7)
+        velocities = rng.normal(size=(T, 4)) * 0.006
+        accelerations = rng.normal(size=(T, 2)) * 0.0006
+        visits = rng.integers(0, 6, size=T)
+        replay = rng.random(T) < 0.8
+        # 임계값 = 실제 윈도우 분산 노름 (경계 판정 포함)
+        threshold = float(np.linalg.norm(np.var(states[200:210], axis=0)))
+        
+        for default_enabled, replay_only in [(True, False), (False, False), (False, True)]:
+            config = LearningGateConfig(
+                variance_window=10, variance_threshold=threshold,
+                default_enabled=default_enabled, replay_only=replay_only
+            )
+            sequential_gate, batch_gate = LearningGate(config), LearningGate(config)
+            expected = [
+                sequential_gate.should_learn(
+                    states[t], velocities[t], accelerations[t], int(visits[t]), bool(replay[t])
+                )
+                for t in range(T)
+            ]
+            # 두 번에 나누어 호출해도 이전 기록에서 이어서 판단
+            result = np.concatenate([
+                batch_gate.should_learn_batch(
+                    states[part], velocities[part], accelerations[part], visits[part], replay[part]
+                )
+                for part in (slice(0, 123), slice(123, T))
+            ])
+            self.assertEqual(result.dtype, bool)
+            self.assertEqual(result.tolist(), expected)
+            np.testing.assert_array_equal(
+                np.array(batch_gate.recent_states), np.array(sequential_gate.recent_states)
+            )
+
+    
+    def test_multi_stream_matches_independent_gates(self):
+        """스트림별 윈도우가 스트림마다 LearningGate를 둔 것과 같은지 테스트"""
+        rng = np.random.default_rng(5)
+        config = LearningGateConfig(
+            variance_window=5, variance_threshold=1e-5,
+            default_enabled=True, replay_only=False, min_visit_count=2
+        )
+        keys = ["spindle", "x_axis", "y_axis", ("robot", 3)]
+        gates = {key: LearningGate(config) for key in keys}
+        multi = MultiStreamLearningGate(config, initial_streams=1)
+        base = rng.normal(size=(len(keys), 3)) * 100.0
+        
+        for t in range(120):
+            # 매 틱 일부 스트림만, 순서를 바꿔가며 (샘플이 섞여도 윈도우는 독립)
+            chosen = rng.permutation(len(keys))[:rng.integers(1, len(keys) + 1)]
+            tick_keys = [keys[i] for i in chosen]
+            if t % 30 == 0:
+                base[chosen] += rng.normal(size=(len(chosen), 3))
+            states = base[chosen] + rng.normal(size=(len(chosen), 3)) * 10.0 ** rng.uniform(-4, -2)
+            velocities = rng.normal(size=(len(chosen), 3)) * 0.006
+            visits = rng.integers(0, 4, size=len(chosen))
+            
+            expected = [
+                gates[key].should_learn(states[i], velocities[i], None, int(visits[i]), True)
+                for i, key in enumerate(tick_keys)
+            ]
+            result = multi.should_learn_streams(tick_keys, states, velocities, None, visits, True)
+            self.assertEqual(result.tolist(), expected)
+        
+        self.assertEqual(len(multi), len(keys))
+        for key in keys:
+            np.testing.assert_array_equal(np.array(multi.recent_states(key)), np.array(gates[key].recent_states))
+        
+        # 스트림별 초기화, 중복 키 거부
+        multi.reset("spindle")
+        self.assertEqual(multi.recent_states("spindle"), [])
+        self.assertEqual(len(multi.recent_states("x_axis")), 5)
+        with self.assertRaises(ValueError):
+            multi.should_learn_streams(["x_axis", "x_axis"], np.zeros((2, 3)), is_replay_phase=True)
+        # 거부된 호출은 새 스트림을 등록하지 않음
+        with self.assertRaises(ValueError):
+            multi.should_learn_streams(["z_axis", "z_axis"], np.zeros((2, 3)), is_replay_phase=True)
+        self.assertEqual(len(multi), len(keys))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
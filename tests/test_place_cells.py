@@ -12,7 +12,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import numpy as np
 import unittest
+from unittest.mock import patch
 from hippocampus import PlaceCellManager, PlaceMemory
+from hippocampus.spatial_index import periodic_close_pairs
+from hippocampus.place_table import PlaceTable, hash_key, hash_rows
+from hippocampus.eviction import LFUEvictionPolicy
 
 
 class TestPlaceCells(unittest.TestCase):
@@ -34,6 +38,7 @@ class TestPlaceCells(unittest.TestCase):
         self.assertIsInstance(place_id, int)
         self.assertGreaterEqual(place_id, 0)
         self.assertLess(place_id, 1000)
+        self.assertEqual(self.place_manager.get_place_id(phase_vector), place_id)
     
     def test_place_memory_storage(self):
         """Place Memory 저장 테스트"""
@@ -80,6 +85,518 @@ class TestPlaceCells(unittest.TestCase):
         self.assertIsNotNone(blended_bias)
         self.assertEqual(len(blended_bias), 5)
 
+    
+    def test_vectorized_blending_matches_scalar(self):
+        """벡터화 블렌딩 == Place별 루프 계산 테스트"""
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            phase = rng.uniform(0, 2.0 * np.pi, 5)
+            place_id = self.place_manager.get_place_id(phase)
+            place_memory = self.place_manager.get_place_memory(place_id)
+            place_memory.update_bias(rng.normal(size=5), learning_rate=0.1)
+            place_memory.update_place_center(phase)
+        
+        query = rng.uniform(0, 2.0 * np.pi, 5)
+        
+        # 기준값: Place별 활성화 계산 후 전체 정렬
+        activations = []
+        for place_memory in self.place_manager.place_memory.values():
+            activation = self.place_manager.place_cell_activation(
+                query, place_memory.place_center, sigma=1.0
+            )
+            if activation > 1e-5:
+                activations.append((activation, place_memory.bias_estimate))
+        activations.sort(key=lambda x: x[0], reverse=True)
+        top = activations[:5]
+        total = sum(a for a, _ in top)
+        expected = sum(a / total * b for a, b in top)
+        
+        blended = self.place_manager.get_bias_estimate(
+            query, use_blending=True, top_k=5, sigma=1.0
+        )
+        np.testing.assert_allclose(blended, expected, rtol=1e-10, atol=1e-12)
+
+    
+    def test_spatial_index_matches_full_scan(self):
+        """공간 인덱스 블렌딩 == 전체 스캔 블렌딩 테스트 (wrapping 경계 포함)"""
+        indexed = PlaceCellManager(num_places=100000)
+        full_scan = PlaceCellManager(num_places=100000, use_spatial_index=False)
+        rng = np.random.default_rng(1)
+        for _ in range(2000):
+            phase = rng.uniform(0, 2.0 * np.pi, 5)
+            bias = rng.normal(size=5)
+            for manager in (indexed, full_scan):
+                manager.update_place_memory(
+                    manager.get_place_id(phase), phase, bias
+                )
+        
+        # 중심 이동 후에도 인덱스가 증분 갱신되는지 확인
+        for place_id in list(indexed.place_memory)[:100]:
+            shift = rng.normal(scale=0.5, size=5)
+            for manager in (indexed, full_scan):
+                place_memory = manager.place_memory[place_id]
+                place_memory.place_center = place_memory.place_center + shift
+        
+        queries = rng.uniform(0, 2.0 * np.pi, (50, 5))
+        queries[:10, 0] = 1e-3  # wrap 경계 근처
+        for query in queries:
+            np.testing.assert_allclose(
+                indexed.get_bias_estimate(query, top_k=3, sigma=0.1),
+                full_scan.get_bias_estimate(query, top_k=3, sigma=0.1),
+                rtol=1e-12, atol=1e-12
+            )
+
+    
+    def test_default_sigma_uses_spatial_index(self):
+        """기본 σ(0.5) 블렌딩도 전체 스캔 없이 k-최근접 링 탐색 사용 테스트 ✨ NEW"""
+        indexed = PlaceCellManager(num_places=20000)
+        full_scan = PlaceCellManager(num_places=20000, use_spatial_index=False)
+        rng = np.random.default_rng(4)
+        phases = rng.uniform(0, 2.0 * np.pi, (20000, 5))
+        biases = rng.normal(size=(20000, 5))
+        for manager in (indexed, full_scan):
+            manager.update_place_memories(manager.get_place_ids(phases), phases, biases)
+        
+        store = indexed.store
+        nearest = store.index.nearest
+        results = []
+        
+        def recording_nearest(*args):
+            result = nearest(*args)
+            results.append(result)
+            return result
+        
+        def no_full_scan():
+            raise AssertionError("full scan fallback used")
+        
+        store.index.nearest = recording_nearest
+        store.centered_rows = no_full_scan
+        queries = rng.uniform(0, 2.0 * np.pi, (30, 5))
+        queries[:5, 0] = 1e-3  # wrap 경계 근처
+        for query in queries:
+            np.testing.assert_allclose(
+                indexed.get_bias_estimate(query),
+                full_scan.get_bias_estimate(query),
+                rtol=1e-12, atol=1e-12
+            )
+        
+        self.assertEqual(len(results), len(queries))
+        for rows, _ in results:
+            # 질의당 확인 행 수가 전체보다 훨씬 적어야 함
+            self.assertLess(rows.size, 20000 // 10)
+    
+    def test_close_pairs_match_brute_force(self):
+        """격자 기반 근접 쌍 == 전체 쌍 비교 테스트"""
+        rng = np.random.default_rng(2)
+        points = rng.uniform(0, 2.0 * np.pi, (300, 3))
+        pairs = periodic_close_pairs(points, 0.6, 2.0 * np.pi)
+        
+        expected = set()
+        for i in range(len(points)):
+            for j in range(i + 1, len(points)):
+                if self.place_manager.torus_distance(points[i], points[j]) < 0.6:
+                    expected.add((i, j))
+        self.assertEqual(set(map(tuple, pairs.tolist())), expected)
+    
+    def test_merge_nearby_places_transitive(self):
+        """전이적 클러스터 병합 테스트 (방문 가중 평균, wrap 경계)"""
+        wrap = 2.0 * np.pi
+        centers = [
+            np.array([wrap - 0.04, 1.0, 1.0, 1.0, 1.0]),
+            np.array([0.03, 1.0, 1.0, 1.0, 1.0]),   # wrap 경계 너머 0.07
+            np.array([0.11, 1.0, 1.0, 1.0, 1.0]),   # 두 번째와 0.08 (첫 번째와는 0.15)
+            np.array([3.0, 3.0, 3.0, 3.0, 3.0]),    # 멀리 떨어진 Place
+        ]
+        for place_id, (center, visits) in enumerate(zip(centers, [1, 2, 1, 5])):
+            place_memory = self.place_manager.get_place_memory(place_id)
+            place_memory.place_center = center.copy()
+            place_memory.bias_estimate = np.full(5, float(place_id))
+            place_memory.visit_count = visits
+        
+        merged = self.place_manager.merge_nearby_places(distance_threshold=0.1)
+        
+        self.assertEqual(merged, 2)
+        self.assertEqual(sorted(self.place_manager.place_memory), [0, 3])
+        representative = self.place_manager.place_memory[0]
+        self.assertEqual(representative.visit_count, 4)
+        np.testing.assert_allclose(
+            representative.bias_estimate, np.full(5, (0 * 1 + 1 * 2 + 2 * 1) / 4.0)
+        )
+        expected_offset = (0.0 * 1 + 0.07 * 2 + 0.15 * 1) / 4.0
+        np.testing.assert_allclose(
+            representative.place_center[0], wrap - 0.04 + expected_offset
+        )
+
+    
+    def test_batch_place_ids_match_scalar(self):
+        """배치 Place ID == 단일 Place ID 테스트 (음수 위상 포함)"""
+        rng = np.random.default_rng(3)
+        phases = rng.uniform(-4.0 * np.pi, 4.0 * np.pi, (500, 5))
+        phases[0] = -0.07  # 양자화 결과 -1 (hash(-1) == -2 특수 처리)
+        
+        phases = np.concatenate([phases, phases[::3]])  # 중복 셀 포함
+        
+        # 새 셀은 처음 등장 순서대로 ID 할당 → 별도 인스턴스의 순차 호출과 동일
+        for num_places in (1000, 7, 2 ** 40):
+            batch = PlaceCellManager(num_places=num_places)
+            sequential = PlaceCellManager(num_places=num_places)
+            place_ids = batch.get_place_ids(phases)
+            self.assertEqual(
+                place_ids.tolist(),
+                [sequential.get_place_id(phase) for phase in phases]
+            )
+            self.assertEqual(
+                place_ids.tolist(),
+                [batch.get_place_id(phase) for phase in phases]
+            )
+
+    
+    def test_batch_update_matches_sequential(self):
+        """배치 업데이트 == 순차 update_place_memory 테스트"""
+        rng = np.random.default_rng(4)
+        place_ids = rng.integers(0, 20, 400)
+        phases = rng.uniform(0, 2.0 * np.pi, (400, 5))
+        biases = rng.normal(size=(400, 5))
+        timestamps = np.arange(400, dtype=float)
+        
+        sequential = PlaceCellManager()
+        batched = PlaceCellManager()
+        # 기존 방문 기록이 있는 Place 포함
+        for manager in (sequential, batched):
+            manager.update_place_memory(3, phases[0], biases[0], current_time=-1.0)
+        
+        for i in range(400):
+            sequential.update_place_memory(
+                int(place_ids[i]), phases[i], biases[i], current_time=timestamps[i]
+            )
+        batched.update_place_memories(place_ids, phases, biases, timestamps)
+        
+        self.assertEqual(sorted(sequential.place_memory), sorted(batched.place_memory))
+        for place_id, expected in sequential.place_memory.items():
+            actual = batched.place_memory[place_id]
+            self.assertEqual(actual.visit_count, expected.visit_count)
+            self.assertEqual(actual.last_update_time, expected.last_update_time)
+            np.testing.assert_allclose(actual.bias_estimate, expected.bias_estimate)
+            np.testing.assert_allclose(actual.place_center, expected.place_center)
+            np.testing.assert_allclose(
+                np.array(actual.bias_history), np.array(expected.bias_history)
+            )
+
+    
+    def test_place_memory_views_share_store(self):
+        """PlaceMemory 뷰가 열 저장소를 읽고 쓰는지 테스트 (삭제 후 행 이동 포함)"""
+        for place_id in range(3):
+            phase = np.full(5, 0.5 * place_id)
+            self.place_manager.update_place_memory(place_id, phase, np.full(5, place_id))
+        
+        view = self.place_manager.get_place_memory(2)
+        del self.place_manager.place_memory[0]  # 마지막 행(2)이 0번 행으로 이동
+        
+        self.assertEqual(sorted(self.place_manager.place_memory), [1, 2])
+        np.testing.assert_array_equal(view.bias_estimate, np.full(5, 2.0))
+        bias = view.bias_estimate.copy()
+        bias[0] = 7.0  # 대입해야 저장소에 반영
+        view.bias_estimate = bias
+        self.assertEqual(self.place_manager.place_memory[2].bias_estimate[0], 7.0)
+        
+        view.add_bias_to_history(np.ones(5))
+        self.assertEqual(len(self.place_manager.place_memory[2].bias_history), 2)
+        
+        # 게터는 읽기 전용 복사본: 제자리 수정은 조용히 사라지지 않고 실패
+        held_bias = view.bias_estimate
+        held_center = view.place_center
+        with self.assertRaises(ValueError):
+            held_bias[1] = -1.0
+        with self.assertRaises(ValueError):
+            held_center += 1.0
+        with self.assertRaises(ValueError):
+            self.place_manager.place_memory[1].bias_estimate[:] = 0.0
+        self.assertEqual(view.bias_estimate[1], 2.0)
+        # 받아 둔 배열은 행 이동 후에도 다른 Place 값을 보여주지 않음
+        del self.place_manager.place_memory[2]  # 마지막 행(1)이 0번 행으로 이동
+        np.testing.assert_array_equal(held_bias, [7.0, 2.0, 2.0, 2.0, 2.0])
+        np.testing.assert_array_equal(held_center, np.full(5, 1.0))
+        np.testing.assert_array_equal(
+            self.place_manager.place_memory[1].bias_estimate, np.full(5, 1.0)
+        )
+        
+        # 단독 PlaceMemory 대입 시 값 복사
+        standalone = PlaceMemory(place_id=9, visit_count=4, place_center=np.zeros(5))
+        self.place_manager.place_memory[9] = standalone
+        self.assertEqual(self.place_manager.place_memory[9].visit_count, 4)
+        self.assertEqual(self.place_manager.get_statistics()['num_places'], 2)
+
+    
+    def test_capacity_eviction_policies(self):
+        """용량 제한 교체 정책 테스트 (LRU / LFU / Consolidation 보호)"""
+        phase = np.zeros(5)
+        bias = np.ones(5)
+        
+        # LRU: 가장 오래전에 방문한 Place 제거
+        lru = PlaceCellManager(capacity=3, eviction_policy="lru")
+        evicted = []
+        lru.add_eviction_listener(evicted.append)
+        for place_id in (0, 1, 2):
+            lru.update_place_memory(place_id, phase, bias, current_time=place_id)
+        lru.update_place_memory(0, phase, bias, current_time=3.0)
+        lru.update_place_memory(3, phase, bias, current_time=4.0)
+        self.assertEqual(sorted(lru.place_memory), [0, 2, 3])
+        self.assertEqual(evicted, [1])
+        
+        # LFU: 가장 적게 방문한 Place 제거 (동률이면 오래된 것)
+        lfu = PlaceCellManager(capacity=3, eviction_policy="lfu")
+        for place_id, visits in ((0, 3), (1, 1), (2, 2)):
+            for _ in range(visits):
+                lfu.update_place_memory(place_id, phase, bias)
+        lfu.update_place_memory(3, phase, bias)
+        self.assertEqual(sorted(lfu.place_memory), [0, 2, 3])
+        
+        # Consolidation 보호: Consolidation된 Place는 마지막까지 유지
+        protected = PlaceCellManager(capacity=2, eviction_policy="consolidation")
+        protected.update_place_memory(0, phase, bias)
+        protected.place_memory[0].consolidated_bias = bias.copy()
+        for place_id in (1, 2, 3):
+            protected.update_place_memory(place_id, phase, bias)
+        self.assertEqual(sorted(protected.place_memory), [0, 3])
+        self.assertEqual(protected.get_statistics()['num_evictions'], 2)
+        
+        # LFU 최소 방문 횟수 힙은 방문 수가 아니라 버킷 수에 비례
+        policy = LFUEvictionPolicy()
+        for key in range(3):
+            policy.insert(key)
+        for _ in range(10000):
+            policy.touch(0)
+        policy.touch(1, count=5)
+        self.assertLessEqual(len(policy._bucket_heap), 2 * 3 + 17)
+        self.assertEqual(policy.victim(), 2)
+        policy.discard(2)
+        self.assertEqual(policy.victim(), 1)
+        
+        # 용량 제한이 없으면 방문 기록을 남기지 않음
+        unbounded = PlaceCellManager(eviction_policy="lfu")
+        for _ in range(5):
+            unbounded.update_place_memory(0, phase, bias)
+        unbounded.mark_place_visited(0, count=3)
+        self.assertEqual(len(unbounded.eviction_policy._bucket_heap), 1)
+    
+    def test_batch_update_with_capacity_matches_sequential(self):
+        """용량 제한이 있을 때도 배치 업데이트 == 순차 업데이트 (LRU)"""
+        rng = np.random.default_rng(5)
+        place_ids = rng.integers(0, 12, 60)
+        phases = rng.uniform(0, 2.0 * np.pi, (60, 5))
+        biases = rng.normal(size=(60, 5))
+        timestamps = np.arange(60, dtype=float)
+        
+        sequential = PlaceCellManager(capacity=20)
+        batched = PlaceCellManager(capacity=20)
+        for manager in (sequential, batched):
+            for place_id in range(100, 115):
+                manager.update_place_memory(place_id, phases[0], biases[0], current_time=-1.0)
+        
+        for i in range(60):
+            sequential.update_place_memory(
+                int(place_ids[i]), phases[i], biases[i], current_time=timestamps[i]
+            )
+        batched.update_place_memories(place_ids, phases, biases, timestamps)
+        
+        self.assertEqual(len(batched.place_memory), 20)
+        self.assertEqual(sorted(sequential.place_memory), sorted(batched.place_memory))
+        for place_id, expected in sequential.place_memory.items():
+            np.testing.assert_allclose(
+                batched.place_memory[place_id].bias_estimate, expected.bias_estimate
+            )
+
+    
+    def test_read_path_has_no_side_effects(self):
+        """get_bias_estimate/peek가 miss 시 Place를 생성·수정하지 않는지 테스트"""
+        query = np.array([0.1, 0.2, 0.3, 0.4, 0.5])
+        miss = self.place_manager.get_bias_estimate(query, use_blending=False)
+        np.testing.assert_array_equal(miss, np.zeros(5))
+        # miss 결과도 호출자 소유의 새 배열 (제자리 수정이 다음 miss에 남지 않음)
+        miss += 1.0
+        np.testing.assert_array_equal(
+            self.place_manager.get_bias_estimate(query, use_blending=False), np.zeros(5)
+        )
+        self.assertIsNone(self.place_manager.peek_place_memory(
+            self.place_manager.get_place_id(query)
+        ))
+        self.assertEqual(len(self.place_manager.place_memory), 0)
+        
+        # 중심 없는 Place는 블렌딩에서 제외되고 중심도 설정되지 않음
+        centerless = self.place_manager.get_place_memory(7)
+        centerless.update_bias(np.ones(5))
+        np.testing.assert_array_equal(self.place_manager.get_bias_estimate(query), np.zeros(5))
+        self.assertIsNone(centerless.place_center)
+        
+        # Negative cache는 Place가 추가되면 무효화
+        place_id = self.place_manager.get_place_id(query)
+        self.place_manager.update_place_memory(place_id, query, np.full(5, 2.0))
+        np.testing.assert_array_equal(
+            self.place_manager.get_bias_estimate(query, use_blending=False), np.full(5, 2.0)
+        )
+
+    
+    def test_result_cache_local_invalidation(self):
+        """결과 캐시: 캐시 결과 == 직접 계산, 먼 Place 변경은 무효화하지 않음"""
+        cached = PlaceCellManager(result_cache_size=64)
+        plain = PlaceCellManager()
+        rng = np.random.default_rng(6)
+        phases = rng.uniform(0, 2.0 * np.pi, (300, 5))
+        biases = rng.normal(size=(300, 5))
+        for manager in (cached, plain):
+            manager.update_place_memories(np.arange(300), phases, biases)
+        
+        query = phases[0] + 0.01
+        for _ in range(3):
+            np.testing.assert_array_equal(
+                cached.get_bias_estimate(query, sigma=0.1),
+                plain.get_bias_estimate(query, sigma=0.1)
+            )
+        stats = cached.result_cache.get_statistics()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        
+        # 먼 Place 업데이트: 캐시 유지
+        far = (phases[0] + np.pi) % (2.0 * np.pi)
+        cached.update_place_memory(1000, far, np.ones(5))
+        cached.get_bias_estimate(query, sigma=0.1)
+        self.assertEqual(cached.result_cache.hits, 3)
+        
+        # 이웃 Place 업데이트: 무효화 후 새 결과
+        for manager in (cached, plain):
+            manager.update_place_memory(0, phases[0], np.full(5, 9.0))
+        np.testing.assert_array_equal(
+            cached.get_bias_estimate(query, sigma=0.1),
+            plain.get_bias_estimate(query, sigma=0.1)
+        )
+        self.assertEqual(cached.result_cache.invalidations, 1)
+
+    
+    def test_result_cache_local_invalidation_default_sigma(self):
+        """결과 캐시 (기본 σ): k번째 최근접 거리 밖 변경은 무효화하지 않음, 버전 항목 정리"""
+        cached = PlaceCellManager(result_cache_size=64, capacity=5000)
+        plain = PlaceCellManager(capacity=5000)
+        rng = np.random.default_rng(7)
+        phases = rng.uniform(0, 2.0 * np.pi, (5000, 5))
+        biases = rng.normal(size=(5000, 5))
+        for manager in (cached, plain):
+            manager.update_place_memories(np.arange(5000), phases, biases)
+        
+        query = phases[0] + 0.01
+        tracker = cached.version_tracker
+        num_versions = len(tracker.place_versions), len(tracker.cell_versions)
+        for _ in range(2):
+            np.testing.assert_array_equal(
+                cached.get_bias_estimate(query), plain.get_bias_estimate(query)
+            )
+        self.assertEqual(cached.result_cache.hits, 1)
+        dependency = cached.bias_dependencies(query, None, top_k=5)[-1]
+        self.assertNotEqual(dependency[0], tracker._global)  # 전체 버전 fallback 아님
+        # 읽기는 버전 항목을 만들지 않음
+        self.assertEqual(
+            (len(tracker.place_versions), len(tracker.cell_versions)), num_versions
+        )
+        
+        # 먼 Place 업데이트: 캐시 유지
+        far = (phases[0] + np.pi) % (2.0 * np.pi)
+        for manager in (cached, plain):
+            manager.update_place_memory(1, far, np.ones(5))
+        cached.get_bias_estimate(query)
+        self.assertEqual(cached.result_cache.hits, 2)
+        
+        # 질의 바로 옆에 새 Place: 상위 K개가 바뀌므로 무효화 (용량 초과로 한 Place 교체)
+        for manager in (cached, plain):
+            manager.update_place_memory(6000, query + 0.05, np.full(5, 9.0))
+        np.testing.assert_array_equal(
+            cached.get_bias_estimate(query), plain.get_bias_estimate(query)
+        )
+        self.assertEqual(cached.result_cache.invalidations, 1)
+        
+        # 교체된 Place의 버전 항목은 제거됨
+        self.assertEqual(len(cached.place_memory), 5000)
+        self.assertEqual(set(tracker.place_versions), set(cached.place_memory))
+
+    
+    def test_batch_blending_matches_scalar(self):
+        """배치 블렌딩(GEMM 사전 필터) == get_bias_estimate 반복 호출 테스트"""
+        for phase_wrap in (2.0 * np.pi, 1.0):
+            manager = PlaceCellManager(num_places=100000, phase_wrap=phase_wrap)
+            rng = np.random.default_rng(7)
+            phases = rng.uniform(0, phase_wrap, (2000, 5))
+            manager.update_place_memories(
+                np.arange(2000), phases, rng.normal(size=(2000, 5))
+            )
+            # 중심 근처, 임의 위치, wrapping 경계 밖 질의 포함
+            queries = np.r_[
+                phases[:50] + 0.01 * phase_wrap,
+                rng.uniform(0, phase_wrap, (100, 5)),
+                phases[50:60] - phase_wrap
+            ]
+            for sigma, top_k in ((0.02 * phase_wrap, 3), (0.1 * phase_wrap, 5)):
+                expected = np.array([
+                    manager.get_bias_estimate(query, top_k=top_k, sigma=sigma)
+                    for query in queries
+                ])
+                actual = manager.get_bias_estimates(
+                    queries, top_k=top_k, sigma=sigma, chunk_size=37
+                )
+                np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-12)
+
+    
+    def test_place_table_collision_free(self):
+        """셀 테이블: 서로 다른 셀은 서로 다른 ID, 확장/충돌 카운터 테스트"""
+        manager = PlaceCellManager(num_places=8)
+        wrap = manager.phase_wrap
+        cells = np.array(
+            [[i, j, 0, 0, 0] for i in range(40) for j in range(40)], dtype=float
+        )
+        phases = (cells + 0.5) * wrap / manager.quantization_level
+        
+        # 읽기 경로 조회는 ID를 할당하지 않음
+        self.assertIsNone(manager.lookup_place_id(phases[0]))
+        self.assertTrue(np.all(manager.lookup_place_ids(phases) == -1))
+        self.assertEqual(len(manager.place_table), 0)
+        
+        place_ids = manager.get_place_ids(phases[:800])
+        place_ids = np.concatenate([
+            place_ids, [manager.get_place_id(phase) for phase in phases[800:]]
+        ])
+        self.assertEqual(place_ids.tolist(), list(range(len(phases))))
+        self.assertEqual(manager.lookup_place_ids(phases).tolist(), place_ids.tolist())
+        self.assertEqual(manager.lookup_place_id(phases[1234]), 1234)
+        
+        stats = manager.get_statistics()['place_table']
+        self.assertEqual(stats['num_cells'], len(phases))
+        self.assertGreater(stats['resizes'], 0)
+        self.assertLessEqual(stats['load_factor'], 0.5)
+        self.assertGreaterEqual(stats['collisions'], 0)
+        
+        # 방문하지 않은 셀의 bias 조회는 셀을 등록하지 않음
+        bias = manager.get_bias_estimate(np.full(5, 3.0), use_blending=False)
+        self.assertFalse(np.any(bias))
+        self.assertEqual(len(manager.place_table), len(phases))
+        
+        # 단일/배치 경로는 같은 해시를 쓰고, 조회는 테이블 통계를 바꾸지 않음
+        table = PlaceTable(initial_capacity=4)
+        keys = np.array([[-1], [-2], [-1], [-2], [5]])
+        self.assertEqual(table.get_or_add_many(keys).tolist(), [0, 1, 0, 1, 2])
+        rng = np.random.default_rng(11)
+        sample = np.concatenate([rng.integers(-2**62, 2**62, (50, 5)), rng.integers(-100, 100, (50, 5))])
+        self.assertEqual(hash_rows(sample).tolist(), [hash_key(key) for key in sample.tolist()])
+        collisions = table.collisions
+        self.assertEqual([table.lookup(key) for key in keys], [0, 1, 0, 1, 2])
+        self.assertEqual(table.lookup_many(keys).tolist(), [0, 1, 0, 1, 2])
+        self.assertEqual(table.lookup(np.array([-3])), -1)
+        self.assertEqual(table.collisions, collisions)
+        
+        # 해시가 모두 같아도 키가 다르면 다른 ID
+        with patch('hippocampus.place_table.hash_rows', lambda rows: np.zeros(len(rows), dtype=np.int64)), \
+                patch('hippocampus.place_table.hash_key', lambda key: 0):
+            table = PlaceTable(initial_capacity=4)
+            self.assertEqual(table.get_or_add_many(keys).tolist(), [0, 1, 0, 1, 2])
+            self.assertEqual(table.get_or_add(np.array([7])), 3)
+            self.assertEqual([table.lookup(key) for key in keys], [0, 1, 0, 1, 2])
+            self.assertGreater(table.collisions, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
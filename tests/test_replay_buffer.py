@@ -0,0 +1,348 @@
+"""
+Replay Buffer 테스트
+
+Author: GNJz
+Created: 2026-01-20
+Made in GNJz
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import unittest
+from hippocampus import ReplayBuffer, TrajectoryPoint
+
+
+def make_point_args(rng, timestamp, place_id=0, context_id=None, stable=None):
+    """add_point 인자 (stable이 주어지면 안정/불안정 포인트로 고정)"""
+    if stable is None:
+        velocity = rng.normal(size=5) * 0.006
+        acceleration = rng.normal(size=5) * 0.0006
+    elif stable:
+        velocity = np.full(5, 0.001)
+        acceleration = np.full(5, 0.0001)
+    else:
+        velocity = np.full(5, 0.1)
+        acceleration = np.zeros(5)
+    return (
+        float(timestamp), rng.normal(size=5), rng.normal(size=5), rng.normal(size=5),
+        rng.normal(size=5), velocity, acceleration, place_id, context_id
+    )
+
+
+class TestReplayBuffer(unittest.TestCase):
+    """Replay Buffer 테스트"""
+    
+    def test_ring_buffer_columns(self):
+        """링 버퍼 덮어쓰기, 열 순서, TrajectoryPoint 뷰 테스트"""
+        rng = np.random.default_rng(0)
+        buffer = ReplayBuffer(max_size=6, initial_capacity=2)
+        added = []
+        for t in range(10):
+            args = make_point_args(rng, t, place_id=t % 3, context_id=None if t % 2 else t)
+            buffer.add_point(*args)
+            added.append(args)
+        
+        # 최근 6개만, 오래된 포인트부터
+        self.assertEqual(len(buffer), 6)
+        self.assertEqual(buffer.column('timestamp').tolist(), [4.0, 5.0, 6.0, 7.0, 8.0, 9.0])
+        points = list(buffer.buffer)
+        self.assertTrue(all(isinstance(point, TrajectoryPoint) for point in points))
+        for point, args in zip(points, added[4:]):
+            self.assertEqual(point.timestamp, args[0])
+            np.testing.assert_array_equal(point.velocity, args[5])
+            self.assertEqual(point.place_id, args[7])
+            self.assertEqual(point.context_id, args[8])  # -1 → None
+        self.assertEqual(buffer.buffer[-1].timestamp, 9.0)
+        
+        # Place/Context 필터
+        self.assertEqual([p.timestamp for p in buffer.get_place_bias_data(1)], [4.0, 7.0])
+        self.assertEqual([p.timestamp for p in buffer.get_place_bias_data(2, context_id=8)], [8.0])
+        
+        # 통계는 덮어쓴 포인트까지 포함 (is_stable 판정과 동일)
+        expected_stable = sum(
+            np.linalg.norm(args[5]) < 0.01 and np.linalg.norm(args[6]) < 0.001 for args in added
+        )
+        statistics = buffer.get_statistics()
+        self.assertEqual(statistics["total_points"], 10)
+        self.assertEqual(statistics["stable_points"], expected_stable)
+        
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(list(buffer.buffer), [])
+
+    
+    def test_stable_segment_ranges(self):
+        """안정 구간 RLE가 포인트별 is_stable 순회와 같은지 테스트 (링 경계 포함)"""
+        rng = np.random.default_rng(1)
+        buffer = ReplayBuffer(max_size=40, initial_capacity=8)
+        pattern = [True] * 7 + [False] * 2 + [True] * 3 + [False] + [True] * 12 + [False] * 4
+        for t in range(55):
+            buffer.add_point(*make_point_args(rng, t, place_id=t, stable=pattern[t % len(pattern)]))
+        
+        # 기준: 포인트별 순회 (기존 구현)
+        expected, run = [], []
+        for index, point in enumerate(buffer.buffer):
+            if point.is_stable():
+                run.append(index)
+            else:
+                if len(run) >= 5:
+                    expected.append([run[0], run[-1] + 1])
+                run = []
+        if len(run) >= 5:
+            expected.append([run[0], run[-1] + 1])
+        
+        ranges = buffer.stable_segment_ranges(min_segment_length=5)
+        self.assertEqual(ranges.tolist(), expected)
+        
+        segments = buffer.get_stable_segments(min_segment_length=5)
+        self.assertEqual(len(segments), len(expected))
+        for segment, (start, stop) in zip(segments, expected):
+            self.assertEqual(len(segment), stop - start)
+            self.assertEqual(
+                segment.column('timestamp').tolist(),
+                buffer.column('timestamp')[start:stop].tolist()
+            )
+            self.assertEqual([point.place_id for point in segment], segment.column('place_id').tolist())
+        self.assertEqual(buffer.get_stable_segments(min_segment_length=100), [])
+
+    
+    def test_place_index_tracks_overwrites(self):
+        """Place / (Place, Context) 보조 인덱스가 링 덮어쓰기 후에도 전체 스캔과 같은지 테스트"""
+        rng = np.random.default_rng(2)
+        buffer = ReplayBuffer(max_size=30, initial_capacity=4)
+        for t in range(200):
+            context_id = None if rng.random() < 0.3 else int(rng.integers(0, 3))
+            buffer.add_point(*make_point_args(rng, t, place_id=int(rng.integers(0, 6)), context_id=context_id))
+            
+            if t % 17 == 0 or t == 199:
+                rows = buffer.rows()
+                place_ids, context_ids = buffer.place_ids[rows], buffer.context_ids[rows]
+                for place_id in range(7):
+                    expected = rows[place_ids == place_id]
+                    self.assertEqual(buffer.place_rows(place_id).tolist(), expected.tolist())
+                    self.assertEqual(buffer.place_count(place_id), len(expected))
+                    for context_id in range(3):
+                        expected = rows[(place_ids == place_id) & (context_ids == context_id)]
+                        self.assertEqual(buffer.place_rows(place_id, context_id).tolist(), expected.tolist())
+        
+        # 그룹 순회: 모든 Place를 한 번에, 그룹별 행은 place_rows와 동일
+        groups = dict(buffer.iter_groups())
+        self.assertEqual(set(groups), set(buffer.place_index))
+        for place_id, rows in groups.items():
+            self.assertEqual(rows.tolist(), buffer.place_rows(place_id).tolist())
+        for (place_id, context_id), rows in buffer.iter_groups(by_context=True):
+            if context_id is not None:
+                self.assertEqual(rows.tolist(), buffer.place_rows(place_id, context_id).tolist())
+        self.assertEqual(sum(len(rows) for rows in groups.values()), len(buffer))
+        
+        points = buffer.get_place_bias_data(3, context_id=1)
+        self.assertTrue(all(p.place_id == 3 and p.context_id == 1 for p in points))
+        
+        buffer.clear()
+        self.assertEqual(buffer.place_rows(3).tolist(), [])
+
+    
+    def test_spill_streams_all_stable_runs(self):
+        """디스크 스필 후 스트리밍 안정 구간이 덮어쓰기 없는 버퍼와 같고 clear()가 파일을 회수하는지 테스트"""
+        import tempfile
+        rng = np.random.default_rng(3)
+        spill_dir = tempfile.mkdtemp()
+        spilled = ReplayBuffer(max_size=16, initial_capacity=4, spill_dir=spill_dir)
+        reference = ReplayBuffer(max_size=1000)
+        pattern = [True] * 9 + [False] + [True] * 20 + [False] * 3
+        for t in range(90):
+            args = make_point_args(rng, t, place_id=t % 7, stable=pattern[t % len(pattern)])
+            spilled.add_point(*args)
+            reference.add_point(*args)
+        
+        self.assertEqual(len(spilled), 90 - spilled.spilled_points)
+        self.assertEqual(len(spilled.spill_paths), 5)
+        self.assertEqual(sum(len(chunk) for chunk in spilled.iter_chunks()), 90)
+        self.assertEqual(spilled.stable_points, reference.stable_points)
+        
+        # 청크 경계에 걸친 구간도 하나의 구간 번호로 이어짐
+        runs = {}
+        for run_id, piece in spilled.iter_stable_runs(min_segment_length=5):
+            runs.setdefault(run_id, []).extend(piece['timestamp'].tolist())
+        expected = [
+            reference.column('timestamp', start, stop).tolist()
+            for start, stop in reference.stable_segment_ranges(min_segment_length=5).tolist()
+        ]
+        self.assertEqual([runs[run_id] for run_id in sorted(runs)], expected)
+        
+        spilled.clear()
+        self.assertEqual(spilled.spill_paths, [])
+        self.assertEqual(os.listdir(spill_dir), [])
+        os.rmdir(spill_dir)
+
+    
+    def test_add_block_matches_add_point(self):
+        """add_block (열 배열/구조 배열)이 add_point 반복과 같은 레코드·인덱스·안정성 집계를 만드는지 테스트"""
+        from hippocampus.replay_buffer import trajectory_dtype
+        rng = np.random.default_rng(4)
+        blocked = ReplayBuffer(max_size=50, initial_capacity=8)
+        pointwise = ReplayBuffer(max_size=50, initial_capacity=8)
+        timestamp = 0
+        for n in (30, 0, 45, 7, 64):
+            points = [
+                make_point_args(rng, timestamp + i, place_id=int(rng.integers(0, 4)),
+                                context_id=int(rng.integers(0, 3)), stable=bool(rng.random() < 0.7))
+                for i in range(n)
+            ]
+            timestamp += n
+            for args in points:
+                pointwise.add_point(*args)
+            
+            names = ('timestamp', 'phase_vector', 'current_state', 'target_state', 'error',
+                     'velocity', 'acceleration', 'place_id', 'context_id')
+            columns = {name: np.array([args[i] for args in points]) for i, name in enumerate(names)}
+            if n % 2:
+                block = np.zeros(n, dtype=trajectory_dtype([5] * 6))
+                for name, values in columns.items():
+                    block[name] = values
+                blocked.add_block(block)
+            else:
+                blocked.add_block(**columns)
+        
+        self.assertEqual(len(blocked), len(pointwise))
+        self.assertEqual(blocked.total_points, pointwise.total_points)
+        self.assertEqual(blocked.stable_points, pointwise.stable_points)
+        for name in ('timestamp', 'error', 'place_id', 'context_id'):
+            np.testing.assert_array_equal(blocked.column(name), pointwise.column(name))
+        for place_id in range(4):
+            self.assertEqual(blocked.place_count(place_id), pointwise.place_count(place_id))
+            for context_id in (None, 0, 1, 2):
+                np.testing.assert_array_equal(
+                    blocked.timestamps[blocked.place_rows(place_id, context_id)],
+                    pointwise.timestamps[pointwise.place_rows(place_id, context_id)]
+                )
+        
+        with self.assertRaises(ValueError):
+            blocked.add_block(timestamp=np.zeros(3))
+
+    
+    def test_stream_consumers(self):
+        """작은 청크로 스트리밍해도 구간이 같고, 통계/내보내기 소비자가 구간을 보존하는지 테스트"""
+        import tempfile
+        from hippocampus.replay_buffer import stable_run_statistics, export_stable_runs
+        rng = np.random.default_rng(5)
+        buffer = ReplayBuffer(max_size=60, initial_capacity=8)
+        pattern = [True] * 11 + [False] * 2 + [True] * 4 + [False] + [True] * 8
+        for t in range(75):
+            buffer.add_point(*make_point_args(rng, t, place_id=t % 3, stable=pattern[t % len(pattern)]))
+        expected = [
+            buffer.column('timestamp', start, stop).tolist()
+            for start, stop in buffer.stable_segment_ranges(min_segment_length=5).tolist()
+        ]
+        
+        runs = {}
+        for run_id, piece in buffer.iter_stable_runs(min_segment_length=5, chunk_size=4):
+            self.assertLessEqual(len(piece), 4)
+            runs.setdefault(run_id, []).extend(piece['timestamp'].tolist())
+        self.assertEqual([runs[run_id] for run_id in sorted(runs)], expected)
+        
+        statistics = stable_run_statistics(buffer.iter_stable_runs(min_segment_length=5, chunk_size=4))
+        self.assertEqual(statistics["segments"], len(expected))
+        self.assertEqual(statistics["points"], sum(len(run) for run in expected))
+        self.assertEqual(statistics["num_places"], 3)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stable.bin')
+            bounds = export_stable_runs(buffer.iter_stable_runs(min_segment_length=5, chunk_size=4), path)
+            records = np.fromfile(path, dtype=buffer.records.dtype)
+        self.assertEqual([records['timestamp'][start:stop].tolist() for start, stop in bounds], expected)
+
+    
+    def test_aggregate_dwell_summaries(self):
+        """머무름 집계가 포인트 수/오차 합/안정 구간을 보존하고 add_block과 add_point가 같은 요약을 만드는지 테스트"""
+        rng = np.random.default_rng(6)
+        raw = ReplayBuffer(max_size=1000)
+        pointwise = ReplayBuffer(max_size=1000, aggregate=True)
+        blocked = ReplayBuffer(max_size=1000, aggregate=True)
+        points = []
+        for t in range(120):
+            place_id = (t // 15) % 3
+            stable = t % 15 not in (0, 7)
+            points.append(make_point_args(rng, t, place_id=place_id, context_id=1, stable=stable))
+        for args in points:
+            raw.add_point(*args)
+            pointwise.add_point(*args)
+        names = ('timestamp', 'phase_vector', 'current_state', 'target_state', 'error',
+                 'velocity', 'acceleration', 'place_id', 'context_id')
+        for start in (0, 50):
+            chunk = points[start:start + 50] if start == 0 else points[start:]
+            blocked.add_block(**{name: np.array([args[i] for args in chunk]) for i, name in enumerate(names)})
+        
+        # 머무름 (15 포인트 중 불안정 2개) → 요약 행 4개
+        self.assertEqual(len(pointwise), 8 * 4)
+        for summary in (pointwise, blocked):
+            self.assertEqual(summary.total_points, raw.total_points)
+            self.assertEqual(summary.stable_points, raw.stable_points)
+            self.assertEqual(int(summary.column('count').sum()), len(raw))
+            np.testing.assert_allclose(summary.column('error_sum').sum(axis=0), raw.column('error').sum(axis=0))
+        for name in ('timestamp', 'last_timestamp', 'count', 'place_id'):
+            np.testing.assert_array_equal(blocked.column(name), pointwise.column(name))
+        np.testing.assert_allclose(blocked.column('error_sum'), pointwise.column('error_sum'))
+        
+        # 최소 구간 길이는 요약된 포인트 수로 판정
+        expected = raw.stable_segment_ranges(min_segment_length=7).tolist()
+        runs = {}
+        for run_id, piece in pointwise.iter_stable_runs(min_segment_length=7):
+            runs.setdefault(run_id, []).extend(zip(piece['timestamp'].tolist(), piece['last_timestamp'].tolist()))
+        self.assertEqual(len(runs), len(expected))
+        for run_id, (start, stop) in zip(sorted(runs), expected):
+            self.assertEqual(runs[run_id][0][0], raw.point(start).timestamp)
+            self.assertEqual(runs[run_id][-1][1], raw.point(stop - 1).timestamp)
+    
+    def test_aggregate_max_std_splits_noisy_dwells(self):
+        """최근 오차 표준편차 상한을 넘는 포인트에서 새 행을 시작하고 마지막 오차를 남기며 add_block이 add_point와 같게 나누는지 테스트"""
+        rng = np.random.default_rng(25)
+        options = dict(max_size=1000, aggregate=True, aggregate_tail=4, aggregate_max_std=0.1)
+        pointwise = ReplayBuffer(**options)
+        blocked = ReplayBuffer(**options)
+        points = []
+        for t in range(150):
+            args = list(make_point_args(rng, t, place_id=(t // 50) % 2, context_id=1, stable=True))
+            # 조용한 머무름 / 잡음 큰 머무름 / 조용하다가 끝에서 튀는 머무름
+            scale = (0.01, 0.3, 0.01)[t // 50]
+            args[4] = rng.normal(0.0, scale, len(args[4])) + (0.5 if t in (120, 121, 147) else 0.0)
+            points.append(tuple(args))
+        for args in points:
+            pointwise.add_point(*args)
+        names = ('timestamp', 'phase_vector', 'current_state', 'target_state', 'error',
+                 'velocity', 'acceleration', 'place_id', 'context_id')
+        for start, stop in ((0, 30), (30, 95), (95, 150)):
+            chunk = points[start:stop]
+            blocked.add_block(**{name: np.array([args[i] for args in chunk]) for i, name in enumerate(names)})
+        
+        errors = np.array([args[4] for args in points])
+        for summary in (pointwise, blocked):
+            self.assertEqual(summary.total_points, 150)
+            self.assertEqual(int(summary.column('count').sum()), 150)
+            for row in range(len(summary)):
+                start, stop = int(summary.column('timestamp')[row]), int(summary.column('last_timestamp')[row]) + 1
+                dwell = errors[start:stop]
+                np.testing.assert_allclose(summary.column('error_sum')[row], dwell.sum(axis=0))
+                # 오른쪽 정렬된 마지막 오차
+                recent = dwell[-4:]
+                np.testing.assert_array_equal(summary.column('error_tail')[row][4 - len(recent):], recent)
+                # 합친 포인트마다 최근 3개 창의 표준편차가 상한 미만
+                for end in range(2, len(dwell) + 1):
+                    self.assertTrue(np.all(np.std(dwell[max(end - 3, 0):end], axis=0) < 0.1))
+        for name in ('timestamp', 'last_timestamp', 'count', 'place_id'):
+            np.testing.assert_array_equal(blocked.column(name), pointwise.column(name))
+        np.testing.assert_array_equal(blocked.column('error_tail'), pointwise.column('error_tail'))
+        
+        # 조용한 머무름은 한 행, 잡음 큰 머무름은 (거의) 포인트마다 한 행, 튀는 포인트에서 나뉨
+        counts = pointwise.column('count').tolist()
+        self.assertEqual(counts[0], 50)
+        self.assertGreater(len(counts), 40)
+        self.assertEqual(pointwise.column('timestamp')[-2:].tolist(), [147.0, 148.0])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
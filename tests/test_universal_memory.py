@@ -8,11 +8,14 @@ Made in GNJz
 
 import sys
 import os
+import hashlib
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import numpy as np
 import unittest
-from hippocampus import UniversalMemory, create_universal_memory
+from hippocampus import (
+    ContextBinder, ContextMemory, ContextSchema, UniversalMemory, create_universal_memory
+)
 
 
 class TestUniversalMemory(unittest.TestCase):
@@ -82,6 +85,295 @@ class TestUniversalMemory(unittest.TestCase):
         self.assertIn("consolidated_count", replay_result)
         self.assertIn("total_places", replay_result)
 
+    
+    def test_place_eviction_cascades_to_contexts(self):
+        """Place 교체 시 해당 Place의 Context Memory도 삭제되는지 테스트"""
+        memory = UniversalMemory(memory_dim=5, place_capacity=2)
+        bias = np.array([0.001, 0.002, 0.0, 0.0, 0.0])
+        for i in range(3):
+            key = np.full(5, 1.0 + i)
+            for tool in ("tool_A", "tool_B"):
+                memory.store(key=key, value=bias, context={"tool": tool}, timestamp=float(i))
+        
+        places = set(memory.place_manager.place_memory)
+        self.assertEqual(len(places), 2)
+        self.assertEqual(len(memory.context_binder.context_memory), 4)
+        self.assertTrue(all(
+            place_id in places for place_id, _ in memory.context_binder.context_memory
+        ))
+
+    
+    def test_retrieve_does_not_allocate(self):
+        """검색만으로는 Place/Context Memory가 생성되지 않는지 테스트"""
+        for i in range(20):
+            memories = self.memory.retrieve(np.full(5, 0.1 * i), context={"tool": "tool_A"})
+            self.assertEqual(memories[0]["visit_count"], 0)
+            self.assertEqual(memories[1]["confidence"], 0.0)
+        
+        self.assertEqual(len(self.memory.place_manager.place_memory), 0)
+        self.assertEqual(len(self.memory.context_binder.context_memory), 0)
+        
+        # miss 결과 bias는 호출자 소유의 쓰기 가능한 새 배열
+        for memory in memories:
+            memory["bias"] += 1.0
+        for memory in self.memory.retrieve(np.full(5, 1.9), context={"tool": "tool_A"}):
+            np.testing.assert_array_equal(memory["bias"], np.zeros(5))
+        
+        # 저장은 Place 방문/업데이트 시간을 바꾸지 않음 (Context Memory만 시간 기록)
+        state = np.array([1.0, 0.5, 0.3, 10.0, 5.0])
+        self.memory.store(key=state, value=np.full(5, 0.1), context={"tool": "tool_A"}, timestamp=42.0)
+        place_memory = next(iter(self.memory.place_manager.place_memory.values()))
+        self.assertEqual(place_memory.last_visit_time, 0.0)
+        self.assertEqual(place_memory.last_update_time, 0.0)
+
+    
+    def test_retrieve_cache(self):
+        """검색 결과 캐시: 반복 질의는 hit, 저장 후에는 새 결과"""
+        memory = UniversalMemory(memory_dim=5, result_cache_size=16)
+        state = np.array([1.0, 0.5, 0.3, 10.0, 5.0])
+        memory.store(key=state, value=np.full(5, 0.1), context={"tool": "tool_A"})
+        
+        first = memory.retrieve(state, context={"tool": "tool_A"})
+        second = memory.retrieve(state, context={"tool": "tool_A"})
+        self.assertEqual(memory.retrieve_cache.hits, 1)
+        np.testing.assert_array_equal(first[1]["bias"], second[1]["bias"])
+        
+        memory.store(key=state, value=np.full(5, 1.1), context={"tool": "tool_A"})
+        third = memory.retrieve(state, context={"tool": "tool_A"})
+        self.assertEqual(third[1]["visit_count"], 2)
+        np.testing.assert_allclose(third[1]["bias"], np.full(5, 0.2))
+
+    
+    def test_context_interning(self):
+        """Context ID 인터닝: 같은 상태는 재해시 없이 같은 ID, 핸들은 해시 없음"""
+        binder = self.memory.context_binder
+        state = {"tool": "tool_A", "temperature": 25.0}
+        context_id = binder.get_context_id(state)
+        hashes = binder.num_context_hashes
+        
+        # 같은 객체 / 같은 내용의 다른 객체 → 재해시 없음
+        self.assertEqual(binder.get_context_id(state), context_id)
+        self.assertEqual(binder.get_context_id(dict(state)), context_id)
+        self.assertEqual(binder.num_context_hashes, hashes)
+        
+        # 제자리 수정과 타입 변경(25.0 → 25)은 변경으로 감지
+        state["temperature"] = 25
+        binder.get_context_id(state)
+        state["temperature"] = 30.0
+        self.assertNotEqual(binder.get_context_id(state), context_id)
+        self.assertEqual(binder.num_context_hashes, hashes + 2)
+        
+        # 중첩 값의 제자리 수정도 감지 (같은 딕셔너리 객체)
+        nested = {"tool": "tool_A", "fixture": {"clamp": 1, "offset": [0.0, 0.1]}}
+        nested_id = binder.get_context_id(nested)
+        self.assertEqual(binder.get_context_id(nested), nested_id)
+        nested["fixture"]["offset"][1] = 0.2
+        changed_id = binder.get_context_id(nested)
+        self.assertEqual(changed_id, binder._hash_context(nested))
+        self.assertNotEqual(changed_id, nested_id)
+        nested["fixture"]["clamp"] = 1.0
+        self.assertEqual(binder.get_context_id(nested), binder._hash_context(nested))
+        
+        # 이전 버전 (MD5) ID: 저장된 기억 이전용
+        expected = int(hashlib.md5(str(sorted(state.items())).encode('utf-8')).hexdigest(), 16)
+        self.assertEqual(binder.legacy_context_id(state), expected % binder.num_contexts)
+        
+        # set_context 핸들: store/retrieve에서 해시 없음, 결과는 dict와 동일
+        handle = self.memory.set_context({"tool": "tool_A", "temperature": 25.0})
+        self.assertEqual(handle.context_id, context_id)
+        hashes = binder.num_context_hashes
+        phase = np.array([1.0, 0.5, 0.3, 10.0, 5.0])
+        self.memory.store(key=phase, value=np.full(5, 0.1))
+        self.memory.store(key=phase, value=np.full(5, 0.1), context=handle)
+        memories = self.memory.retrieve(phase, context=handle)
+        self.assertEqual(binder.num_context_hashes, hashes)
+        self.assertEqual(memories[1]["context_id"], context_id)
+        self.assertEqual(memories[1]["visit_count"], 2)
+
+    
+    def test_context_schema_binning(self):
+        """Context Schema: 같은 구간의 상태는 같은 밀집 Context ID"""
+        schema = ContextSchema(
+            numeric={"temperature": 1.0, "load": [0.2, 0.5]},
+            categorical={"tool": ["tool_A", "tool_B"]},
+            ignore=["timestamp"]
+        )
+        memory = UniversalMemory(memory_dim=5, context_schema=schema)
+        binder = memory.context_binder
+        phase = np.array([1.0, 0.5, 0.3, 10.0, 5.0])
+        
+        for i, temperature in enumerate(np.arange(25.0, 25.9, 0.01)):
+            memory.store(
+                key=phase,
+                value=np.full(5, 0.1),
+                context={"tool": "tool_A", "temperature": temperature,
+                         "load": 0.3, "timestamp": float(i)}
+            )
+        self.assertEqual(len(binder.context_memory), 1)
+        self.assertEqual(binder.context_keys[0],
+                         (("load", 1), ("temperature", 25), ("tool", 0)))
+        
+        context_id = binder.get_context_id({"tool": "tool_A", "temperature": 25.5, "load": 0.3})
+        self.assertEqual(context_id, 0)
+        memories = memory.retrieve(phase, context={"tool": "tool_A", "temperature": 25.99, "load": 0.49})
+        self.assertEqual(memories[1]["visit_count"], 90)
+        
+        # 다른 구간 / 어휘 밖의 값은 새 밀집 ID
+        self.assertEqual(binder.get_context_id({"tool": "tool_A", "temperature": 26.0, "load": 0.3}), 1)
+        self.assertEqual(binder.get_context_id({"tool": "drill", "temperature": 26.0, "load": 0.6}), 2)
+        self.assertEqual(binder.context_key(2), (("load", 2), ("temperature", 26), ("tool", 2)))
+        
+        with self.assertRaises(ValueError):
+            ContextSchema(numeric={"temperature": 1.0}, ignore=["temperature"])
+
+    
+    def test_context_table_adjacency(self):
+        """Context Table: 무작위 추가/삭제 후에도 행/Place 인접 인덱스가 참조 딕셔너리와 일치"""
+        binder = ContextBinder(bias_dim=2)
+        reference = {}
+        rng = np.random.default_rng(5)
+        for step in range(2000):
+            place_id, context_id = int(rng.integers(20)), int(rng.integers(6))
+            if rng.random() < 0.3:
+                removed = binder.remove_context_memory(place_id, context_id)
+                self.assertEqual(removed, reference.pop((place_id, context_id), None) is not None)
+            elif rng.random() < 0.02:
+                binder.remove_place(place_id)
+                reference = {key: value for key, value in reference.items() if key[0] != place_id}
+            else:
+                binder.update_context_memory(place_id, context_id, np.full(2, step), learning_rate=1.0)
+                reference[(place_id, context_id)] = step
+        
+        self.assertEqual(len(binder.context_memory), len(reference))
+        for (place_id, context_id), step in reference.items():
+            self.assertEqual(binder.get_bias_estimate(place_id, context_id)[0], step)
+        for place_id in range(20):
+            self.assertEqual(
+                sorted(binder.contexts_of(place_id)),
+                sorted(context_id for key_place, context_id in reference if key_place == place_id)
+            )
+        
+        # 뷰 대입/삭제는 테이블에 반영
+        binder.context_memory[(99, 1)] = ContextMemory(99, 1, bias_estimate=np.ones(2), visit_count=3)
+        self.assertEqual(binder.peek_context_memory(99, 1).visit_count, 3)
+        with self.assertRaises(ValueError):  # 게터는 읽기 전용 복사본
+            binder.peek_context_memory(99, 1).bias_estimate[0] = 5.0
+        del binder.context_memory[(99, 1)]
+        self.assertNotIn((99, 1), binder.context_memory)
+        self.assertEqual(binder.contexts_of(99), [])
+
+    
+    def test_context_ttl_expiry(self):
+        """Context TTL 만료: 호출자 시계 기준, 호출당 확인 수 제한, 재방문 항목 유지"""
+        binder = ContextBinder(bias_dim=2)
+        for i in range(100):
+            binder.update_context_memory(i, 0, np.ones(2), current_time=float(i))
+            binder.update_context_memory(i, 0, np.ones(2), current_time=float(i))
+        
+        # 나이 기준 없이는 삭제 없음 (모두 2회 방문)
+        self.assertEqual(binder.clear_unused_contexts(max_age=1000.0, current_time=100.0), 0)
+        
+        # 40번 Place 재방문 → 만료 대상에서 빠짐
+        binder.update_context_memory(40, 0, np.ones(2), current_time=150.0)
+        
+        # 시간 160: 나이 > 100 인 조합(0~59, 40 제외) 59개를 호출당 최대 10개씩 정리
+        removed = []
+        for _ in range(20):
+            removed.append(binder.clear_unused_contexts(max_age=100.0, current_time=160.0, max_checks=10))
+        self.assertTrue(all(count <= 10 for count in removed))
+        self.assertEqual(sum(removed), 59)
+        self.assertEqual(
+            sorted(place_id for place_id, _ in binder.context_memory),
+            [40] + list(range(60, 100))
+        )
+        
+        # 방문 횟수 기준 (기본 시계 = 가장 최근 방문 시간)
+        binder.update_context_memory(7, 1, np.ones(2), current_time=160.0)
+        self.assertEqual(binder.clear_unused_contexts(max_age=100.0), 1)
+        self.assertNotIn((7, 1), binder.context_memory)
+        self.assertEqual(len(binder.context_memory), 41)
+
+    
+    def test_context_ttl_bounded_under_churn(self):
+        """Context TTL: 추가/교체가 반복되어도 호출당 힙 작업 ≤ max_checks, 힙 크기 유한"""
+        binder = ContextBinder(bias_dim=2, capacity=50)
+        for i in range(2000):
+            binder.update_context_memory(i, 0, np.ones(2), current_time=float(i))
+            binder.update_context_memory(i, 0, np.ones(2), current_time=float(i))
+            if i % 10 == 9:
+                backlog = len(binder._expiry_backlog)
+                binder.clear_unused_contexts(max_age=1e9, current_time=float(i), max_checks=10)
+                # 지연 항목 정리도 호출당 max_checks개씩만 (한 번에 재구성하지 않음)
+                self.assertLessEqual(backlog - len(binder._expiry_backlog), 10)
+        self.assertEqual(len(binder.context_memory), 50)
+        self.assertLess(len(binder._expiry_heap) + len(binder._expiry_backlog), 500)
+        
+        # 이동 중인 항목도 결국 만료됨: 나이 > 10 인 조합(1950~1989) 정리
+        for _ in range(50):
+            binder.clear_unused_contexts(max_age=10.0, current_time=2000.0, max_checks=10)
+        self.assertEqual(
+            sorted(place_id for place_id, _ in binder.context_memory), list(range(1990, 2000))
+        )
+
+    
+    def test_aggregated_replay_matches_per_sample(self):
+        """머무름 요약 Replay가 포인트별 Replay와 같은 Place bias/방문 수/Consolidation 횟수를 만드는지 테스트"""
+        states = [np.array([1.0, 0.5, 0.3, 10.0, 5.0]), np.array([4.0, 2.5, 0.1, 30.0, 15.0])]
+        results = []
+        for aggregate in (False, True):
+            memory = UniversalMemory(memory_dim=5, replay_aggregate=aggregate)
+            timestamp = 0.0
+            for dwell, length in enumerate((12, 30, 6, 25)):
+                bias = np.full(5, 0.001 * (dwell + 1))
+                for _ in range(length):
+                    memory.store(key=states[dwell % 2], value=bias, timestamp=timestamp)
+                    timestamp += 1.0
+            replay_result = memory.replay(current_time=timestamp + 5000.0)
+            results.append((replay_result["consolidated_count"], {
+                place_id: (place_memory.bias_estimate.copy(), place_memory.visit_count)
+                for place_id, place_memory in memory.place_manager.place_memory.items()
+            }))
+        
+        (per_sample_count, per_sample), (aggregated_count, aggregated) = results
+        self.assertEqual(aggregated_count, per_sample_count)
+        self.assertEqual(set(per_sample), set(aggregated))
+        for place_id, (bias, visit_count) in per_sample.items():
+            self.assertEqual(aggregated[place_id][1], visit_count)
+            np.testing.assert_allclose(aggregated[place_id][0], bias)
+    
+    def test_aggregated_replay_noisy_dwell(self):
+        """잡음이 큰 머무름과 조용한 머무름 끝의 잡음을 요약해도 포인트별 Replay와 같은 결과를 내는지 테스트"""
+        state = np.array([1.0, 0.5, 0.3, 10.0, 5.0])
+        cases = {
+            "iid": lambda rng: [rng.normal(0.0, 0.3, 5) for _ in range(40)],
+            "tail": lambda rng: [np.zeros(5)] * 200 + [np.full(5, 0.004 * (-1) ** i) for i in range(12)],
+        }
+        for name, make_values in cases.items():
+            results = []
+            for aggregate in (False, True):
+                memory = UniversalMemory(memory_dim=5, replay_aggregate=aggregate)
+                for t, value in enumerate(make_values(np.random.default_rng(25))):
+                    memory.store(key=state, value=value, timestamp=float(t))
+                replay_result = memory.replay(current_time=10000.0)
+                results.append((replay_result["consolidated_count"], {
+                    place_id: (
+                        place_memory.bias_estimate, place_memory.visit_count,
+                        np.array(list(place_memory.bias_history))
+                    )
+                    for place_id, place_memory in memory.place_manager.place_memory.items()
+                }))
+            
+            (per_sample_count, per_sample), (aggregated_count, aggregated) = results
+            self.assertEqual(aggregated_count, per_sample_count, name)
+            self.assertEqual(set(per_sample), set(aggregated))
+            for place_id, (bias, visit_count, history) in per_sample.items():
+                self.assertEqual(aggregated[place_id][1], visit_count)
+                np.testing.assert_allclose(aggregated[place_id][0], bias, rtol=1e-9, atol=1e-12)
+                np.testing.assert_allclose(aggregated[place_id][2], history, rtol=1e-9, atol=1e-12)
+        self.assertEqual(per_sample_count, 212)
+        np.testing.assert_allclose(per_sample[place_id][0], np.full(5, -0.004 / 3))
+
+
 
 if __name__ == "__main__":
     unittest.main()